@@ -8,6 +8,10 @@ import unittest
 
 sys.path.append('.')
 from tests.resource.cases.handlers import Loader  
+from tests.resource.utils import profiler
 
 l = Loader(cmd=sys.argv, filep=__file__)
 unittest.TextTestRunner(descriptions=0, verbosity=0).run(l.suite)
+
+if l.cli.profile:
+    profiler.report(top=l.cli.profile)
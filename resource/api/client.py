@@ -5,6 +5,8 @@
 
 from tests.resource.utils import generator as gen
 from tests.resource.utils import validator as val
+from tests.resource.utils import profiler
+from tests.resource.utils.governance import Governance
 from google.cloud.exceptions import NotFound
 from tests.resource.helpers import params
 from google.cloud import bigquery
@@ -50,7 +52,9 @@ class Client:
         """
 
         if not self.open:
-            self.open = bigquery.Client(project=params.__HELPER__.project_id)
+            # Sem Helper (ex: coletor executado isoladamente) utiliza o projeto de params
+            project = params.__HELPER__.project_id if params.__HELPER__ else params.__PROJECT_ID__
+            self.open = bigquery.Client(project=project)
 
     def _close(self) -> None:
         """
@@ -60,7 +64,26 @@ class Client:
             self.open.close()
             self.open = None
 
-    def select(self, query: str, output: str, replacer: bool = True, table_name: str = None, search: str = 'tst'):
+    def _parameters(self, parameters: dict):
+        """
+            Retorna a configuração do job com os parâmetros nomeados da
+            query (@nome). Listas são enviadas como ARRAY<STRING> e os
+            demais valores como STRING.
+        """
+
+        if not parameters:
+            return None
+
+        query_parameters = [
+            bigquery.ArrayQueryParameter(name, 'STRING', [str(x) for x in value])
+            if isinstance(value, (list, tuple, set)) else
+            bigquery.ScalarQueryParameter(name, 'STRING', str(value))
+            for name, value in parameters.items()
+        ]
+
+        return bigquery.QueryJobConfig(query_parameters=query_parameters)
+
+    def select(self, query: str, output: str, replacer: bool = True, table_name: str = None, search: str = 'tst', parameters: dict = None):
         """
             Retorna o select a partir de uma dada tabela e query em formato de 
             dataframe ou dicionário.
@@ -70,6 +93,7 @@ class Client:
             :param: replacer -> Determina se o alias para table_id deve ser substituído.
             :param: table_name -> Nome da tabela de destino em que a query será apontada.
             :param: search -> Determina se a pesquisa será para teste ou wordlists.
+            :param: parameters -> Parâmetros nomeados da query (ver _parameters).
         """
         result = None
         # Faz replace da query recebida para setar o table_id
@@ -78,17 +102,57 @@ class Client:
             query = query.replace('<<TABLE_ID>>', self.table_id(table_name, search))
         self._open()
 
-        job = self.open.query(query)
-        # Recebe o e-mail do usuário que executou o job e grava na variável __USER_EMAIL__
-        params.__USER_EMAIL__ = job.user_email
+        with profiler.blocked('select'):
+            job = self.open.query(query, job_config=self._parameters(parameters))
+            # Recebe o e-mail do usuário que executou o job e grava na variável __USER_EMAIL__
+            params.__USER_EMAIL__ = job.user_email
+            rows = job.result()
+
+        # A conversão do resultado é processamento local, fora da espera pelo BigQuery
         # Determina o tipo de output requerido pelo retorno da API.
         if output == 'DF':
-            result = job.result().to_dataframe()
+            result = rows.to_dataframe()
         elif output == 'DICT':
-            result = job.to_dataframe().to_dict('records')
+            result = rows.to_dataframe().to_dict('records')
         self._close()
         return result
 
+    def pages(self, query: str, replacer: bool = True, table_name: str = None, search: str = 'tst', page_size: int = None, parameters: dict = None):
+        """
+            Retorna um gerador com as páginas do select, onde cada página é
+            uma lista de dicionários. Apenas uma página é mantida em memória.
+
+            :param: query -> Query a ser executada pela API.
+            :param: replacer -> Determina se o alias para table_id deve ser substituído.
+            :param: table_name -> Nome da tabela de destino em que a query será apontada.
+            :param: search -> Determina se a pesquisa será para teste ou wordlists.
+            :param: page_size -> Total de linhas por página.
+            :param: parameters -> Parâmetros nomeados da query (ver _parameters).
+        """
+
+        if replacer:
+            query = query.replace('<<TABLE_ID>>', self.table_id(table_name, search))
+        self._open()
+
+        try:
+            with profiler.blocked('pages'):
+                job = self.open.query(query, job_config=self._parameters(parameters))
+                # Recebe o e-mail do usuário que executou o job e grava na variável __USER_EMAIL__
+                params.__USER_EMAIL__ = job.user_email
+                pages = iter(job.result(page_size=page_size).pages)
+
+            while True:
+                # Cada página é obtida da API somente na iteração
+                with profiler.blocked('pages'):
+                    page = next(pages, None)
+
+                if page is None:
+                    break
+
+                yield [dict(row.items()) for row in page]
+        finally:
+            self._close()
+
     def insert_by_json(self, data, table_name: str, search: str = 'tst', disposition: str = 'WRITE_APPEND') -> None:
         """
             Realiza o insert de um conjunto de registros no BigQuery através de um dado
@@ -113,8 +177,9 @@ class Client:
                 ignore_unknown_values=True
             )
             
-            job = self.open.load_table_from_file(payload, table_id, job_config=job_config)
-            job.result()
+            with profiler.blocked('insert_by_json'):
+                job = self.open.load_table_from_file(payload, table_id, job_config=job_config)
+                job.result()
         except Exception:
             #print(job.errors)
             raise Exception(f'Cannot send Data Mock. Target "{table_id}" is unavailable.')
@@ -142,29 +207,97 @@ class Client:
             )
 
             # Executa o Job.
-            job = self.open.query(query, job_config=job_config)
-            job.result()
+            with profiler.blocked('insert_by_query'):
+                job = self.open.query(query, job_config=job_config)
+                job.result()
             del job
         except Exception:
             raise Exception(f'Cannot send Data Mock. Target "{table_name}" is unavailable.')
 
         self._close()
 
+    def truncate_table(self, table_name: str, search: str = 'tst') -> None:
+        """
+            Remove todos os registros de uma dada tabela mantendo seu schema.
+
+            :param: table_name -> Nome da tabela a ser truncada.
+            :param: search -> Referência da origem de Dataset para construção do table_id.
+        """
+
+        self._open()
+
+        try:
+            with profiler.blocked('truncate_table'):
+                job = self.open.query(f'TRUNCATE TABLE `{self.table_id(table_name, search)}`')
+                job.result()
+        except Exception:
+            raise Exception(f'Cannot truncate table. Target "{table_name}" is unavailable.')
+
+        self._close()
+
     def create_dataset(self, dataset_id: str = None) -> None:
         """
             Cria um dado dataset_id de acordo com o valor recebido.
+
+            Datasets de mock (diferentes do default) são criados com labels
+            de owner, run_id e expiração e com expiração default de tabelas,
+            permitindo sua remoção pelo coletor (ver collector). Com
+            --persist-dataset, o dataset recebe o label persist, sem expiração
+            de tabelas, inclusive quando já existir.
         """         
         self._open()
 
         if dataset_id:
             params.__HELPER__.dataset_id = dataset_id
 
-        if not self.is_dataset(params.__HELPER__.dataset_id):
-            dataset = bigquery.Dataset(f'{params.__HELPER__.project_id}.{params.__HELPER__.dataset_id}')
-            self.open.create_dataset(dataset, timeout=30, exists_ok=True)
+        mocked = params.__HELPER__.dataset_id != params.__HELPER__.config.default_dataset_test
+        persist = bool(params.__CLI__ and params.__CLI__.persist_dataset)
+        target = f'{params.__HELPER__.project_id}.{params.__HELPER__.dataset_id}'
+
+        with profiler.blocked('create_dataset'):
+            if not self.is_dataset(params.__HELPER__.dataset_id):
+                dataset = bigquery.Dataset(target)
+
+                if mocked:
+                    dataset.labels = Governance().dataset_labels(
+                        owner=params.__HELPER__.hostname,
+                        run_id=params.__HELPER__.run_id,
+                        expiration=params.__DATASET_EXPIRATION__,
+                        persist=persist
+                    )
+
+                    if not persist:
+                        dataset.default_table_expiration_ms = params.__DATASET_EXPIRATION__ * 1000
+
+                self.open.create_dataset(dataset, timeout=30, exists_ok=True)
+
+            # Dataset reutilizado com --persist-dataset deixa de ser coletado
+            elif mocked and persist:
+                dataset = self.open.get_dataset(target)
+                dataset.labels = {**(dataset.labels or dict()), 'persist': 'true'}
+                dataset.default_table_expiration_ms = None
+                self.open.update_dataset(dataset, ['labels', 'default_table_expiration_ms'])
 
         self._close()   
 
+    def list_datasets(self, label: str = None) -> dict:
+        """
+            Retorna os datasets do projeto e seus labels em uma única listagem.
+
+            :param: label -> Filtro de listagem por label (ex: labels.chave:valor).
+        """
+
+        self._open()
+
+        with profiler.blocked('list_datasets'):
+            found = {
+                item.dataset_id: dict(item.labels or dict())
+                for item in self.open.list_datasets(filter=label)
+            }
+
+        self._close()
+        return found
+
     def drop_dataset(self, dataset_id: str = None) -> None:
         """
             Remove um dado dataset_id de acordo com valor recebido.
@@ -177,12 +310,13 @@ class Client:
         # if dataset_id:
         #     params.__HELPER__.dataset_id = dataset_id
 
-        self.open.delete_dataset(
-            # dataset=params.__HELPER__.dataset_id, 
-            dataset=dataset_id,
-            delete_contents=True, 
-            not_found_ok=True
-        )
+        with profiler.blocked('drop_dataset'):
+            self.open.delete_dataset(
+                # dataset=params.__HELPER__.dataset_id, 
+                dataset=dataset_id,
+                delete_contents=True, 
+                not_found_ok=True
+            )
               
         self._close()
 
@@ -192,14 +326,15 @@ class Client:
         """        
         self._open()
 
-        # Verifica primeiro se a tabela informada para criação já existe.
-        if not self.is_table(table_name=table_name):
+        with profiler.blocked('create_table'):
+            # Verifica primeiro se a tabela informada para criação já existe.
+            if not self.is_table(table_name=table_name):
 
-            table_id = bigquery.Table(self.table_id(table_name, search), schema=schema)
-            self.open.create_table(table_id, exists_ok=True)
-            expiration = gen.datetime_from_diff(days=3)
-            table_id.expires = expiration
-            self.open.update_table(table_id, ["expires"])
+                table_id = bigquery.Table(self.table_id(table_name, search), schema=schema)
+                self.open.create_table(table_id, exists_ok=True)
+                expiration = gen.datetime_from_diff(days=3)
+                table_id.expires = expiration
+                self.open.update_table(table_id, ["expires"])
        
         self._close()
 
@@ -214,8 +349,9 @@ class Client:
         destination = None
         
         try:
-            job = self.open.query(query)
-            job.result()
+            with profiler.blocked('temporary_table'):
+                job = self.open.query(query)
+                job.result()
             destination = job.destination
         except Exception:
             raise Exception(f'Cannot get temporary_table')
@@ -319,7 +455,8 @@ class Client:
             table_id = main_name
 
         try:
-            schema = self.open.get_table(table_id).schema
+            with profiler.blocked('fetch_schema'):
+                schema = self.open.get_table(table_id).schema
         except NotFound:
             Exception('Cannot find an existing table reference.')
         
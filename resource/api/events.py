@@ -6,10 +6,15 @@
 from tests.resource.utils.logger import logger
 from tests.resource.api.client import Client
 from tests.resource.helpers import params
+import pandas as pd
 
 
 client = Client()
 
+# Tabelas já criadas no dataset da suite e tabelas com linhas de testcases anteriores
+created = set()
+loaded = set()
+
 
 def reset_dataset() -> None:
     """
@@ -32,29 +37,60 @@ def reset_dataset() -> None:
 def create_artefact_objects(artefact) -> None:
     """
         Método responsável por criar tabelas dependentes para
-        funcionamento da query.
+        funcionamento da query. Executado uma vez por suite
+        (ver actions.setUpClass).
     """
 
     global client
 
     reset_dataset()
+    release()
 
     # Para cada tabela dependente da regra é definido o schema adequado para criação
     for table_name in artefact.dependencies:
         schema = client.fetch_schema(table_name=table_name)
         client.create_table(table_name=table_name, schema=schema)
+        created.add(table_name)
 
     if not params.__HELPER__.default:
         logger.info('Created required tables')
 
 
-def mockup_to_bigquery(mock: dict) -> None:
+def merge(mocks: list) -> dict:
+    """
+        Une os eventos de vários Data Mocks por tabela para que cada
+        tabela seja carregada em um único job (ver actions.batch).
+
+        :param: mocks -> Lista de dicionários de eventos dos Data Mocks.
+    """
+
+    merged = dict()
+
+    for events in mocks:
+        for identifier, dataframe in events.items():
+            if dataframe is not None:
+                merged.setdefault(identifier, list()).append(dataframe)
+
+    return {identifier: pd.concat(dataframes, ignore_index=True) for identifier, dataframes in merged.items()}
+
+
+def mockup_to_bigquery(mock: dict, truncate: bool = False) -> None:
     """
         Rotina responsável por enviar o Data Mock ao BigQuery
-        agrupado por tabela.
+        agrupado por tabela. Tabelas já criadas na suite não são
+        criadas novamente.
+
+        Com isolation truncate (ou truncate informado), a primeira carga de
+        cada tabela substitui as linhas existentes e as tabelas carregadas
+        por testcases anteriores que não fazem parte do Data Mock atual
+        são truncadas.
     """
     
     global client
+    global loaded
+
+    truncate = truncate or params.__HELPER__.config.isolation == 'truncate'
+    written = set()
 
     for dataframe in mock.values():
 
@@ -64,10 +100,29 @@ def mockup_to_bigquery(mock: dict) -> None:
             
             for table_name, df_group in dataframe.groupby('table_name', sort=False):
                 
-                main_name = df_group['main_name'].iloc[0]
-                schema = client.fetch_schema(main_name=main_name, table_name=table_name)
-                
-                client.create_table(table_name=table_name, schema=schema)
-                client.insert_by_json(table_name=table_name, data=df_group)
+                if table_name not in created:
+                    main_name = df_group['main_name'].iloc[0]
+                    schema = client.fetch_schema(main_name=main_name, table_name=table_name)
+                    client.create_table(table_name=table_name, schema=schema)
+                    created.add(table_name)
+
+                disposition = 'WRITE_TRUNCATE' if truncate and table_name not in written else 'WRITE_APPEND'
+                client.insert_by_json(table_name=table_name, data=df_group, disposition=disposition)
+                written.add(table_name)
 
                 logger.info(f'{len(df_group.index)} row(s) sent to {table_name}')
+
+    if truncate:
+        for table_name in sorted(loaded - written):
+            client.truncate_table(table_name=table_name)
+            logger.info(f'Truncated {table_name}')
+
+    loaded = written if truncate else loaded | written
+
+
+def release() -> None:
+    """
+        Limpa o controle de tabelas criadas e carregadas do dataset da suite.
+    """
+    created.clear()
+    loaded.clear()
@@ -27,6 +27,7 @@ class LogResult:
         self.user = self._user()
         self.dataset = self._dataset()
         self.key = self._key(data)
+        self.seed = self._seed(data)
         self.env = self._env()
         self.units = self._units(units)
 
@@ -108,6 +109,13 @@ class LogResult:
         """
         return data.key.lower()
 
+    def _seed(self, data) -> int:
+        """
+            Retorna a semente utilizada pelo Mocker para gerar
+            a massa de dados do teste.
+        """
+        return data.seed
+
     def _env(self) -> str:
         """
             Retorna o tipo de ambiente identificado na instância do Helper
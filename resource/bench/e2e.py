@@ -0,0 +1,370 @@
+"""
+    Benchmark ponta a ponta da biblioteca. Gera suites sintéticas no formato
+    de suites/_template (N testcases, M tabelas dependentes, K linhas por
+    tabela e asserções configuráveis) e executa o fluxo completo
+    Loader -> actions.setUpClass -> asserções -> tearDownClass contra o
+    Client falso, que simula a latência de cada operação do BigQuery.
+    Reporta o tempo por fase e total para cada escala informada.
+
+    Uso:
+        python -m tests.resource.bench.e2e
+        python -m tests.resource.bench.e2e --scales 1:1:10 5:3:1000 --latency 0.01
+        python -m tests.resource.bench.e2e --asserts distinct datetime array --repeat 2
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import unittest
+import pandas as pd
+from tests.resource.bench import fake
+
+fake.install()
+
+from tests import home
+from tests.resource.bench import entity
+from tests.resource.entities import mockups
+from tests.resource.cases.handlers import Loader
+from tests.resource.cases import asserts
+from tests.resource.cases import engine
+from tests.resource.helpers import artefact
+from tests.resource.helpers import helper
+from tests.resource.utils import actions
+from tests.resource.utils import mocker
+from tests.resource.utils import generator as gen
+from tests.resource.utils import validator as val
+from tests.resource.utils.logger import logger
+from tests.resource.api import events
+
+
+WORKDIR = './tests/tmp/bench/e2e'
+PIPELINE = 'bqtest_bench_e2e'
+
+# Asserções disponíveis: nome -> função que recebe K e retorna (unittest, valor esperado)
+assertions = {
+    'distinct': lambda rows: ('my_id_should_be_distinct', None),
+    'datetime': lambda rows: ('my_datetime_should_not_have_datetime_before', '2000-01-01 00:00:00'),
+    'sequence': lambda rows: ('my_string_should_be_in_sequence', ['test'] * rows),
+    'array': lambda rows: ('my_items.tags_should_have_on_array_length_sequence', [2, 1] * rows)
+}
+
+# Fases medidas: nome -> (módulo, atributo)
+phases = {
+    'helper': (helper, 'Helper'),
+    'artefact': (artefact, 'Artefact'),
+    'mocker': (mocker, 'build'),
+    'provision': (events, 'create_artefact_objects'),
+    'upload': (events, 'mockup_to_bigquery'),
+    'query': (artefact, 'run'),
+    'teardown': (actions, 'tearDownClass'),
+    'teardown_suite': (actions, 'tearDownSuite')
+}
+
+
+class Scale:
+    """
+        Escala de uma execução do benchmark.
+
+        Attributes:
+        :param: testcases -> Total de testcases da suite (N).
+        :param: tables -> Total de tabelas dependentes do artefato (M).
+        :param: rows -> Total de linhas por tabela (K).
+    """
+
+    def __init__(self, alias: str):
+        self.alias = alias
+        self.testcases, self.tables, self.rows = self._parse(alias)
+        self.suite = f'bench_{self.testcases}_{self.tables}_{self.rows}'
+
+    def _parse(self, alias: str) -> tuple:
+        """
+            Converte o alias N:M:K em uma tupla de inteiros positivos.
+        """
+
+        try:
+            values = tuple(int(value) for value in alias.split(':'))
+        except ValueError:
+            values = tuple()
+
+        if len(values) != 3 or min(values) < 1:
+            raise Exception(f'Not a valid scale: {alias}. Expected N:M:K (testcases:tables:rows).')
+
+        return values
+
+
+class Timer:
+    """
+        Acumula o tempo gasto em cada fase substituindo temporariamente
+        as funções medidas por versões cronometradas.
+    """
+
+    def __init__(self):
+        self.elapsed = dict()
+        self.calls = dict()
+        self.originals = dict()
+
+    def _wrap(self, name: str, function):
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.elapsed[name] = self.elapsed.get(name, 0.0) + time.perf_counter() - start
+                self.calls[name] = self.calls.get(name, 0) + 1
+
+        return timed
+
+    def __enter__(self):
+
+        for name, (module, attribute) in phases.items():
+            self.originals[name] = getattr(module, attribute)
+            setattr(module, attribute, self._wrap(name, self.originals[name]))
+
+        # As asserções são obtidas do módulo na montagem de cada testcase
+        for attribute in [x for x in dir(asserts) if x.startswith('should')]:
+            self.originals[f'asserts.{attribute}'] = getattr(asserts, attribute)
+            setattr(asserts, attribute, self._wrap('asserts', self.originals[f'asserts.{attribute}']))
+
+        return self
+
+    def __exit__(self, *args):
+
+        for name, function in self.originals.items():
+            if name.startswith('asserts.'):
+                setattr(asserts, name.split('.', 1)[-1], function)
+            else:
+                module, attribute = phases[name]
+                setattr(module, attribute, function)
+
+
+def _mockup(scale: Scale) -> str:
+    """
+        Retorna o bloco mockup de um testcase com K linhas por tabela.
+    """
+
+    return ''.join(
+        f"""
+    - project.dataset.bench_{table}:
+        count: {scale.rows}
+        step: M+1
+        generate:
+          my_id: identifier
+        my_string: test
+        my_date_datetime: D + 1
+        my_integer: {table}"""
+        for table in range(scale.tables)
+    )
+
+
+def generate(workdir: str, scale: Scale, kinds: list, isolation: str = 'key') -> str:
+    """
+        Escreve a suite sintética (test.yaml e config.yaml) em workdir/suites
+        e o pipeline do artefato em home/PIPELINE. Retorna o nome da suite.
+    """
+
+    folder = os.path.join(workdir, 'suites', scale.suite)
+    pipeline = os.path.join(home, PIPELINE)
+    os.makedirs(folder, exist_ok=True)
+    os.makedirs(pipeline, exist_ok=True)
+
+    unittests = dict(assertions[kind](scale.rows) for kind in kinds)
+    block = ''.join(f'\n    {name}: {json.dumps(value)}' for name, value in unittests.items())
+    mockup = _mockup(scale)
+
+    with open(os.path.join(folder, 'test.yaml'), 'w', encoding='utf8') as f:
+        for index in range(scale.testcases):
+            f.write(f"""BENCH_{index:05d}:
+  documentation:
+    tags: [bench]
+    desc: Testcase sintético de benchmark.
+  unittests:{block}
+  settings:
+    base_date: "2020-01-01 00:00:00"
+  mockup:{mockup}
+
+""")
+
+    with open(os.path.join(folder, 'config.yaml'), 'w', encoding='utf8') as f:
+        f.write(f"""query:
+  location:
+    pipeline_file: {PIPELINE}/parameters.yaml
+    pipeline_name: bench
+
+  fetch:
+    search: mock.key
+    where: my_key
+    order: my_integer
+
+environment:
+  default_dataset_test: ds_mock_bench
+  isolation: {isolation}
+""")
+
+    joins = ''.join(
+        f'\n    LEFT JOIN `project.dataset.bench_{table}` AS B{table} ON B0.my_key = B{table}.my_key'
+        for table in range(1, scale.tables)
+    )
+
+    with open(os.path.join(pipeline, 'bench.sql'), 'w', encoding='utf8') as f:
+        f.write(f"""SELECT B0.*
+    FROM `project.dataset.bench_0` AS B0{joins}
+    WHERE B0.my_integer >= ${{{{minimum}}}}
+""")
+
+    with open(os.path.join(pipeline, 'parameters.yaml'), 'w', encoding='utf8') as f:
+        f.write("""pipelines:
+  bench:
+    parameters:
+      args_operator:
+        BigQueryOperator:
+          sql: bench.sql
+          params:
+            minimum: 0
+          destination_dataset_table: project.dataset.bench_result
+""")
+
+    return scale.suite
+
+
+def respond(query: str) -> list:
+    """
+        Responder do Client falso: devolve as linhas da última carga da
+        tabela bench_0 no formato TO_JSON_STRING do BigQuery.
+    """
+
+    loads = fake.tables.get('bench_0')
+
+    if not loads:
+        return list()
+
+    start = time.perf_counter()
+
+    df = loads[-1].drop(columns=['table_name', 'main_name', 'interval'], errors='ignore').copy()
+    df['my_datetime'] = pd.to_datetime(df['my_datetime'], errors='coerce').dt.strftime(engine.RESULT_PATTERN)
+    df['valid_record'] = True
+
+    rows = [{'JSON': json.dumps(record, default=str), 'KEY': record['my_key']} for record in df.to_dict(orient='records')]
+
+    # Tempo gasto montando a resposta, descontável das fases de consulta
+    fake.waits['responder'] = fake.waits.get('responder', 0.0) + time.perf_counter() - start
+
+    return rows
+
+
+def execute(workdir: str, suite: str, rebuild: bool, batch: bool = False) -> dict:
+    """
+        Executa a suite com o runner do unittest e retorna os tempos
+        por fase, o total e as esperas simuladas do Client falso.
+    """
+
+    fake.reset()
+
+    argv = sys.argv
+    sys.argv = ['main.py', '-s', suite] + (['-rm'] if rebuild else []) + (['-b'] if batch else [])
+
+    try:
+        with Timer() as timer:
+            start = time.perf_counter()
+
+            loading = time.perf_counter()
+            loader = Loader(cmd=sys.argv, filep=os.path.join(workdir, 'main.py'))
+            timer.elapsed['loader'] = time.perf_counter() - loading
+
+            outcome = unittest.TextTestRunner(stream=io.StringIO(), descriptions=0, verbosity=0).run(loader.suite)
+            total = time.perf_counter() - start
+    finally:
+        sys.argv = argv
+
+    return {
+        'total': total,
+        'phases': timer.elapsed,
+        'calls': timer.calls,
+        'waits': dict(fake.waits),
+        'client_calls': dict(fake.calls),
+        'tests': outcome.testsRun,
+        'failures': len(outcome.failures),
+        'errors': len(outcome.errors)
+    }
+
+
+def main(argv: list = None) -> int:
+    """
+        Gera as suites de cada escala, executa o fluxo completo e reporta
+        os tempos. Retorna 1 caso algum unittest falhe ou apresente erro.
+    """
+
+    parser = argparse.ArgumentParser(description='BQTest Library End-to-end Benchmark')
+    parser.add_argument('--scales', '-sc', nargs='+', default=['1:1:10', '10:3:100', '5:3:10000'], help='Scales as N:M:K (testcases:tables:rows). Default is 1:1:10 10:3:100 5:3:10000.')
+    parser.add_argument('--asserts', '-a', nargs='+', default=['distinct', 'datetime'], choices=list(assertions), help='Assertions of each testcase. Default is distinct datetime.')
+    parser.add_argument('--latency', '-l', type=float, default=0.0, help='Multiplier of the simulated BigQuery latencies. Default is 0 (no latency).')
+    parser.add_argument('--isolation', '-i', default='key', choices=['key', 'truncate'], help='Isolation of the Data Mocks in the suite tables. Default is key.')
+    parser.add_argument('--repeat', '-rp', type=int, default=1, help='Runs of each scale in the same process (later runs measure caching). Default is 1.')
+    parser.add_argument('--batch', '-b', action='store_true', help='Run the testcases with --batch.')
+    parser.add_argument('--rebuild-mocks', '-rm', action='store_true', help='Ignore the local Data Mock cache in every run.')
+    parser.add_argument('--workdir', '-w', type=str, default=WORKDIR, help=f'Folder of the synthetic suites. Default is {WORKDIR}.')
+    parser.add_argument('--output', '-o', type=str, help='Write the JSON results to this file. Optional.')
+    args = parser.parse_args(argv)
+
+    fake.scale = args.latency
+    fake.responder = respond
+    mockups['bench'] = entity.Mock
+
+    scales = [Scale(alias) for alias in args.scales]
+    results = dict()
+    failed = False
+
+    try:
+        for scale in scales:
+            suite = generate(workdir=args.workdir, scale=scale, kinds=args.asserts, isolation=args.isolation)
+            results[scale.alias] = list()
+
+            for _ in range(args.repeat):
+
+                # Mantém a saída limpa durante as medições
+                logging.disable(logging.CRITICAL)
+                try:
+                    run = execute(workdir=args.workdir, suite=suite, rebuild=args.rebuild_mocks, batch=args.batch)
+                finally:
+                    logging.disable(logging.NOTSET)
+
+                results[scale.alias].append(run)
+                failed = failed or bool(run['failures'] or run['errors'])
+    finally:
+        shutil.rmtree(os.path.join(home, PIPELINE), ignore_errors=True)
+
+    for alias, runs in results.items():
+        for index, run in enumerate(runs):
+            waited = sum(value for key, value in run['waits'].items() if key != 'responder')
+            logger.info(
+                f"{alias:<14s} run {index + 1}  total {run['total']:>9.3f} s   "
+                f"client wait {waited:>9.3f} s   tests {run['tests']} failures {run['failures']} errors {run['errors']}"
+            )
+            for name, elapsed in sorted(run['phases'].items(), key=lambda x: -x[1]):
+                logger.info(f"{'':<14s}   {name:<12s} {elapsed:>9.3f} s  ({run['calls'].get(name, 1)} call(s))")
+
+    payload = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': gen.datetime_from_current(),
+            'latency': args.latency,
+            'asserts': args.asserts
+        },
+        'results': results
+    }
+
+    if args.output:
+        val.write_file(content=json.dumps(payload, indent=2), file=os.path.splitext(os.path.basename(args.output))[0], ext='json', path=os.path.dirname(args.output) or '.')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+    Entidade sintética utilizada pelos benchmarks para construir Data Mocks
+    sem depender das entidades do projeto.
+"""
+
+
+class Mock:
+
+    """
+        Classe para geração da tabela sintética de benchmark em formato Mock
+
+        Attributes:
+        :param tree: Dicionário de configurações informadas no YAML.
+        :param person: Instância de uma classe de components.
+        :param event: Lista de eventos para herança.
+    """
+
+    def __init__(self, tree: dict, person, event=dict()):
+        self.my_key = person.key
+        self.my_string = tree.get('my_string')
+        self.my_datetime = tree.get('interval2')
+        self.my_integer = tree.get('my_integer')
+        self.my_items = [{'tags': ['a', 'b']}, {'tags': ['c']}]
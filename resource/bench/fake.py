@@ -0,0 +1,167 @@
+"""
+    Script com um Client falso da API do BigQuery para execução offline
+    dos benchmarks. As tabelas ficam em memória e as queries não são
+    executadas: o resultado do fetch é obtido por uma função de resposta
+    configurável (responder). Cada operação pode simular a latência
+    da API do BigQuery (latencies x scale).
+"""
+
+import sys
+import time
+import types
+import pandas as pd
+from tests.resource.helpers import params
+from tests.resource.utils import profiler
+
+
+# Tabelas enviadas ao Client falso: table_name -> lista de dataframes
+tables = dict()
+
+# Função que recebe a query de fetch e retorna a lista de linhas (dicionários)
+responder = None
+
+# Latência simulada em segundos por operação, multiplicada por scale (0 desativa)
+latencies = {
+    'select': 1.0,
+    'pages': 0.8,
+    'page': 0.05,
+    'insert_by_json': 1.5,
+    'insert_by_query': 2.0,
+    'script': 1.2,
+    'create_dataset': 0.5,
+    'drop_dataset': 0.8,
+    'list_datasets': 0.5,
+    'create_table': 0.4,
+    'truncate_table': 0.8,
+    'temporary_table': 1.0,
+    'fetch_schema': 0.2,
+    'get_user_email': 0.3
+}
+scale = 0.0
+
+# Tempo simulado (segundos) e total de chamadas por operação
+waits = dict()
+calls = dict()
+
+
+def _wait(operation: str) -> None:
+    """
+        Simula a latência de uma operação e contabiliza o tempo de espera.
+    """
+
+    delay = latencies.get(operation, 0.0) * scale
+    calls[operation] = calls.get(operation, 0) + 1
+    waits[operation] = waits.get(operation, 0.0) + delay
+
+    if delay > 0:
+        with profiler.blocked(operation):
+            time.sleep(delay)
+
+
+def reset() -> None:
+    """
+        Limpa as tabelas em memória e as métricas de espera.
+    """
+    tables.clear()
+    waits.clear()
+    calls.clear()
+
+
+class Client:
+    """
+        Client falso com a mesma interface de tests.resource.api.client.Client.
+    """
+
+    def __init__(self):
+        self.open = None
+        self.close = None
+        self.usage = dict()
+
+    def table_id(self, table_name, search='tst') -> str:
+        return f'bench-project.bench_dataset.{table_name}'
+
+    def select(self, query: str, output: str, replacer: bool = True, table_name: str = None, search: str = 'tst', parameters: dict = None):
+        _wait('select')
+        rows = responder(query) if responder else list()
+        return rows if output == 'DICT' else pd.DataFrame(rows)
+
+    def pages(self, query: str, replacer: bool = True, table_name: str = None, search: str = 'tst', page_size: int = None, parameters: dict = None):
+        _wait('pages')
+
+        # Script de artefato e fetch em um único job (ver artefact.fetch)
+        if 'CREATE OR REPLACE TABLE' in query:
+            _wait('script')
+            tables[table_name] = list()
+
+        rows = responder(query) if responder else list()
+        size = page_size or len(rows) or 1
+
+        for start in range(0, len(rows), size):
+            _wait('page')
+            yield rows[start:start + size]
+
+    def insert_by_json(self, data, table_name: str, search: str = 'tst', disposition: str = 'WRITE_APPEND') -> None:
+        _wait('insert_by_json')
+        tables.setdefault(table_name, list()).append(data)
+
+    def insert_by_query(self, table_name: str, query: str, disposition: str = 'WRITE_TRUNCATE') -> None:
+        _wait('insert_by_query')
+        tables[table_name] = list()
+
+    def truncate_table(self, table_name: str, search: str = 'tst') -> None:
+        _wait('truncate_table')
+        tables[table_name] = list()
+
+    def create_dataset(self, dataset_id: str = None) -> None:
+        _wait('create_dataset')
+        if dataset_id:
+            params.__HELPER__.dataset_id = dataset_id
+
+    def list_datasets(self, label: str = None) -> dict:
+        _wait('list_datasets')
+        return dict()
+
+    def drop_dataset(self, dataset_id: str = None) -> None:
+        _wait('drop_dataset')
+        tables.clear()
+
+    def create_table(self, table_name: str, schema: list, search: str = 'tst') -> None:
+        _wait('create_table')
+        tables.setdefault(table_name, list())
+
+    def temporary_table(self, query: str) -> str:
+        _wait('temporary_table')
+        return 'bench-project._temporary.anon'
+
+    def fetch_schema(self, main_name: str = None, table_name: str = None) -> list:
+        if table_name not in self.usage:
+            _wait('fetch_schema')
+        return self.usage.setdefault(table_name, list())
+
+    def get_user_email(self):
+        _wait('get_user_email')
+        params.__USER_EMAIL__ = 'bench@localhost'
+
+
+def install(latency: float = 0.0) -> None:
+    """
+        Substitui o módulo tests.resource.api.client pelo Client falso,
+        inclusive nos módulos já importados que referenciam Client.
+
+        :param: latency -> Multiplicador das latências simuladas (0 desativa).
+    """
+    global scale
+
+    scale = latency
+
+    module = types.ModuleType('tests.resource.api.client')
+    module.Client = Client
+    module.__file__ = __file__
+    sys.modules['tests.resource.api.client'] = module
+
+    for name, loaded in list(sys.modules.items()):
+        if name.startswith('tests.resource.') and loaded is not None and name != module.__name__:
+            if isinstance(getattr(loaded, 'Client', None), type):
+                loaded.Client = Client
+            if name == 'tests.resource.api.events':
+                loaded.client = Client()
@@ -0,0 +1,350 @@
+"""
+    Micro-benchmarks dos caminhos críticos em Python puro da biblioteca
+    (geradores, componentes, validações, Mocker, asserções e contagem de
+    arrays). Executa offline com o Client falso e compara os resultados
+    com uma baseline salva, falhando em caso de regressão.
+
+    Uso:
+        python -m tests.resource.bench.micro
+        python -m tests.resource.bench.micro --save
+        python -m tests.resource.bench.micro --threshold 0.30 --filter mocker
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import unittest
+import statistics
+import pandas as pd
+from tests.resource.bench import fake
+
+fake.install()
+
+from tests.resource.bench import entity
+from tests.resource.entities import mockups
+from tests.resource.helpers import artefact
+from tests.resource.cases import asserts
+from tests.resource.cases import engine
+from tests.resource.cases import utils
+from tests.resource.cases import spy
+from tests.resource.utils import components
+from tests.resource.utils import mocker
+from tests.resource.utils import generator as gen
+from tests.resource.utils import validator as val
+from tests.resource.utils.logger import logger
+
+
+BASELINE = './tests/tmp/bench/micro.json'
+
+QUERY = """
+    WITH BASE AS (
+        SELECT * FROM `project.dataset.table_a` AS A
+        JOIN `project.dataset.table_b` AS B ON A.id = B.id
+    )
+    SELECT * FROM BASE
+    LEFT JOIN `project.dataset.table_c` AS C ON BASE.id = C.id
+"""
+
+
+class Benchmark:
+    """
+        Benchmark registrado por uma função de preparação que retorna
+        a função medida.
+
+        Attributes:
+        :param: name -> Nome do benchmark.
+        :param: setup -> Função de preparação.
+        :param: number -> Total de chamadas por repetição.
+        :param: repeat -> Total de repetições.
+        :param: heavy -> Indica se o benchmark é ignorado em --quick.
+    """
+
+    def __init__(self, name: str, setup, number: int, repeat: int, heavy: bool):
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.repeat = repeat
+        self.heavy = heavy
+
+    def run(self) -> dict:
+        """
+            Executa o benchmark e retorna o tempo por chamada em segundos.
+        """
+
+        target = self.setup()
+        timings = list()
+
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for _ in range(self.number):
+                target()
+            timings.append((time.perf_counter() - start) / self.number)
+
+        return {
+            'number': self.number,
+            'repeat': self.repeat,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings)
+        }
+
+
+benchmarks = list()
+
+
+def benchmark(name: str, number: int = 1, repeat: int = 5, heavy: bool = False):
+    """
+        Registra uma função de preparação como benchmark.
+    """
+
+    def register(setup):
+        benchmarks.append(Benchmark(name=name, setup=setup, number=number, repeat=repeat, heavy=heavy))
+        return setup
+
+    return register
+
+
+@benchmark('generator.cpf', number=10000)
+def _cpf():
+    return gen.cpf
+
+
+@benchmark('generator.idcode', number=10000)
+def _idcode():
+    return gen.idcode
+
+
+@benchmark('generator.alias_date', number=10000)
+def _alias_date():
+    return lambda: gen.alias_date('D+1H-2', start_date='2020-01-01 00:00:00')
+
+
+@benchmark('generator.gender', number=10000)
+def _gender():
+    return gen.gender
+
+
+@benchmark('components.Interval', number=5000)
+def _interval():
+    return lambda: components.Interval(absolute_date='2020-01-01 00:00:00', diff='D+1')
+
+
+@benchmark('components.Base_Date', number=5000)
+def _base_date():
+    return lambda: components.Base_Date('Y-1')
+
+
+@benchmark('validator.is_alias', number=20000)
+def _is_alias():
+    return lambda: val.is_alias('M-3')
+
+
+@benchmark('validator.get_table_ids', number=2000)
+def _get_table_ids():
+    return lambda: val.get_table_ids(content=QUERY)
+
+
+@benchmark('validator.get_readable_payload', number=20)
+def _get_readable_payload():
+    df = pd.DataFrame({'my_string': ['test'] * 1000, 'my_integer': range(1000)})
+    return lambda: val.get_readable_payload(df)
+
+
+def _suite(rows: int) -> str:
+    """
+        Escreve um test.yaml sintético com um testcase de rows linhas
+        e retorna o caminho do arquivo.
+    """
+
+    folder = tempfile.mkdtemp(prefix='bqtest_bench_')
+    target = os.path.join(folder, 'test.yaml')
+
+    if rows <= 10:
+        events = ''.join(
+            f"""
+    - project.dataset.bench:
+        my_string: test_{index}
+        my_date_datetime: D + {index}
+        my_integer: {index}"""
+            for index in range(rows)
+        )
+    else:
+        events = f"""
+    - project.dataset.bench:
+        count: {rows}
+        step: H+1
+        generate:
+          my_id: identifier
+          my_cpf: cpf
+        my_string: test
+        my_date_datetime: D + 1
+        my_integer: 1"""
+
+    with open(target, 'w', encoding='utf8') as f:
+        f.write(f"""BENCH:
+  documentation:
+    tags: [bench]
+  unittests:
+    my_integer_should_be_distinct: ~
+  settings:
+    base_date: "2020-01-01 00:00:00"
+  mockup:{events}
+""")
+
+    return target
+
+
+def _mocker(rows: int):
+    mockups['bench'] = entity.Mock
+    target = _suite(rows)
+    return lambda: mocker.Mocker(path=target, suite='bench', testcase='BENCH')
+
+
+@benchmark('mocker.build.10', number=5)
+def _mocker_10():
+    return _mocker(10)
+
+
+@benchmark('mocker.build.1k', number=1, repeat=5)
+def _mocker_1k():
+    return _mocker(1000)
+
+
+@benchmark('mocker.build.100k', number=1, repeat=3, heavy=True)
+def _mocker_100k():
+    return _mocker(100000)
+
+
+@benchmark('asserts.50k', number=1, repeat=5)
+def _asserts():
+
+    artefact.result = [
+        {
+            'my_string': f'test_{index}',
+            'my_datetime': '2020-01-01T00:00:00Z',
+            'my_items': [{'tags': ['a', 'b']}, {'tags': ['c']}],
+            'valid_record': True
+        }
+        for index in range(50000)
+    ]
+
+    unittests = {
+        'my_string_should_be_in_sequence': [f'test_{index}' for index in range(50000)],
+        'my_string_should_be_distinct': None,
+        'my_datetime_should_not_have_datetime_before': '2020-01-01 00:00:00',
+        'my_items.tags_should_have_on_array_length_sequence': [2, 1] * 50000
+    }
+
+    owner = type('BENCH', (unittest.TestCase,), {'unittests': unittests})
+
+    def target():
+        spy.release()
+        engine.release()
+
+        for name in unittests:
+            function = getattr(asserts, f"should{name.split('should')[-1]}")
+            function(owner, value=unittests[name], expected=name, field=name.split('should')[0][:-1])
+
+    return target
+
+
+@benchmark('utils.perform_array_column_to_count', number=5)
+def _perform_array_column_to_count():
+    df = pd.DataFrame({'my_items': [[{'tags': list(range(index % 5))} for _ in range(4)] for index in range(5000)]})
+    return lambda: utils.perform_array_column_to_count(df=df, field='my_items.tags')
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+        Retorna os benchmarks com mediana acima da baseline em mais de
+        threshold (ex: 0.25 -> 25% mais lento).
+    """
+
+    regressions = list()
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+
+        if previous is None or not previous.get('median'):
+            continue
+
+        ratio = current['median'] / previous['median']
+
+        if ratio > 1 + threshold:
+            regressions.append({'name': name, 'ratio': ratio, 'median': current['median'], 'baseline': previous['median']})
+
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """
+        Executa os benchmarks selecionados e retorna 1 em caso de regressão.
+    """
+
+    parser = argparse.ArgumentParser(description='BQTest Library Micro-benchmarks')
+    parser.add_argument('--output', '-o', type=str, help='Write the JSON results to this file. Optional.')
+    parser.add_argument('--baseline', '-b', type=str, default=BASELINE, help=f'Baseline JSON file. Default is {BASELINE}.')
+    parser.add_argument('--save', action='store_true', help='Save the results as the new baseline.')
+    parser.add_argument('--threshold', '-th', type=float, default=0.25, help='Allowed slowdown ratio over the baseline median. Default is 0.25.')
+    parser.add_argument('--filter', '-f', type=str, help='Run only benchmarks whose name matches the regex.')
+    parser.add_argument('--quick', '-q', action='store_true', help='Skip heavy benchmarks (100k rows).')
+    args = parser.parse_args(argv)
+
+    # Mantém a saída limpa durante as medições
+    logging.disable(logging.INFO)
+
+    results = dict()
+
+    for bench in benchmarks:
+        if args.filter and not re.search(args.filter, bench.name):
+            continue
+        if args.quick and bench.heavy:
+            continue
+
+        results[bench.name] = bench.run()
+
+    logging.disable(logging.NOTSET)
+
+    for name, result in results.items():
+        logger.info(f"{name:<40s} median {result['median'] * 1e6:>14.2f} us   min {result['min'] * 1e6:>14.2f} us")
+
+    payload = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': gen.datetime_from_current()
+        },
+        'results': results
+    }
+
+    if args.output:
+        val.write_file(content=json.dumps(payload, indent=2), file=os.path.splitext(os.path.basename(args.output))[0], ext='json', path=os.path.dirname(args.output) or '.')
+
+    if args.save:
+        val.write_file(content=json.dumps(payload, indent=2), file=os.path.splitext(os.path.basename(args.baseline))[0], ext='json', path=os.path.dirname(args.baseline) or '.')
+        logger.info(f'Saved baseline at {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        logger.warning(f'Baseline {args.baseline} not found. Run with --save to create it.')
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf8') as f:
+        baseline = json.load(f).get('results', dict())
+
+    regressions = compare(results, baseline, args.threshold)
+
+    for regression in regressions:
+        logger.critical(f"Regression {regression['name']}: {regression['ratio']:.2f}x baseline")
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+    Casos de regressão das rotinas que não dependem do BigQuery (lexer de
+    referências de tabelas, renderização do artefato, acumuladores do
+    engine, push-down, coletor de datasets, cache de Data Mocks e índice
+    de tags).
+    Executa offline com o Client falso.
+
+    Uso:
+        python -m tests.resource.bench.regression
+"""
+
+import sys
+import tempfile
+import unittest
+import pandas as pd
+from tests.resource.bench import fake
+
+fake.install()
+
+from tests.resource.utils import lexer
+from tests.resource.helpers import artefact
+from tests.resource.cases import spy
+from tests.resource.cases import engine
+from tests.resource.cases import pushdown
+from tests.resource.utils import cache
+from tests.resource.utils import indexer
+from tests.resource.utils import collector
+from tests.resource.utils.governance import Governance
+
+
+def _tables(query: str) -> list:
+    """
+        Retorna os table_ids das referências encontradas pelo lexer.
+    """
+    return [reference.table_id for reference in lexer.references(query)]
+
+
+class Lexer(unittest.TestCase):
+    """
+        Referências de tabelas extraídas pelo lexer (ver lexer.references).
+    """
+
+    def test_comma_list_after_subquery(self):
+        query = "SELECT * FROM (SELECT a FROM `p.d.a`) x, `p.d.b` y"
+        self.assertEqual(_tables(query), ['p.d.a', 'p.d.b'])
+
+    def test_comma_list_after_aliased_subqueries(self):
+        query = "SELECT * FROM (SELECT a FROM `p.d.a`) AS x, (SELECT b FROM `p.d.b`) y, p.d.c"
+        self.assertEqual(_tables(query), ['p.d.a', 'p.d.b', 'p.d.c'])
+
+    def test_merge_target_and_source(self):
+        query = """
+            MERGE `p.d.t` T USING `p.d.s` S ON T.id = S.id
+            WHEN MATCHED THEN UPDATE SET a = S.a
+            WHEN NOT MATCHED THEN INSERT ROW
+        """
+        self.assertEqual(_tables(query), ['p.d.t', 'p.d.s'])
+
+    def test_merge_into_with_subquery_source(self):
+        query = """
+            MERGE INTO p.d.t USING (SELECT * FROM p.d.s) S ON FALSE
+            WHEN NOT MATCHED THEN INSERT (a) VALUES (S.a)
+        """
+        self.assertEqual(_tables(query), ['p.d.t', 'p.d.s'])
+
+    def test_insert_into(self):
+        query = "INSERT INTO `p.d.t` (a, b) SELECT a, b FROM ds.src"
+        self.assertEqual(_tables(query), ['p.d.t', 'ds.src'])
+
+    def test_join_using_is_not_a_table(self):
+        query = "SELECT * FROM myproj.ds.orders o JOIN ds.customers c USING (id), UNNEST(o.items) i"
+        self.assertEqual(_tables(query), ['myproj.ds.orders', 'ds.customers'])
+
+    def test_ignored_references(self):
+        query = """
+            WITH base AS (SELECT * FROM `p.d.a`)
+            SELECT EXTRACT(DAY FROM b.d) FROM base b, b.items
+            JOIN `p.d`.INFORMATION_SCHEMA.TABLES ON TRUE
+            -- FROM p.d.comment
+            WHERE b.x = 'FROM p.d.string'
+        """
+        self.assertEqual(_tables(query), ['p.d.a'])
+
+    def test_temporary_tables(self):
+        query = "CREATE TEMP TABLE stage AS SELECT * FROM p.d.a; SELECT * FROM stage"
+        self.assertEqual(_tables(query), ['p.d.a'])
+
+    def test_is_distinct_from(self):
+        query = "SELECT a FROM `p.d.t` WHERE a IS DISTINCT FROM b AND c IS NOT DISTINCT FROM d"
+        self.assertEqual(_tables(query), ['p.d.t'])
+
+    def test_correlated_alias_declared_later(self):
+        query = "SELECT (SELECT COUNT(*) FROM t.items) AS total FROM p.d.t t"
+        self.assertEqual(_tables(query), ['p.d.t'])
+
+    def test_correlated_array_subquery(self):
+        query = "SELECT ARRAY(SELECT x FROM t.items x WHERE x > 0) AS xs FROM p.d.t AS t"
+        self.assertEqual(_tables(query), ['p.d.t'])
+
+    def test_aliases_are_scoped_by_statement(self):
+        query = "SELECT * FROM p.d.x t; SELECT * FROM t.items"
+        self.assertEqual(_tables(query), ['p.d.x', 't.items'])
+
+    def test_parenthesized_join(self):
+        query = "SELECT * FROM (p.d.a JOIN p.d.b ON a.id = b.id) LEFT JOIN p.d.c ON TRUE"
+        self.assertEqual(_tables(query), ['p.d.a', 'p.d.b', 'p.d.c'])
+
+    def test_nested_parenthesized_join(self):
+        query = "SELECT * FROM ((p.d.b b JOIN p.d.c c USING (id))) x, p.d.e"
+        self.assertEqual(_tables(query), ['p.d.b', 'p.d.c', 'p.d.e'])
+
+    def test_spans(self):
+        query = "SELECT * FROM myproj.ds.orders o JOIN `p.d.c` c ON TRUE"
+        spans = [query[x.span[0]:x.span[1]] for x in lexer.references(query)]
+        self.assertEqual(spans, ['myproj.ds.orders', '`p.d.c`'])
+
+
+class Render(unittest.TestCase):
+    """
+        Redirecionamento das referências de tabelas para a localização
+        do teste (ver artefact.render).
+    """
+
+    def render(self, query: str, persist: tuple = ()) -> str:
+        return artefact.render(query=query, parameters={'ds': 'prd'}, location='test.mock', persist=persist)
+
+    def test_unquoted_and_projectless_references(self):
+        query = "SELECT * FROM myproj.ds.orders o JOIN ds.customers c ON o.id = c.id"
+        self.assertEqual(
+            self.render(query),
+            "SELECT * FROM `test.mock.orders` o JOIN `test.mock.customers` c ON o.id = c.id"
+        )
+
+    def test_dependencies_are_redirected(self):
+        query = "SELECT * FROM `p.${{ds}}.a`, ${{ds}}.b JOIN (SELECT * FROM c) x ON TRUE"
+        rendered = self.render(query)
+        self.assertEqual({x.location for x in lexer.references(rendered)}, {'test.mock'})
+
+    def test_persisted_tables(self):
+        query = "SELECT * FROM p.d.a JOIN `p.d.b` ON TRUE"
+        self.assertEqual(
+            self.render(query, persist=('prd.keep.b',)),
+            "SELECT * FROM `test.mock.a` JOIN `prd.keep.b` ON TRUE"
+        )
+
+    def test_distinct_from_is_kept(self):
+        query = "SELECT a FROM `p.d.t` WHERE a IS DISTINCT FROM b AND c IS NOT DISTINCT FROM d"
+        self.assertEqual(
+            self.render(query),
+            "SELECT a FROM `test.mock.t` WHERE a IS DISTINCT FROM b AND c IS NOT DISTINCT FROM d"
+        )
+
+    def test_correlated_paths_are_kept(self):
+        query = "SELECT ARRAY(SELECT x FROM t.items x) AS xs, (SELECT COUNT(*) FROM t.items) AS n FROM p.d.t AS t"
+        self.assertEqual(
+            self.render(query),
+            "SELECT ARRAY(SELECT x FROM t.items x) AS xs, (SELECT COUNT(*) FROM t.items) AS n FROM `test.mock.t` AS t"
+        )
+
+    def test_ctes_strings_and_comments_are_kept(self):
+        query = "WITH x AS (SELECT 'FROM p.d.s' AS s) SELECT * FROM x -- FROM p.d.c"
+        self.assertEqual(self.render(query), query)
+
+
+class Oldest(unittest.TestCase):
+    """
+        Menor data obtida página a página (ver engine.Oldest).
+    """
+
+    def outcome(self, pages: list) -> engine.Outcome:
+        accumulator = engine.Oldest(engine.Unit(name='dt_should_not_have_datetime_before', value='2022-01-01 00:00:00'))
+
+        for page in pages:
+            accumulator.update(spy.Frame([{'dt': x, 'valid_record': True} for x in page]))
+
+        return accumulator.outcome()
+
+    def test_null_page_is_skipped(self):
+        outcome = self.outcome([[None, None], ['2022-03-01T10:00:00Z', None], ['2022-02-01T00:00:00Z']])
+        self.assertIsNone(outcome.error)
+        self.assertTrue(outcome.passed)
+        self.assertEqual(str(outcome.obtained), '2022-02-01 00:00:00')
+
+    def test_only_null_pages(self):
+        outcome = self.outcome([[None], [None, None]])
+        self.assertIsInstance(outcome.error, ValueError)
+
+
+class Sequence(unittest.TestCase):
+    """
+        Sequências comparadas página a página (ver engine.Ordered).
+    """
+
+    def outcome(self, expected, pages: list) -> engine.Outcome:
+        accumulator = engine.Sequence(engine.Unit(name='n_should_be_in_sequence', value=expected))
+
+        for page in pages:
+            accumulator.update(spy.Frame([{'n': x, 'valid_record': True} for x in page]))
+
+        return accumulator.outcome()
+
+    def test_pages_match(self):
+        outcome = self.outcome([1, 2, 3, 4], [[1, 2], [3], [4]])
+        self.assertTrue(outcome.passed)
+        self.assertEqual(outcome.obtained, [1, 2, 3, 4])
+
+    def test_longer_result_keeps_bounded_prefix(self):
+        outcome = self.outcome([1, 2], [[1, 2], list(range(3, 1000))])
+        self.assertFalse(outcome.passed)
+        self.assertEqual(outcome.obtained, [1, 2, 3])
+
+    def test_shorter_and_different_results(self):
+        self.assertFalse(self.outcome([1, 2, 3], [[1, 2]]).passed)
+        self.assertFalse(self.outcome([1, 2, 3], [[1], [5, 3]]).passed)
+        self.assertFalse(self.outcome('1, 2', [[1, 2]]).passed)
+
+
+class Pushdown(unittest.TestCase):
+    """
+        Decodificação da query de verificação do push-down (ver pushdown.decode).
+    """
+
+    def decode(self, passed, obtained: str) -> engine.Outcome:
+        name = 'dt_should_not_have_datetime_before'
+        units = pushdown.plan({name: '2022-01-01 00:00:00'})
+        rows = [{'unit': name, 'passed': passed, 'expected': '2022-01-01 00:00:00', 'obtained': obtained}]
+        return pushdown.decode(units=units, rows=rows)[name]
+
+    def test_datetime_is_cast_per_unit(self):
+        units = pushdown.plan({'dt_should_not_have_datetime_before': '2022-01-01 00:00:00'})
+        self.assertIn('SAFE_CAST(CAST(R.`dt` AS STRING) AS TIMESTAMP)', pushdown.build(units=units, where='key', order='dt'))
+
+    def test_datetime_passed(self):
+        outcome = self.decode(True, '2022-02-01 00:00:00')
+        self.assertIsNone(outcome.error)
+        self.assertTrue(outcome.passed)
+
+    def test_datetime_invalid_values(self):
+        self.assertIsInstance(self.decode(None, '2022-02-01 00:00:00').error, ValueError)
+        self.assertEqual(str(self.decode(None, '').error), 'NaT')
+
+
+class Collector(unittest.TestCase):
+    """
+        Datasets de mock expirados (ver collector.expired).
+    """
+
+    def test_persisted_datasets_are_kept(self):
+        datasets = {
+            'ds_mock_old': Governance().dataset_labels(owner='host', run_id='a', expiration=0),
+            'ds_mock_kept': Governance().dataset_labels(owner='host', run_id='b', expiration=0, persist=True),
+            'ds_mock_new': Governance().dataset_labels(owner='host', run_id='c', expiration=3600),
+            'prd_dataset': {'expires': '0'}
+        }
+        self.assertEqual(collector.expired(datasets), ['ds_mock_old'])
+
+    def test_persisted_leftovers_are_kept(self):
+        datasets = {
+            'ds_mock_left': Governance().dataset_labels(owner='host', run_id='a', expiration=3600),
+            'ds_mock_kept': Governance().dataset_labels(owner='host', run_id='b', expiration=3600, persist=True)
+        }
+        dropped = list()
+
+        class Client:
+            def list_datasets(self, label: str = None) -> dict:
+                return datasets
+
+            def drop_dataset(self, dataset_id: str = None) -> None:
+                dropped.append(dataset_id)
+
+        original, collector.Client = collector.Client, Client
+
+        try:
+            collector.collect(leftovers=['ds_mock_left', 'ds_mock_kept'], scan=False)
+        finally:
+            collector.Client = original
+
+        self.assertEqual(dropped, ['ds_mock_left'])
+
+
+class Cache(unittest.TestCase):
+    """
+        Substituição do Patient Key ao carregar o cache (ver cache.load).
+    """
+
+    def test_derived_keys_are_swapped(self):
+        old, new = 'a1b2c3', 'd4e5f6'
+        events = {'person': pd.DataFrame([{
+            'key': old, 'upper': old.upper(), 'joined': f'PK-{old}-01', 'items': [{'key': old}], 'n': 1
+        }])}
+
+        with tempfile.TemporaryDirectory() as path:
+            original, cache.PATH = cache.PATH, path
+
+            try:
+                cache.save('case', events, token=old)
+                loaded = cache.load('case', token=new)['person'].iloc[0]
+            finally:
+                cache.PATH = original
+
+        self.assertEqual(loaded['key'], new)
+        self.assertEqual(loaded['upper'], new.upper())
+        self.assertEqual(loaded['joined'], f'PK-{new}-01')
+        self.assertEqual(loaded['items'], [{'key': new}])
+        self.assertEqual(loaded['n'], 1)
+
+
+class Tags(unittest.TestCase):
+    """
+        Índice de tags compartilhado entre as chamadas (ver indexer.tags).
+    """
+
+    def test_index_is_immutable_on_every_call(self):
+        content = "ACT_001:\n  documentation:\n    tags: [smoke, daily]\nACT_002:\n  documentation:\n    tags: smoke\n"
+
+        with tempfile.TemporaryDirectory() as path:
+            filename = f'{path}/test.yaml'
+
+            with open(filename, 'w') as f:
+                f.write(content)
+
+            for _ in range(2):
+                found = indexer.tags(path=filename)
+                self.assertEqual(list(found['ACT_001']), ['smoke', 'daily'])
+                with self.assertRaises(Exception):
+                    found['ACT_001'].append('changed')
+                with self.assertRaises(Exception):
+                    found['ACT_003'] = list()
+
+
+def main(argv: list = None) -> int:
+    """
+        Executa os casos de regressão e retorna 1 em caso de falha.
+    """
+
+    program = unittest.main(module=__name__, argv=['regression'] + list(argv or list()), exit=False)
+    return 0 if program.result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
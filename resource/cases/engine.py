@@ -0,0 +1,412 @@
+"""
+    Script responsável por avaliar em uma única passagem todos os testes
+    unitários (unittests) de um testcase sobre o resultado do artefato,
+    página a página. As funções de asserts apenas consomem os resultados
+    calculados e reportam ao unittest.
+"""
+
+import os
+import json
+from abc import ABC
+from abc import abstractmethod
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from tests.resource.cases import spy
+from tests.resource.helpers import params
+from tests.resource.helpers import artefact
+from tests.resource.cases import utils
+from tests.resource.utils import scheduler
+
+
+RESULT_PATTERN = '%Y-%m-%dT%H:%M:%SZ'
+
+
+class Unit:
+    """
+        Teste unitário planejado a partir de uma entrada de unittests.
+
+        Attributes:
+        :param: name -> Chave informada em unittests (ex: my_field_should_be_distinct).
+        :param: value -> Valor esperado informado para a chave.
+    """
+
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
+        self.field = self._field()
+        self.kind = self._kind()
+
+    def _field(self) -> str:
+        """
+            Campo do resultado (texto antes de _should).
+        """
+        return self.name.split('should')[0][:-1]
+
+    def _kind(self) -> str:
+        """
+            Nome da asserção (should...) correspondente em asserts.
+        """
+        return f"should{self.name.split('should')[-1]}"
+
+
+class Outcome:
+    """
+        Resultado calculado de um teste unitário.
+
+        Attributes:
+        :param: expected -> Valor esperado reportado ao unittest.
+        :param: obtained -> Valor obtido reportado ao unittest.
+        :param: passed -> Indica se a asserção foi satisfeita.
+        :param: error -> Exceção levantada durante a avaliação, se houver.
+    """
+
+    def __init__(self, expected=None, obtained=None, passed: bool = False, error: Exception = None):
+        self.expected = expected
+        self.obtained = obtained
+        self.passed = passed
+        self.error = error
+
+
+class Accumulator(ABC):
+    """
+        Base dos acumuladores de uma asserção. Cada página do resultado
+        é consumida por update e o resultado final é obtido por outcome.
+        Erros durante a leitura de uma página encerram o acumulador.
+
+        Attributes:
+        :param: unit -> Teste unitário planejado.
+    """
+
+    def __init__(self, unit: Unit):
+        self.unit = unit
+        self.error = None
+
+    def update(self, frame: spy.Frame) -> None:
+        """
+            Consome uma página do resultado.
+        """
+        if self.error is not None:
+            return
+        try:
+            self._update(frame)
+        except Exception as e:
+            self.error = e
+
+    @abstractmethod
+    def _update(self, frame: spy.Frame) -> None:
+        """
+            Consome uma página do resultado (ver update).
+        """
+
+    def outcome(self) -> Outcome:
+        """
+            Retorna o resultado da asserção após todas as páginas.
+        """
+        if self.error is None:
+            try:
+                return self._outcome()
+            except Exception as e:
+                self.error = e
+        return self._failure(self.error)
+
+    def _failure(self, error: Exception) -> Outcome:
+        return Outcome(expected=self.unit.value, error=error)
+
+    @abstractmethod
+    def _outcome(self) -> Outcome:
+        """
+            Resultado da asserção após todas as páginas (ver outcome).
+        """
+
+
+class Ordered(Accumulator):
+    """
+        Base das asserções que comparam uma sequência obtida com a lista
+        esperada. Cada página é comparada com o trecho correspondente da
+        lista esperada e apenas o início da sequência obtida (até um valor
+        além do esperado) é mantido para o relatório da asserção.
+    """
+
+    def __init__(self, unit: Unit):
+        super().__init__(unit)
+        self.expected = unit.value if isinstance(unit.value, list) else None
+        self.limit = len(self.expected) + 1 if self.expected is not None else 1
+        self.matched = self.expected is not None
+        self.total = 0
+        self.prefix = list()
+
+    @abstractmethod
+    def _values(self, frame: spy.Frame) -> list:
+        """
+            Valores obtidos da página, em ordem.
+        """
+
+    def _update(self, frame: spy.Frame) -> None:
+
+        values = self._values(frame)
+
+        if self.matched:
+            self.matched = values == self.expected[self.total:self.total + len(values)]
+
+        if len(self.prefix) < self.limit:
+            self.prefix.extend(values[:self.limit - len(self.prefix)])
+
+        self.total += len(values)
+
+    def _outcome(self) -> Outcome:
+        passed = self.matched and self.total == len(self.expected)
+        return Outcome(expected=self.unit.value, obtained=self.prefix, passed=passed)
+
+
+class Sequence(Ordered):
+    """
+        Compara a sequência de valores obtidos com a lista esperada.
+    """
+
+    def _values(self, frame: spy.Frame) -> list:
+        return list(frame.column(self.unit.field))
+
+
+class Distinct(Accumulator):
+    """
+        Compara o total de valores com o total de valores distintos. Os valores
+        são mantidos apenas como hashes de 64 bits e, acima de params.__DISTINCT_SPILL__
+        hashes em memória, são descarregados em partições no disco.
+    """
+
+    PARTITIONS = 16
+
+    def __init__(self, unit: Unit):
+        super().__init__(unit)
+        self.total = 0
+        self.keys = list()
+        self.kept = 0
+        self.spill = None
+
+    def _hashes(self, values: list) -> np.ndarray:
+        """
+            Hash dos valores serializados, permitindo arrays e registros.
+        """
+
+        serialized = np.array([json.dumps(value, sort_keys=True, default=str) for value in values], dtype=object)
+        return pd.util.hash_array(serialized)
+
+    def _update(self, frame: spy.Frame) -> None:
+
+        values = frame.column(self.unit.field)
+        self.total += len(values)
+
+        if not values:
+            return
+
+        keys = np.unique(self._hashes(values))
+        self.keys.append(keys)
+        self.kept += len(keys)
+
+        if self.kept > params.__DISTINCT_SPILL__:
+            self._spill()
+
+    def _spill(self) -> None:
+        """
+            Descarrega os hashes em memória para partições no disco.
+        """
+
+        if self.spill is None:
+            self.spill = tempfile.mkdtemp(prefix='bqtest_distinct_')
+
+        if not self.keys:
+            return
+
+        keys = np.concatenate(self.keys)
+
+        for partition in range(self.PARTITIONS):
+            with open(os.path.join(self.spill, f'{partition}.bin'), 'ab') as f:
+                keys[keys % self.PARTITIONS == partition].tofile(f)
+
+        self.keys = list()
+        self.kept = 0
+
+    def _distinct(self) -> int:
+        """
+            Total de hashes distintos em memória e em disco.
+        """
+
+        if self.spill is None:
+            return len(np.unique(np.concatenate(self.keys))) if self.keys else 0
+
+        self._spill()
+        distinct = 0
+
+        for partition in range(self.PARTITIONS):
+            target = os.path.join(self.spill, f'{partition}.bin')
+            if os.path.exists(target):
+                distinct += len(np.unique(np.fromfile(target, dtype=np.uint64)))
+
+        shutil.rmtree(self.spill, ignore_errors=True)
+        self.spill = None
+
+        return distinct
+
+    def _outcome(self) -> Outcome:
+        distinct = self._distinct()
+        return Outcome(expected=self.total, obtained=distinct, passed=self.total == distinct)
+
+
+class Oldest(Accumulator):
+    """
+        Compara a menor data obtida com a data esperada (YYYY-MM-DD HH:MM:SS).
+        Páginas sem datas válidas (ex: somente nulos) são ignoradas e o erro
+        de formato ocorre apenas se nenhuma data válida for obtida.
+    """
+
+    def __init__(self, unit: Unit):
+        super().__init__(unit)
+        self.oldest = None
+        self.rows = 0
+
+        try:
+            self.expected = scheduler.timestamp(unit.value.strip())
+        except AttributeError as e:
+            self.expected = None
+            self.error = e
+
+        if self.expected is None and self.error is None:
+            self.error = ValueError(unit.value)
+
+    def _update(self, frame: spy.Frame) -> None:
+
+        values = frame.column(self.unit.field)
+        self.rows += len(values)
+
+        if not values:
+            return
+
+        oldest = pd.to_datetime(pd.Series(values, dtype='object'), format=RESULT_PATTERN).min()
+
+        # Página sem datas válidas (ex: somente nulos) não altera a menor data
+        if pd.isnull(oldest):
+            return
+
+        oldest = oldest.to_pydatetime().replace(tzinfo=None)
+
+        if self.oldest is None or oldest < self.oldest:
+            self.oldest = oldest
+
+    def _outcome(self) -> Outcome:
+
+        if self.rows == 0:
+            return Outcome(expected=self.expected, obtained='', passed=True)
+
+        if self.oldest is None:
+            raise ValueError('NaT')
+
+        return Outcome(expected=self.expected, obtained=self.oldest, passed=self.expected <= self.oldest)
+
+
+class Length(Ordered):
+    """
+        Compara a contagem de elementos dos arrays do campo com a lista esperada.
+    """
+
+    def _values(self, frame: spy.Frame) -> list:
+        return list(utils.perform_array_column_to_count(df=frame.payload, field=self.unit.field))
+
+
+accumulators = {
+    'should_be_in_sequence': Sequence,
+    'should_be_distinct': Distinct,
+    'should_not_have_datetime_before': Oldest,
+    'should_have_on_array_length_sequence': Length
+}
+
+
+class Engine:
+    """
+        Planeja todos os unittests de um testcase e os avalia em uma única
+        passagem sobre as páginas do resultado, sem manter o resultado
+        completo em memória.
+
+        Attributes:
+        :param: owner -> Classe de teste (unittest.TestCase) do testcase.
+        :param: unittests -> Dicionário de unittests do testcase.
+    """
+
+    def __init__(self, owner, unittests: dict):
+        self.owner = owner
+        self.frame = None
+        self.units = self._units(unittests)
+        self.accumulators = self._accumulators()
+
+    def _units(self, unittests: dict) -> dict:
+        """
+            Planeja os testes unitários pelo nome informado em unittests.
+        """
+        return {name: Unit(name=name, value=value) for name, value in (unittests or dict()).items()}
+
+    def _accumulators(self) -> dict:
+        """
+            Cria um acumulador por asserção conhecida.
+        """
+        return {
+            name: accumulators[unit.kind](unit)
+            for name, unit in self.units.items() if unit.kind in accumulators
+        }
+
+    def update(self, frame: spy.Frame) -> None:
+        """
+            Consome uma página do resultado em todos os acumuladores.
+        """
+
+        for accumulator in self.accumulators.values():
+            accumulator.update(frame)
+
+    def finish(self) -> dict:
+        """
+            Retorna os resultados (Outcome) de todas as asserções planejadas.
+        """
+        return {name: accumulator.outcome() for name, accumulator in self.accumulators.items()}
+
+
+# Engine da última classe de teste avaliada
+planned = None
+
+
+def outcome(owner, name: str) -> Outcome:
+    """
+        Retorna o resultado de um teste unitário da classe de teste. Todos os
+        unittests da classe são avaliados na primeira chamada e reaproveitados
+        até que um novo resultado de artefato seja gerado.
+
+        :param: owner -> Classe de teste com o atributo unittests.
+        :param: name -> Chave do teste unitário em unittests.
+    """
+    global planned
+
+    # Unittests já avaliados durante o fetch paginado ou no BigQuery (--push-down)
+    if artefact.checks is not None:
+        if name not in artefact.checks:
+            raise Exception(f'Unittest {name} was not planned for {owner.__name__}.')
+        return artefact.checks[name]
+
+    frame = spy.current()
+
+    if planned is None or planned.owner is not owner or planned.frame is not frame:
+        planned = Engine(owner=owner, unittests=getattr(owner, 'unittests', dict()))
+        planned.update(frame)
+        planned.frame = frame
+        planned.outcomes = planned.finish()
+
+    if name not in planned.outcomes:
+        raise Exception(f'Unittest {name} was not planned for {owner.__name__}.')
+
+    return planned.outcomes[name]
+
+
+def release() -> None:
+    """
+        Libera o engine da última classe de teste avaliada.
+    """
+    global planned
+    planned = None
@@ -3,6 +3,8 @@
     unitários e loader para a construção do testcases com controle de CLI.
 """
 
+import time
+import pathlib
 import unittest
 import traceback
 from functools import partial
@@ -10,10 +12,17 @@ from tests.resource.cli.cli import CLI
 from tests.resource.utils import actions
 from tests.resource.cases import asserts
 from tests.resource.helpers import params
+from tests.resource.helpers import helper
 from tests.resource.api import logger as log
 from tests.resource.utils.logger import logger
+from tests.resource.utils.logger import bind
+from tests.resource.utils.logger import unbind
+from tests.resource.utils.logger import configure
 from tests.resource.utils import generator as gen
-from tests.resource.utils import validator as val
+from tests.resource.utils import scheduler
+from tests.resource.utils import indexer
+from tests.resource.utils import profiler
+from tests.resource.utils import collector
 
 
 class TestCase(unittest.TestCase):
@@ -26,6 +35,7 @@ class TestCase(unittest.TestCase):
     errors = False
     current = None
     start = None
+    batch = None
     units = []
 
     @classmethod
@@ -35,15 +45,29 @@ class TestCase(unittest.TestCase):
             unitário deve ser executado e aciona o Build para o Mocker.
         """
 
+        # Contexto dos registros de log do testcase
+        bind(
+            run_id=helper.environment().run_id,
+            suite=cls.suite,
+            testcase=cls.testcase,
+            phase='setup',
+            started=time.perf_counter()
+        )
+
         try:
+            # Inicia o perfil do testcase quando solicitado por --profile
+            if params.__CLI__.profile:
+                profiler.start(suite=cls.suite, testcase=cls.testcase)
+
             # Inicia a contagem do teste
             cls.start = gen.datetime_from_current(string=False)
             cls.units.clear()
 
             # Aciona o Build do Mocker
-            actions.setUpClass(path=str(cls.path), suite=cls.suite, testcase=cls.testcase)
+            actions.setUpClass(path=str(cls.path), suite=cls.suite, testcase=cls.testcase, batch=cls.batch)
 
         except Exception as e:
+            profiler.stop()
             tb = traceback.TracebackException.from_exception(e).__dict__
             error = log.LogError(trace=tb)
             log.send(error, target='log_error')
@@ -56,6 +80,8 @@ class TestCase(unittest.TestCase):
             Regras. Neste caso, o status do teste será SKIP.
         """
 
+        bind(phase='unittests')
+
         if not params.__HELPER__.run:
             self.skipTest('skipped')
 
@@ -105,23 +131,72 @@ class TestCase(unittest.TestCase):
             presente na classe do Cenário finalizarem.
         """          
 
+        bind(phase='teardown')
+
         elapsed = gen.datetime_from_current(string=False) - cls.start
 
-        # Verifica se todos os testes unitários passaram
-        if not cls.errors:
-            if cls.current:
-                if cls.failures == 0:
-                    status = 'PASS'
+        try:
+            # Verifica se todos os testes unitários passaram
+            if not cls.errors:
+                if cls.current:
+                    if cls.failures == 0:
+                        status = 'PASS'
+                    else:
+                        status = 'FAIL'
                 else:
-                    status = 'FAIL'
-            else:
-                status = 'SKIP'
+                    status = 'SKIP'
+
+                actions.tearDownClass(status=status, duration=str(elapsed), units=cls.units)
+
+        finally:
+            # Libera o resultado do artefato mesmo quando o testcase tiver erro
+            actions.release()
+
+        # Encerra o perfil do testcase (sem efeito quando --profile não for informado)
+        profiler.stop()
+        unbind()
+
+
+def tearDownModule():
+    """
+        Executado pelo unittest após o último testcase (as classes de
+        testcases são criadas neste módulo). Encerra a última suite e aguarda
+        a remoção de datasets órfãos iniciada em segundo plano.
+    """
+
+    actions.tearDownSuite()
+    collector.join()
+
+
+class Lazy(unittest.TestSuite):
+    """
+        Suite de um único testcase cuja classe de unittest.TestCase é
+        criada apenas na primeira iteração, ou seja, quando o runner
+        alcançar o testcase.
+    """
+
+    def __init__(self, loader, suite:str, testcase:str):
+        super().__init__()
+        self.loader = loader
+        self.suite = suite
+        self.testcase = testcase
+        self.materialized = False
+
+    def __iter__(self):
+        if not self.materialized:
+            self.materialized = True
+            self.addTest(self.loader._build(suite=self.suite, testcase=self.testcase))
+        return super().__iter__()
+
+    def __repr__(self):
+        return f'<Lazy suite={self.suite} testcase={self.testcase}>'
 
-            actions.tearDownClass(status=status, duration=str(elapsed), units=cls.units)
 
 class Loader:
 
     def __init__(self, cmd:str, filep:str):
+        self.clock = scheduler.clock()
+        self.batches = dict()
         self.cli = self._cli(cmd=cmd, filep=filep)
         self.testcase = self._testcase()
         self.suite = self._suite()
@@ -131,7 +206,7 @@ class Loader:
             Obtém o nome de todos os testcases IDs informados no arquivo yaml
         """
         filename = f'{self.cli.home}/suites/{suite}/test.yaml'
-        return list(val.read_file(dir=filename).keys())
+        return indexer.testcases(path=filename)
     
     def _cli(self, cmd:str, filep:str):
         """
@@ -139,60 +214,143 @@ class Loader:
         """
         cli = CLI(cmd=cmd, filep=filep)
         params.__CLI__ = cli
+
+        if cli.log_json:
+            configure(json_lines=True)
+
         return cli
 
-    def _testcase(self) -> list:
+    def _suites(self) -> list:
+        """
+            Obtém a lista de suites informadas no CLI. Caso nenhuma seja informada
+            e houver filtro por tags, todas as suites do diretório são consideradas
+            (exceto as iniciadas por _, como _template).
         """
-            Propriedade responsável por montar uma lista de objetos unittest.TestCase com os
-            métodos de asserções requeridos.
 
-            # TODO: Complexidade Ciclomática nesta propriedade. Requer particionar melhor
-            as divisões de montagem do testcase.
+        if self.cli.suite is not None:
+            return self.cli.suite
+
+        if self.cli.tags is None:
+            return list()
+
+        root = pathlib.Path(f'{self.cli.home}/suites')
+
+        return sorted(
+            folder.name for folder in root.iterdir()
+            if folder.is_dir() and not folder.name.startswith('_') and (folder / 'test.yaml').exists()
+        )
+
+    def _selected(self, suite:str, list_cases:list) -> list:
+        """
+            Filtra os testcases de uma suite pelas tags de documentação
+            informadas no CLI (-tg e -xt) utilizando o índice de tags do arquivo.
+        """
+
+        if self.cli.tags is None and self.cli.exclude_tags is None:
+            return list_cases
+
+        filename = f'{self.cli.home}/suites/{suite}/test.yaml'
+        index = indexer.tags(path=filename)
+
+        include = set(self.cli.tags or list())
+        exclude = set(self.cli.exclude_tags or list())
+        selected = list()
+
+        for testcase in list_cases:
+            tags = set(index.get(testcase, list()))
+
+            if include and not tags & include:
+                continue
+            if tags & exclude:
+                continue
+            selected.append(testcase)
+
+        return selected
+
+    def _testcase(self) -> list:
+        """
+            Propriedade responsável por montar a lista de testcases selecionados pelo CLI.
+            As classes de unittest.TestCase são criadas apenas quando o runner alcançar
+            cada testcase (ver Lazy).
         """
         build_ups = list()
 
         # Inicia a montagem de acordo com a lista de suites informadas no CLI.
-        if self.cli.suite is not None:
-            
-            for suite in self.cli.suite:
-                
-                # Obtém a lista de testcases informadas pelo CLI. Caso nenhum for informado, todos são considerados.
-                list_cases = self.cli.testcase if self.cli.testcase is not None else self._get_all_tests(suite)
-                
-                for testcase in list_cases:
-                    
-                    path = f'{self.cli.home}/suites/{suite}/test.yaml'
-
-                    # Cria uma nova classe abstrata de TestCase conforme o nome do testcase ID.
-                    tc = type(testcase, (TestCase,), {})
-
-                    # Informa ao TestCase o caminho, a suite e o testcase a serem usados pelo SetupClass
-                    setattr(tc, 'path', path)
-                    setattr(tc, 'suite', suite)
-                    setattr(tc, 'testcase', testcase)
-
-                    # Obtém o nome dos métodos para testes unitários.
-                    tests_to_apply = self._required(testcase, suite)
-
-                    for value, expected in tests_to_apply.items():
-
-                        broken_target = value.split('should')
-                        field = broken_target[0][:-1]
-                        name_target = broken_target[-1]
-                        name_target = ''.join(name_target)
-                        name_target = f'should{name_target}'
-                        
-                        # Atualiza a instância do objeto de Testcase para agregar os métodos.
-                        fun = getattr(asserts, name_target)
-                        unit_append = partial(fun, tc, value=expected, expected=value, field=field)
-                        unit_append.__doc__ = ''
-                        setattr(tc, f'test_{value}', unit_append)         
-
-                    build_up = unittest.TestLoader().loadTestsFromTestCase(tc)
-                    build_ups.append(build_up)
-                
+        for suite in self._suites():
+
+            # Obtém a lista de testcases informadas pelo CLI. Caso nenhum for informado, todos são considerados.
+            list_cases = self.cli.testcase if self.cli.testcase is not None else self._get_all_tests(suite)
+
+            for testcase in self._selected(suite, list_cases):
+                build_ups.append(Lazy(loader=self, suite=suite, testcase=testcase))
+
         return build_ups
 
+    def _build(self, suite:str, testcase:str):
+        """
+            Monta o objeto unittest.TestCase de um testcase com os métodos de asserções requeridos.
+        """
+
+        path = f'{self.cli.home}/suites/{suite}/test.yaml'
+
+        # Cria uma nova classe abstrata de TestCase conforme o nome do testcase ID.
+        tc = type(testcase, (TestCase,), {})
+
+        # Informa ao TestCase o caminho, a suite e o testcase a serem usados pelo SetupClass
+        setattr(tc, 'path', path)
+        setattr(tc, 'suite', suite)
+        setattr(tc, 'testcase', testcase)
+        setattr(tc, 'batch', self._batch(suite))
+
+        # Obtém o nome dos métodos para testes unitários.
+        tests_to_apply = self._required(testcase, suite)
+
+        # Unittests planejados em conjunto pelo engine de asserções
+        setattr(tc, 'unittests', tests_to_apply)
+
+        for value, expected in tests_to_apply.items():
+
+            broken_target = value.split('should')
+            field = broken_target[0][:-1]
+            name_target = broken_target[-1]
+            name_target = ''.join(name_target)
+            name_target = f'should{name_target}'
+
+            # Atualiza a instância do objeto de Testcase para agregar os métodos.
+            fun = getattr(asserts, name_target)
+            unit_append = partial(fun, tc, value=expected, expected=value, field=field)
+            unit_append.__doc__ = ''
+            setattr(tc, f'test_{value}', unit_append)
+
+        return unittest.TestLoader().loadTestsFromTestCase(tc)
+
+    def _batch(self, suite:str) -> list:
+        """
+            Retorna os testcases selecionados da suite a serem executados em lote
+            com --batch, exceto os que informarem isolated: true em settings.
+        """
+
+        if not self.cli.batch:
+            return list()
+
+        if suite not in self.batches:
+            filename = f'{self.cli.home}/suites/{suite}/test.yaml'
+            selected = list()
+
+            for lazy in self.testcase:
+                if lazy.suite != suite:
+                    continue
+
+                target = indexer.read(path=filename, testcase=lazy.testcase) or dict()
+                settings = target.get('settings') or dict()
+
+                if not settings.get('isolated'):
+                    selected.append(lazy.testcase)
+
+            self.batches[suite] = selected
+
+        return self.batches[suite]
+
     def _suite(self):
         """
             Cria objeto de Suite de teste do unittest com a lista de testcases montados.
@@ -202,8 +360,11 @@ class Loader:
     def _required(self, testcase:str, suite:str) -> dict:
         
         filename = f'{self.cli.home}/suites/{suite}/test.yaml'
-        target = val.read_file(dir=filename)
+        target = indexer.read(path=filename, testcase=testcase)
+
+        if target is None:
+            raise Exception(f'Testcase {testcase} not found in {filename}.')
 
-        if 'unittests' not in target[testcase].keys():
+        if 'unittests' not in target.keys():
             raise Exception('Testcase does not unittests settings.')
-        return target[testcase]['unittests']
+        return target['unittests']
@@ -0,0 +1,256 @@
+"""
+    Script responsável por compilar os unittests de um testcase em uma única
+    query de verificação executada no BigQuery sobre a tabela destino do
+    artefato. Cada asserção retorna uma linha com pass/fail e os resumos de
+    valores esperado e obtido, evitando a transferência do resultado completo.
+"""
+
+from __future__ import annotations
+import json
+from tests.resource.cases import engine
+from tests.resource.utils import scheduler
+
+
+POSITION = '_bqtest_position'
+
+
+def _literal(value: str) -> str:
+    """
+        Retorna o valor como literal de string do BigQuery.
+    """
+
+    escaped = str(value).replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r')
+    return f"'{escaped}'"
+
+
+def _column(path: str) -> str:
+    """
+        Retorna o nome de coluna (ou caminho de struct) entre crases.
+    """
+    return '.'.join(f'`{part}`' for part in path.split('.'))
+
+
+def _packed(values: list) -> str:
+    """
+        Serializa uma lista no mesmo formato de TO_JSON_STRING(ARRAY_AGG(STRUCT(... AS v))).
+    """
+    return json.dumps([{'v': value} for value in values], separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _unpacked(obtained: str) -> list:
+    """
+        Converte o resumo em JSON retornado pela query de volta para lista.
+    """
+
+    loaded = json.loads(obtained) if obtained else None
+    return [item['v'] for item in loaded] if loaded else list()
+
+
+def _valid_datetime(value) -> bool:
+    """
+        Verifica se a data esperada está no formato YYYY-MM-DD HH:MM:SS.
+    """
+    return isinstance(value, str) and scheduler.timestamp(value.strip()) is not None
+
+
+def _source(unit: engine.Unit) -> str:
+    """
+        Retorna o CTE de origem da asserção. Como em spy.Frame, apenas a própria
+        coluna valid_record não é filtrada por registros válidos.
+    """
+    return 'RESULT' if unit.field == 'valid_record' else 'VALID'
+
+
+def _sequence(unit: engine.Unit) -> str:
+    """
+        Compila should_be_in_sequence comparando a sequência serializada do campo.
+    """
+
+    expected = _literal(_packed(unit.value or list()))
+
+    return f"""
+        SELECT {_literal(unit.name)} AS unit, IFNULL(obtained, '[]') = {expected} AS passed,
+            {expected} AS expected, obtained
+        FROM (
+            SELECT TO_JSON_STRING(ARRAY_AGG(STRUCT(R.{_column(unit.field)} AS v) ORDER BY R.{POSITION})) AS obtained
+            FROM {_source(unit)} AS R
+        )"""
+
+
+def _distinct(unit: engine.Unit) -> str:
+    """
+        Compila should_be_distinct comparando o total de valores e o total de distintos.
+    """
+
+    return f"""
+        SELECT {_literal(unit.name)} AS unit, total = distinct_total AS passed,
+            CAST(total AS STRING) AS expected, CAST(distinct_total AS STRING) AS obtained
+        FROM (
+            SELECT COUNT(*) AS total, COUNT(DISTINCT TO_JSON_STRING(R.{_column(unit.field)})) AS distinct_total
+            FROM {_source(unit)} AS R
+        )"""
+
+
+def _datetime_before(unit: engine.Unit) -> str:
+    """
+        Compila should_not_have_datetime_before comparando a menor data do campo.
+        O campo é convertido via STRING para TIMESTAMP, aceitando colunas
+        TIMESTAMP, DATETIME, DATE ou STRING sem erro de tipo. Como no engine
+        local, valores não convertidos ou somente nulos resultam em passed
+        nulo, decodificado como erro de formato.
+    """
+
+    expected = _literal(unit.value.strip())
+    value = f'CAST(R.{_column(unit.field)} AS STRING)'
+
+    return f"""
+        SELECT {_literal(unit.name)} AS unit,
+            IF(invalid > 0 OR (total > 0 AND oldest IS NULL), NULL, IFNULL(oldest >= TIMESTAMP({expected}), TRUE)) AS passed,
+            {expected} AS expected, IFNULL(FORMAT_TIMESTAMP('%Y-%m-%d %H:%M:%S', oldest), '') AS obtained
+        FROM (
+            SELECT MIN(parsed) AS oldest, COUNTIF(value IS NOT NULL AND parsed IS NULL) AS invalid, COUNT(*) AS total
+            FROM (
+                SELECT {value} AS value, SAFE_CAST({value} AS TIMESTAMP) AS parsed
+                FROM {_source(unit)} AS R
+            )
+        )"""
+
+
+def _array_length(unit: engine.Unit) -> str:
+    """
+        Compila should_have_on_array_length_sequence percorrendo arrays aninhados com UNNEST.
+    """
+
+    parts = unit.field.split('.')
+    expected = _literal(_packed(unit.value or list()))
+
+    # Percorre os arrays aninhados mantendo a ordem da linha e de cada elemento
+    joins = list()
+    orders = [f'R.{POSITION}']
+    parent = 'R'
+
+    for depth, part in enumerate(parts[:-1], start=1):
+        joins.append(f'UNNEST({parent}.`{part}`) AS E{depth} WITH OFFSET AS O{depth}')
+        orders.append(f'O{depth}')
+        parent = f'E{depth}'
+
+    source = ', '.join(['RESULT AS R'] + joins)
+
+    return f"""
+        SELECT {_literal(unit.name)} AS unit, IFNULL(obtained, '[]') = {expected} AS passed,
+            {expected} AS expected, obtained
+        FROM (
+            SELECT TO_JSON_STRING(ARRAY_AGG(STRUCT(ARRAY_LENGTH({parent}.`{parts[-1]}`) AS v) ORDER BY {', '.join(orders)})) AS obtained
+            FROM {source}
+        )"""
+
+
+compilers = {
+    'should_be_in_sequence': _sequence,
+    'should_be_distinct': _distinct,
+    'should_not_have_datetime_before': _datetime_before,
+    'should_have_on_array_length_sequence': _array_length
+}
+
+
+def plan(unittests: dict) -> dict:
+    """
+        Planeja os unittests suportados pela verificação em SQL.
+        Asserções de datetime com data esperada inválida não são
+        compiladas e retornam erro de formato na decodificação.
+    """
+
+    units = dict()
+
+    for name, value in (unittests or dict()).items():
+        unit = engine.Unit(name=name, value=value)
+
+        if unit.kind not in compilers:
+            raise Exception(f'Unittest {name} is not supported by push-down.')
+
+        units[name] = unit
+
+    return units
+
+
+def build(units: dict, where: str, order: str) -> str:
+    """
+        Compila as asserções planejadas em uma única query de verificação.
+        O valor de filtro do resultado (fetch.search) é informado pelo
+        parâmetro @search da query.
+
+        :param: units -> Asserções planejadas por plan.
+        :param: where -> Coluna de filtro do resultado (fetch.where).
+        :param: order -> Ordenação do resultado (fetch.order).
+    """
+
+    selects = list()
+
+    for unit in units.values():
+
+        if unit.kind == 'should_not_have_datetime_before' and not _valid_datetime(unit.value):
+            continue
+
+        selects.append(compilers[unit.kind](unit))
+
+    if not selects:
+        return None
+
+    ctes = [f"""
+        RESULT AS (
+            SELECT *, ROW_NUMBER() OVER (ORDER BY {order}) AS {POSITION}
+            FROM `<<TABLE_ID>>` AS RESULT
+            WHERE {where} = @search
+        )"""]
+
+    if any(unit.field != 'valid_record' and unit.kind != 'should_have_on_array_length_sequence' for unit in units.values()):
+        ctes.append("""
+        VALID AS (
+            SELECT * FROM RESULT WHERE valid_record = TRUE
+        )""")
+
+    return f"WITH {','.join(ctes)}\n" + '\n        UNION ALL'.join(selects) + ';'
+
+
+def decode(units: dict, rows: list) -> dict:
+    """
+        Converte as linhas da query de verificação em resultados (Outcome)
+        consumidos pelas funções de asserts. Sequências reprovadas pelo SQL
+        são conferidas novamente em Python, pois a serialização JSON do
+        BigQuery pode divergir para tipos como FLOAT e TIMESTAMP.
+    """
+
+    found = {row['unit']: row for row in rows}
+    outcomes = dict()
+
+    for name, unit in units.items():
+
+        if unit.kind == 'should_not_have_datetime_before':
+
+            if not _valid_datetime(unit.value):
+                outcomes[name] = engine.Outcome(expected=unit.value, error=ValueError(unit.value))
+                continue
+
+            row = found[name]
+
+            if row['passed'] is None:
+                error = ValueError(f'Invalid datetime values in {unit.field}') if row['obtained'] else ValueError('NaT')
+                outcomes[name] = engine.Outcome(expected=scheduler.timestamp(unit.value.strip()), error=error)
+                continue
+
+            obtained = scheduler.timestamp(row['obtained']) if row['obtained'] else ''
+            outcomes[name] = engine.Outcome(expected=scheduler.timestamp(unit.value.strip()), obtained=obtained, passed=bool(row['passed']))
+
+        elif unit.kind == 'should_be_distinct':
+
+            row = found[name]
+            outcomes[name] = engine.Outcome(expected=int(row['expected']), obtained=int(row['obtained']), passed=bool(row['passed']))
+
+        else:
+
+            row = found[name]
+            obtained = _unpacked(row['obtained'])
+            passed = isinstance(unit.value, list) and (bool(row['passed']) or unit.value == obtained)
+            outcomes[name] = engine.Outcome(expected=unit.value, obtained=obtained, passed=passed)
+
+    return outcomes
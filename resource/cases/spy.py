@@ -23,6 +23,96 @@ class Expected:
         return kwargs.get('value')    
     
 
+class Frame:
+    """
+        Resultado do artefato convertido uma única vez em formato colunar.
+        A máscara de valid_record e as colunas já extraídas ficam em cache
+        e são compartilhadas por todas as instâncias de Spy da classe de teste.
+
+        Attributes:
+        :param: result -> Lista de registros (artefact.result) do artefato executado.
+    """
+
+    def __init__(self, result: list):
+        self.result = result
+        self.payload = self._payload()
+        self.length = len(self.payload.index)
+        self.mask = self._mask()
+        self.columns = dict()
+
+    def _payload(self) -> pd.DataFrame:
+        """
+            Dataframe do resultado do artefato gerado.
+        """
+        return pd.DataFrame(self.result)
+
+    def _mask(self):
+        """
+            Máscara booleana dos registros com valid_record verdadeiro.
+            Retorna None quando o resultado não possuir a coluna.
+        """
+
+        if 'valid_record' not in self.payload.columns:
+            return None
+
+        return self.payload['valid_record'].eq(True).fillna(False).to_numpy(dtype=bool)
+
+    def column(self, name: str) -> list:
+        """
+            Obtém os valores de uma coluna filtrando os registros válidos
+            (exceto para a própria coluna valid_record).
+        """
+
+        if name in self.columns:
+            return self.columns[name]
+
+        values = list()
+
+        if self.length > 0:
+
+            # TODO : Necessário correção futura para tratar o filtro
+            # de valid_record pois não está genérico. É possível que
+            # esta informação esteja no arquivo config.yaml, pois não
+            # filtrar o valid_record pode ocasionar em falsos positivos
+            # para outros testes.
+
+            if name != 'valid_record' and self.mask is None:
+                raise Exception(f'Result does not have the valid_record column required to filter field {name}.')
+
+            if name in self.payload.columns:
+                series = self.payload[name]
+                values = series.tolist() if name == 'valid_record' else series[self.mask].tolist()
+
+        self.columns[name] = values
+
+        return values
+
+
+# Frame do último resultado lido
+frame = None
+
+
+def current() -> Frame:
+    """
+        Retorna o Frame do resultado atual do artefato. O Frame é reconstruído
+        apenas quando um novo resultado for gerado (uma vez por classe de teste).
+    """
+    global frame
+
+    if frame is None or frame.result is not artefact.result:
+        frame = Frame(result=artefact.result)
+
+    return frame
+
+
+def release() -> None:
+    """
+        Libera o Frame do último resultado lido.
+    """
+    global frame
+    frame = None
+
+
 class Obtained:
 
     def __init__(self, **kwargs):
@@ -33,36 +123,21 @@ class Obtained:
         """
             Dataframe da variável global do resultado do artefato gerado.
         """
-        return pd.DataFrame(artefact.result)
+        return current().payload
 
     @property
     def length(self) -> int:
         """
             Retorna o total de linhas do payload do resultado.
         """
-        return len(self.payload.index)
+        return current().length
 
     @property
     def field(self) -> list:
         """
             Obtém a coluna do campo do payload resgatado.
         """
-
-        # TODO : Necessário correção futura para tratar o filtro
-        # de valid_record pois não está genérico. É possível que
-        # esta informação esteja no arquivo config.yaml, pois não
-        # filtrar o valid_record pode ocasionar em falsos positivos
-        # para outros testes.
-
-        obtained = dict()
-
-        if self.length > 0:
-            if self.obtain == 'valid_record':
-                obtained = self.payload
-            else:
-                obtained = self.payload.query('valid_record == True')
-
-        return list(obtained.get(self.obtain, []))
+        return current().column(self.obtain)
 
 class Spy():
     """
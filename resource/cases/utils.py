@@ -4,36 +4,59 @@
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 def perform_array_column_to_count(df: pd.DataFrame, field: str) -> list:
     """
-        Função recursiva que que realiza iteração para cada nome
-        encontrado em field info
+        Retorna a contagem de elementos do último array do caminho informado
+        em field (ex: items.tags). Arrays intermediários são achatados em ordem
+        de linha e de elemento com kernels do Arrow, sem iteração por linha.
+        Arrays nulos são contados como zero.
     """
-    try:
-        counter = pd.DataFrame()
-        fields = field.split('.')
-        
-        for f in fields:
-
-            first_occurrence = df[f].dropna().iloc[0] if f in df else None
-            is_list = isinstance(first_occurrence, list) if first_occurrence is not None else False
-            
-            if is_list:
-
-                counter[f] = df[f].apply(len)
-                
-                if len(fields) > 1:
-
-                    group_nested = []
-                    
-                    for _, row in df.iterrows():
-                        nested = pd.DataFrame(row[f])
-                        group_nested.append(nested)
-                    
-                    combine = pd.concat(group_nested, keys=df.index)
-                    
-                    return perform_array_column_to_count(combine, '.'.join(fields[1:]))
-        return list(counter[field])
-    except Exception:
+
+    fields = field.split('.')
+
+    if len(df.index) == 0:
         return []
+
+    if fields[0] not in df:
+        raise Exception(f'Field {fields[0]} not found in result for path {field}.')
+
+    try:
+        array = pa.array(df[fields[0]].tolist())
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        raise Exception(f'Field {fields[0]} has inconsistent values for path {field}: {e}')
+
+    for depth, name in enumerate(fields[1:], start=1):
+        current = '.'.join(fields[:depth])
+
+        if pa.types.is_null(array.type):
+            return [0] * len(array)
+
+        if not pa.types.is_list(array.type):
+            raise Exception(f'Field {current} is not an array for path {field}.')
+
+        array = pc.list_flatten(array)
+
+        # Sem elementos (ou apenas nulos) para seguir o caminho
+        if pa.types.is_null(array.type):
+            return [0] * len(array)
+
+        if not pa.types.is_struct(array.type):
+            raise Exception(f'Field {current} is not an array of records for path {field}.')
+
+        index = array.type.get_field_index(name)
+
+        if index < 0:
+            raise Exception(f'Field {name} not found in {current} for path {field}.')
+
+        array = array.field(index)
+
+    if pa.types.is_null(array.type):
+        return [0] * len(array)
+
+    if not pa.types.is_list(array.type):
+        raise Exception(f'Field {field} is not an array.')
+
+    return pc.fill_null(pc.list_value_length(array), 0).to_pylist()
@@ -52,5 +52,63 @@ arguments = [
             "action": 'store_true',
             "help": 'Persist the dataset result after the test run in the BigQuery environment. Optional.'
         }
+    },
+    {
+        "name": ["--rebuild-mocks", "-rm"],
+        "kwargs": {
+            "action": 'store_true',
+            "default": False,
+            "help": 'Ignore the local mock cache and rebuild every Data Mock. Optional. Default is False.'
+        }
+    },
+    {
+        "name": ["--tags", "-tg"],
+        "kwargs": {
+            "nargs": '+',
+            "type": str,
+            "help": 'Run only testcases with at least one of the documentation tags. Searches all suites when --suite is not informed. Example: --tags smoke daily'
+        }
+    },
+    {
+        "name": ["--exclude-tags", "-xt"],
+        "kwargs": {
+            "nargs": '+',
+            "type": str,
+            "help": 'Skip testcases with any of the documentation tags. Example: --exclude-tags slow'
+        }
+    },
+    {
+        "name": ["--push-down", "-pd"],
+        "kwargs": {
+            "action": 'store_true',
+            "default": False,
+            "help": 'Evaluate unittests in BigQuery with a single check query instead of fetching the artefact result. Optional. Default is False.'
+        }
+    },
+    {
+        "name": ["--batch", "-b"],
+        "kwargs": {
+            "action": 'store_true',
+            "default": False,
+            "help": 'Load the mocks of all testcases of a suite together, run the artefact once and split the results by fetch key. Testcases with settings isolated: true run individually. Optional. Default is False.'
+        }
+    },
+    {
+        "name": ["--profile", "-pf"],
+        "kwargs": {
+            "nargs": '?',
+            "type": int,
+            "const": 20,
+            "default": None,
+            "help": 'Profile each testcase into ./tests/tmp/profiles and print the top N functions at the end of the run. Optional. Default N is 20.'
+        }
+    },
+    {
+        "name": ["--log-json", "-lj"],
+        "kwargs": {
+            "action": 'store_true',
+            "default": False,
+            "help": 'Write logs as JSON lines with run id, suite, testcase, phase and elapsed time. Optional.'
+        }
     }
 ]
@@ -19,6 +19,13 @@ class CLI:
         self.run = self._run()
         self.datasetid = self._datasetid()
         self.schema = self._schema()
+        self.rebuild_mocks = self._rebuild_mocks()
+        self.tags = self._tags()
+        self.exclude_tags = self._exclude_tags()
+        self.push_down = self._push_down()
+        self.batch = self._batch()
+        self.profile = self._profile()
+        self.log_json = self._log_json()
         self.plt = False
         self.wlst = False
         self.dtq = False
@@ -87,3 +94,51 @@ class CLI:
         """
 
         return self.args.schema
+
+    def _rebuild_mocks(self):
+        """
+            Indica se o cache local de Data Mocks será ignorado e reconstruído.
+        """
+
+        return self.args.rebuild_mocks
+
+    def _tags(self) -> list:
+        """
+            Obtém lista de tags informadas no CLI pela flag -tg.
+        """
+        return self.args.tags
+
+    def _exclude_tags(self) -> list:
+        """
+            Obtém lista de tags a serem ignoradas informadas no CLI pela flag -xt.
+        """
+        return self.args.exclude_tags
+
+    def _push_down(self):
+        """
+            Indica se os unittests serão avaliados no BigQuery sem transferir o resultado do artefato.
+        """
+
+        return self.args.push_down
+
+    def _batch(self):
+        """
+            Indica se os testcases de cada suite serão executados em lote.
+        """
+
+        return self.args.batch
+
+    def _profile(self):
+        """
+            Obtém o total de funções do relatório de profile informado no CLI pela flag -pf.
+            Retorna None quando o profile não for solicitado.
+        """
+
+        return self.args.profile
+
+    def _log_json(self):
+        """
+            Indica se o log será escrito em JSON lines com os campos de contexto.
+        """
+
+        return self.args.log_json
@@ -1,12 +1,27 @@
 from tests.resource.utils import validator as val
+from tests.resource.utils import lexer
+from tests.resource.utils import accessor
 from tests.resource.utils.logger import logger
 from tests.resource.api.client import Client
 from tests.resource.helpers import params
+from tests.resource.cases import pushdown
+from tests.resource.cases import engine
+from tests.resource.cases import spy
 from tests import home
 import json
+import os
+import re
 
 
 result = None
+checks = None
+
+# Queries renderizadas por (pipeline_file, pipeline_name, location, persist, assinaturas dos arquivos)
+rendered = dict()
+
+# Table_ids entre crases ou placeholders ${{param}} do pipeline
+TOKEN = re.compile(r'`[^`\n]*`|\$\{\{([^{}]+)\}\}')
+PLACEHOLDER = re.compile(r'\$\{\{([^{}]+)\}\}')
 
 class Artefact:
     """
@@ -22,10 +37,11 @@ class Artefact:
         self.pipeline = self._pipeline()
         self.destination = self._destination()
         self.query = self._query()
+        self.persist = self._persist()
         self.replace = self._replace(replacer)
         self.table_ids = self._table_ids()
-        self.persist = self._persist()
         self.dependencies = self._dependencies()
+        self.statement = self._statement()
 
     def _helper(self, helper):
 
@@ -62,15 +78,21 @@ class Artefact:
         except KeyError:
             return None
 
+    def _sql(self) -> str:
+        """
+            Retorna o caminho do arquivo .sql correspondente à regra.
+        """
+
+        return f"{home}/{self.folder}/{self.pipeline['BigQueryOperator']['sql']}"
+
     def _query(self) -> str:
         """
             Obtém no YAML de configuração o path para o arquivo .sql 
-            correspondente à regra. Realiza o replace das tags do 
-            padrão das queries pelos valores presentes no pipeline
-            da regra.
+            correspondente à regra. O replace das tags do padrão das
+            queries é realizado em _replace.
         """
 
-        return val.read_file(dir=f"{home}/{self.folder}/{self.pipeline['BigQueryOperator']['sql']}")
+        return val.read_file(dir=self._sql())
 
     def _table_ids(self) -> list:
         """
@@ -80,42 +102,49 @@ class Artefact:
 
     def _replace(self, replacer: bool) -> None:
         """
+            Renderiza a query substituindo em uma única passagem as tags
+            ${{param}} pelos valores do pipeline e a localização dos
+            table_ids pela localização do teste (exceto tabelas persistidas).
+            A query renderizada é mantida em cache por pipeline, localização
+            e tabelas persistidas enquanto os arquivos não forem alterados.
+
             :param: replacer -> Indica a query terá substituições
             extras.
         """
-        # Replace de cada parâmetro no YAML presente nas tags do script
-        params = self.pipeline['BigQueryOperator']['params']
-        for key, value in params.items():
-            self.query = self.query.replace("${{{{{0}}}}}".format(key), str(value))
 
-        to_replace = val.get_table_locations(content=self.query)
-        
-        for location in to_replace:
-            self.query = self.query.replace(location, self.location)
+        to_persist = tuple(self.helper.config.persist or list())
+
+        key = (
+            self.helper.config.pipeline_file,
+            self.helper.config.pipeline_name,
+            self.location,
+            to_persist,
+            _signature(f"{home}/{self.helper.config.pipeline_file}"),
+            _signature(self._sql())
+        )
+
+        if key not in rendered:
+            rendered[key] = render(
+                query=self.query,
+                parameters=self.pipeline['BigQueryOperator']['params'],
+                location=self.location,
+                persist=to_persist
+            )
+
+        self.query = rendered[key]
 
     def _persist(self) -> list:
         """
-            Persiste os table_ids determinados no arquivo de configuração da suite
-            para a query a ser utilizada no teste. Os table_ids persistidos não
-            trabalharão com project_id e dataset_id configurados para o teste.
+            Retorna o nome das tabelas dos table_ids determinados no arquivo de
+            configuração da suite para serem persistidos na query. Os table_ids
+            persistidos não trabalharão com project_id e dataset_id configurados
+            para o teste (ver render).
         """
 
         # Retorna da configuração do yaml a lista de table_ids
-        to_persist = self.helper.config.persist
-        tables_to_persist = list()
-        
-        # Se a lista não for vazia, é adequado as tabelas persistidas
-        if to_persist:
-            
-            for table_id in to_persist:
-                # Obtém o nome da tabela
-                table_name_from_persist = table_id.rsplit('.', 1)[-1]
-                tables_to_persist.append(table_name_from_persist)
-                
-                # Desfaz as alterações do replace para persistir os table_ids requeridos
-                self.query = self.query.replace(f'{self.location}.{table_name_from_persist}', table_id)
-        
-        return tables_to_persist
+        to_persist = self.helper.config.persist or list()
+
+        return [table_id.rsplit('.', 1)[-1] for table_id in to_persist]
 
     def _destination(self) -> str:
         """
@@ -133,10 +162,166 @@ class Artefact:
         tables = val.get_table_names(self.table_ids)
         return [x for x in tables if x not in self.persist]
 
+    def _statement(self) -> str:
+        """
+            Retorna a query renderizada sem ponto e vírgula final quando
+            possuir um único statement, permitindo executá-la junto ao fetch
+            em um único job (ver fetch). Scripts com vários statements
+            retornam None.
+        """
+
+        found = lexer.statements(self.query)
+
+        if len(found) == 1:
+            return found[0]
+
+
+def _signature(path: str) -> tuple:
+    """
+        Retorna a assinatura (data de modificação e tamanho) de um arquivo.
+    """
+
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def render(query: str, parameters: dict, location: str, persist: tuple) -> str:
+    """
+        Renderiza a query do artefato em uma única passagem da expressão
+        regular: tags ${{param}} recebem os valores do pipeline e table_ids
+        entre crases recebem a localização do teste, exceto as tabelas
+        persistidas, que recebem o table_id informado no config.yaml.
+        Em seguida, todas as referências de tabelas encontradas pelo lexer
+        (inclusive sem crases ou sem project_id) são redirecionadas da
+        mesma forma (ver _redirect), pois são as dependências criadas no
+        dataset de teste. Tags sem valor no pipeline interrompem a execução.
+
+        :param: query -> Query do arquivo .sql.
+        :param: parameters -> Parâmetros do BigQueryOperator no pipeline.
+        :param: location -> project_id.dataset_id do teste.
+        :param: persist -> Table_ids a serem persistidos.
+    """
+
+    values = {str(key): str(value) for key, value in (parameters or dict()).items()}
+    persisted = {table_id.rsplit('.', 1)[-1]: table_id for table_id in persist}
+    missing = set()
+
+    def placeholder(name: str) -> str:
+
+        if name not in values:
+            missing.add(name)
+            return f'${{{{{name}}}}}'
+
+        value = values[name]
+
+        # Valores com table_ids também são adequados à localização do teste
+        return TOKEN.sub(substitute, value) if '`' in value else value
+
+    def substitute(match) -> str:
+
+        if match.group(1) is not None:
+            return placeholder(match.group(1))
+
+        token = PLACEHOLDER.sub(lambda x: placeholder(x.group(1)), match.group(0))
+        parts = token[1:-1].split('.', 2)
+
+        if len(parts) != 3:
+            return token
+
+        table_name = parts[-1]
+
+        if table_name in persisted:
+            return f'`{persisted[table_name]}`'
+
+        return f'`{location}.{table_name}`'
+
+    query = TOKEN.sub(substitute, query)
+
+    if missing:
+        raise Exception(f"Pipeline parameters not informed for query tags: {', '.join(sorted(missing))}.")
+
+    return _redirect(query=query, location=location, persisted=persisted)
+
+
+def _redirect(query: str, location: str, persisted: dict) -> str:
+    """
+        Substitui o nome de cada referência de tabela da query (ver
+        lexer.references) pelo table_id do teste ou pelo table_id
+        persistido.
+
+        :param: persisted -> Dicionário nome da tabela -> table_id persistido.
+    """
+
+    pieces = list()
+    last = 0
+
+    for reference in sorted(lexer.references(query), key=lambda x: x.span):
+        start, end = reference.span
+        target = persisted.get(reference.table_name, f'{location}.{reference.table_name}')
+
+        pieces.append(query[last:start])
+        pieces.append(f'`{target}`')
+        last = end
+
+    pieces.append(query[last:])
+
+    return ''.join(pieces)
+
+
+def search(artefact, mock) -> str:
+    """
+        Retorna o valor de fetch.search do config.yaml para o Data Mock,
+        utilizado no filtro do resultado do artefato por fetch.where pelo
+        parâmetro @search. A expressão é compilada uma única vez por um
+        acessor restrito (ver accessor.parse), ex: mock.key.
+
+        :param: mock -> Instância de Data Mock.
+    """
+
+    return str(accessor.parse(artefact.helper.config.fetch_search)(mock=mock))
+
+
+def fetch(artefact, client, query: str, page_size: int, parameters: dict = None):
+    """
+        Executa a query do artefato na tabela destino e retorna o gerador
+        de páginas da query de fetch informada.
+
+        Quando a query do artefato possui um único statement, a tabela destino
+        é criada e o fetch é executado no mesmo job (script), economizando o
+        agendamento de um job. Caso contrário, são executados dois jobs.
+
+        :param: client -> Instância de Client.
+        :param: query -> Query de fetch sobre <<TABLE_ID>> da tabela destino.
+        :param: page_size -> Total de linhas por página.
+        :param: parameters -> Parâmetros nomeados da query de fetch.
+    """
+
+    if artefact.statement is not None:
+        script = f"""
+                CREATE OR REPLACE TABLE `<<TABLE_ID>>` AS
+                {artefact.statement}
+                ;
+                {query}
+            """
+
+        logger.info('Running Artefact Query and fetch in a single job')
+
+        return client.pages(query=script, table_name=artefact.destination, page_size=page_size, parameters=parameters)
+
+    # Sobe resultado do select da Query para tabela result
+    client.insert_by_query(table_name=artefact.destination, query=artefact.query)
+
+    logger.info('Ran Artefact Query')
+
+    return client.pages(query=query, table_name=artefact.destination, page_size=page_size, parameters=parameters)
+
 
 def run(artefact, mock) -> list:
     """
         Lê arquivo .sql da regra recebida e realiza execução pela a API.
+        O resultado é lido página a página e consumido pelo engine de
+        asserções; as linhas só são mantidas em result quando a plotagem
+        de gráfico estiver ativa.
 
         :param: mock -> Instância de Data Mock.
 
@@ -144,33 +329,52 @@ def run(artefact, mock) -> list:
         ambiente for Local, dependerá da configuração em settings.
     """
     global result
+    global checks
+
+    checks = None
 
     if artefact.helper.run and mock:
 
         client = Client()
         result = list()
-        
-        # Sobe resultado do select da Query para tabela result
-        client.insert_by_query(table_name=artefact.destination, query=artefact.query)
 
-        logger.info('Ran Artefact Query')
-
-        fetch = f"""
+        query = f"""
                     SELECT TO_JSON_STRING(RESULT) AS JSON
                     FROM `<<TABLE_ID>>` AS RESULT 
-                    WHERE {artefact.helper.config.fetch_where} = '{eval(artefact.helper.config.fetch_search)}'
+                    WHERE {artefact.helper.config.fetch_where} = @search
                     ORDER BY {artefact.helper.config.fetch_order};
                 """
 
+        stream = engine.Engine(owner=None, unittests=mock.unittests)
+        rows = 0
+        size = 0
+
         # Retorna o resultado do Select do Artefato utilizando a conversão
         # em JSON do próprio BigQuery para tratamento mais adequado de dados
-        data = client.select(query=fetch, table_name=artefact.destination, output='DICT')
+        # O artefato e o fetch são executados em um único job quando possível
+        parameters = {'search': search(artefact, mock)}
+
+        for page in fetch(artefact, client, query=query, page_size=params.__FETCH_PAGE_SIZE__, parameters=parameters):
 
-        # Monta o resultado
-        for row in data:
-            result.append(json.loads(row['JSON']))
+            rows += len(page)
+            size += sum(len(row['JSON']) for row in page)
 
-        if not result:
+            if rows > artefact.helper.config.fetch_max_rows:
+                raise Exception(f'Artefact result exceeded the limit of {artefact.helper.config.fetch_max_rows} rows.')
+
+            if size > artefact.helper.config.fetch_max_bytes:
+                raise Exception(f'Artefact result exceeded the limit of {artefact.helper.config.fetch_max_bytes} bytes.')
+
+            # Monta o resultado da página
+            records = [json.loads(row['JSON']) for row in page]
+            stream.update(spy.Frame(result=records))
+
+            if artefact.helper.plt:
+                result.extend(records)
+
+        checks = stream.finish()
+
+        if not rows:
             logger.info('Query returned empty. Nothing to send')
 
     else:
@@ -179,3 +383,136 @@ def run(artefact, mock) -> list:
         logger.info('Saved rendered query at ./tests/tmp')
 
     return result
+
+
+def push_down(artefact, mock, unittests: dict) -> list:
+    """
+        Executa a query do artefato e, em vez de transferir o resultado,
+        executa uma única query de verificação com todos os unittests do
+        testcase. Os resultados ficam disponíveis em checks para o engine
+        e result permanece vazio, pois o resultado não é transferido.
+        Se a query de verificação falhar (ex: tipo de coluna incompatível),
+        o testcase é avaliado pelo engine local (ver run).
+
+        :param: mock -> Instância de Data Mock.
+        :param: unittests -> Dicionário de unittests do testcase.
+    """
+    global result
+    global checks
+
+    result = None
+    checks = None
+
+    if artefact.helper.run and mock:
+
+        client = Client()
+
+        # Sobe resultado do select da Query para tabela result
+        client.insert_by_query(table_name=artefact.destination, query=artefact.query)
+
+        logger.info('Ran Artefact Query')
+
+        units = pushdown.plan(unittests)
+        check = pushdown.build(
+            units=units,
+            where=artefact.helper.config.fetch_where,
+            order=artefact.helper.config.fetch_order
+        )
+
+        parameters = {'search': search(artefact, mock)}
+
+        try:
+            rows = client.select(query=check, table_name=artefact.destination, output='DICT', parameters=parameters) if check else list()
+        except Exception as e:
+            logger.warning(f'Push-down check query failed, evaluating unittests locally: {e}')
+            return run(artefact=artefact, mock=mock)
+
+        checks = pushdown.decode(units=units, rows=rows)
+
+        logger.info(f'Pushed down {len(units)} unittest(s) to BigQuery')
+
+    else:
+        val.write_file(content=artefact.query, file='rendered_query', ext='sql', path='./tests/tmp')
+        logger.info('Settings set to not run query')
+        logger.info('Saved rendered query at ./tests/tmp')
+
+    return result
+
+
+def batch(artefact, mocks: dict) -> dict:
+    """
+        Executa a query do artefato uma única vez para os Data Mocks de
+        vários testcases já enviados ao BigQuery e obtém o resultado de
+        todos em um único fetch. As linhas são separadas por testcase pelo
+        valor de fetch.where e consumidas pelo engine de asserções de cada
+        testcase. Os limites de fetch.max_rows e fetch.max_bytes valem
+        por testcase.
+
+        :param: mocks -> Dicionário testcase -> Data Mock. Os valores de
+        fetch.search dos Data Mocks devem ser únicos.
+
+        Retorna dicionário testcase -> (checks, result).
+    """
+
+    config = artefact.helper.config
+    keys = {search(artefact, mock): testcase for testcase, mock in mocks.items()}
+
+    if len(keys) != len(mocks):
+        raise Exception('Batched testcases should have unique fetch search values.')
+
+    client = Client()
+
+    query = f"""
+                SELECT TO_JSON_STRING(RESULT) AS JSON, CAST({config.fetch_where} AS STRING) AS KEY
+                FROM `<<TABLE_ID>>` AS RESULT 
+                WHERE CAST({config.fetch_where} AS STRING) IN UNNEST(@search)
+                ORDER BY {config.fetch_order};
+            """
+
+    streams = {testcase: engine.Engine(owner=None, unittests=mock.unittests) for testcase, mock in mocks.items()}
+    results = {testcase: list() for testcase in mocks}
+    rows = dict.fromkeys(mocks, 0)
+    sizes = dict.fromkeys(mocks, 0)
+
+    for page in fetch(artefact, client, query=query, page_size=params.__FETCH_PAGE_SIZE__, parameters={'search': list(keys)}):
+
+        # Separa as linhas da página por testcase mantendo a ordenação
+        groups = dict()
+        for row in page:
+            groups.setdefault(keys[row['KEY']], list()).append(row)
+
+        for testcase, group in groups.items():
+
+            rows[testcase] += len(group)
+            sizes[testcase] += sum(len(row['JSON']) for row in group)
+
+            if rows[testcase] > config.fetch_max_rows:
+                raise Exception(f'Artefact result of {testcase} exceeded the limit of {config.fetch_max_rows} rows.')
+
+            if sizes[testcase] > config.fetch_max_bytes:
+                raise Exception(f'Artefact result of {testcase} exceeded the limit of {config.fetch_max_bytes} bytes.')
+
+            records = [json.loads(row['JSON']) for row in group]
+            streams[testcase].update(spy.Frame(result=records))
+
+            if artefact.helper.plt:
+                results[testcase].extend(records)
+
+    logger.info(f'Fetched {sum(rows.values())} row(s) for {len(mocks)} testcase(s)')
+
+    return {testcase: (streams[testcase].finish(), results[testcase]) for testcase in mocks}
+
+
+def release() -> None:
+    """
+        Libera o resultado e as asserções calculadas do artefato
+        ao final da classe de teste.
+    """
+    global result
+    global checks
+
+    result = None
+    checks = None
+
+    spy.release()
+    engine.release()
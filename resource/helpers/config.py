@@ -1,11 +1,18 @@
 """
     Módulo responsável por carregar o arquivo de configuração
-    da suite (config.yaml).
+    da suite (config.yaml). As configurações são mantidas em cache
+    por suite (ver load).
 """
 
 from tests.resource.utils import validator as val
+from tests.resource.helpers import params
 from tests.resource.utils.governance import Governance
 
+
+# Configurações carregadas: caminho do config.yaml -> SuiteConfig
+loaded = dict()
+
+
 class SuiteConfig:
     """
         Classe responsável por carregar os parâmetros
@@ -23,7 +30,10 @@ class SuiteConfig:
         self.fetch_search = self._fetch_search()
         self.fetch_where = self._fetch_where()
         self.fetch_order = self._fetch_order()
+        self.fetch_max_rows = self._fetch_max_rows()
+        self.fetch_max_bytes = self._fetch_max_bytes()
         self.default_dataset_test = self._default_dataset_test()
+        self.isolation = self._isolation()
     
     def _yaml(self, path:str) -> dict:
         """
@@ -102,6 +112,26 @@ class SuiteConfig:
         except KeyError:
             pass
 
+    def _fetch_max_rows(self) -> int:
+        """
+            Retorna o total máximo de linhas do resultado obtido
+            por testcase. Acima do limite a execução é interrompida.
+        """
+        try:
+            return int(self.yaml['query']['fetch']['max_rows'])
+        except KeyError:
+            return params.__MAX_RESULT_ROWS__
+
+    def _fetch_max_bytes(self) -> int:
+        """
+            Retorna o tamanho máximo em bytes (JSON) do resultado
+            obtido por testcase. Acima do limite a execução é interrompida.
+        """
+        try:
+            return int(self.yaml['query']['fetch']['max_bytes'])
+        except KeyError:
+            return params.__MAX_RESULT_BYTES__
+
     def _default_dataset_test(self) -> str:
         """
             Retorna o valor default para o dataset da suite
@@ -113,3 +143,44 @@ class SuiteConfig:
             return default
         except KeyError:
             pass
+
+    def _isolation(self) -> str:
+        """
+            Retorna como os Data Mocks dos testcases são isolados nas
+            tabelas compartilhadas pela suite, onde:
+
+            key -> As linhas são acumuladas e o resultado é filtrado pelo fetch (default).
+            truncate -> As tabelas são truncadas antes da carga de cada testcase.
+        """
+        try:
+            isolation = self.yaml['environment']['isolation']
+        except KeyError:
+            return 'key'
+
+        if isolation not in ('key', 'truncate'):
+            raise Exception(f'Not a valid isolation: {isolation}. Use key or truncate.')
+
+        return isolation
+
+
+def load(path: str) -> SuiteConfig:
+    """
+        Retorna a configuração da suite do test.yaml informado. A instância
+        é reaproveitada entre os testcases e recriada apenas quando o
+        config.yaml for alterado (ver val.read_file).
+
+        :path: -> Diretório do test.yaml da suite.
+    """
+
+    if not path:
+        return SuiteConfig(path=path)
+
+    target = path.replace('test.yaml', 'config.yaml')
+    cached = loaded.get(target)
+
+    if cached is not None and cached.yaml is val.read_file(dir=target):
+        return cached
+
+    loaded[target] = SuiteConfig(path=path)
+
+    return loaded[target]
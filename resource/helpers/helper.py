@@ -1,18 +1,106 @@
 """
     1º script a ser iniciado para execução de rotina no Data Mock para o setUp
     dos testes. Responsável por determinar as configurações iniciais do ambiente.
+
+    O ambiente de execução é detectado uma única vez por processo (ver
+    environment) e a configuração da suite é mantida em cache (ver
+    config.load), de forma que o Helper de cada testcase é apenas uma
+    visão sobre eles e o CLI.
 """
 
 import os
+import uuid
 from pathlib import PurePath
+from typing import NamedTuple
 from socket import gethostname
 from tests.resource.helpers import params
-from tests.resource.api.client import Client
+from tests.resource.helpers import config
 from tests.resource.utils import validator as val
-from tests.resource.helpers.config import SuiteConfig
+from tests.resource.utils import collector
 from tests.resource.utils.governance import Governance
 
 
+# Ambiente de execução detectado no processo (ver environment)
+snapshot = None
+
+
+class Environment(NamedTuple):
+    """
+        Retrato imutável do ambiente de execução.
+
+        Attributes:
+        :param: hostname -> Hostname do ambiente que executa a rotina.
+        :param: environment -> Ambiente (LOC ou o informado pelo Airflow).
+        :param: local -> Indica se o ambiente é LOC.
+        :param: project_id_mtd -> PROJECT_ID da tabela de metadata.
+        :param: run_id -> Identificador da execução (labels dos datasets de mock).
+    """
+
+    hostname: str
+    environment: str
+    local: bool
+    project_id_mtd: str
+    run_id: str
+
+
+def _hostname() -> str:
+    """
+        Retorna o hostname do ambiente que executa a rotina de Data Mock.
+    """
+    return gethostname().upper()
+
+
+def _enviroment(hostname: str) -> str:
+
+    """
+        Função que determina se o ambiente que executa a rotina
+        é local ou do Airflow.
+
+        Se o ambiente tiver variável de ambiente AIRFLOW_HOME e o nome
+        hostname conter airflow-worker, será considerado Cloud.
+    """
+    
+    if 'AIRFLOW_HOME' in os.environ and 'AIRFLOW-WORKER' in hostname.upper():
+        try:
+            from airflow.models import Variable
+            return Variable.get('environment').upper()
+        except ImportError:
+            raise Exception('Airflow does not have environment variable.')
+    return 'LOC'
+
+
+def _project_id_mtd(environment: str) -> str:
+    """
+        Função que determina qual PROJECT_ID (hml ou prd) utilizado para
+        consulta na tabela de metadata.
+    """
+
+    return params.__PROJECT_ID_MTD_HML__ if environment == 'HML' else params.__PROJECT_ID_MTD_PRD__
+
+
+def environment() -> Environment:
+    """
+        Retorna o ambiente de execução, detectado apenas na primeira
+        chamada do processo. Em workers do Airflow evita uma consulta
+        a Variable por testcase.
+    """
+    global snapshot
+
+    if snapshot is None:
+        hostname = _hostname()
+        detected = _enviroment(hostname)
+
+        snapshot = Environment(
+            hostname=hostname,
+            environment=detected,
+            local=detected == 'LOC',
+            project_id_mtd=_project_id_mtd(detected),
+            run_id=uuid.uuid4().hex[:12]
+        )
+
+    return snapshot
+
+
 class Helper:
 
     """
@@ -21,14 +109,17 @@ class Helper:
     """
 
     def __init__(self, path: str = None, suite: str = None, testcase: str = None):
+        current = environment()
+
         self.suite = suite
         self.testcase = testcase
         self.config = self._config(path)
-        self.hostname = self._hostname()
-        self.environment = self._enviroment()
-        self.local = self._local()
+        self.hostname = current.hostname
+        self.environment = current.environment
+        self.local = current.local
         self.project_id = params.__PROJECT_ID__
-        self.project_id_mtd = self._project_id_mtd()
+        self.project_id_mtd = current.project_id_mtd
+        self.run_id = current.run_id
         self.dataset_id = self._dataset_id()
         self.dataset_utils = params.__DATASET_UTILS__
         self.dataset_logs = params.__DATASET_LOGS__
@@ -36,6 +127,9 @@ class Helper:
         self.references = params.__REFERENCES__
         self.run = self._run()
         self.sch = self._sch()
+        self.rebuild = self._rebuild()
+        self.push_down = self._push_down()
+        self.batch = self._batch()
         self.wlst = self._wlst()
         self.default = self._default()
         self.plt = self._plt()
@@ -44,42 +138,10 @@ class Helper:
     def _config(self, path):
 
         """
-            Cria instância de configuração da suite para disponibilidade de 
+            Obtém a configuração da suite (em cache) para disponibilidade de 
             decisão do Helper.
         """
-        return SuiteConfig(path=path)
-
-    def _hostname(self) -> str:
-        """
-            Retorna o hostname do ambiente que executa a rotina de Data Mock.
-        """
-        return gethostname().upper()
-
-    def _enviroment(self) -> str:
-
-        """
-            Função que determina se o ambiente que executa a rotina
-            é local ou do Airflow.
-
-            Se o ambiente tiver variável de ambiente AIRFLOW_HOME e o nome
-            hostname conter airflow-worker, será considerado Cloud.
-        """
-        
-        if 'AIRFLOW_HOME' in os.environ and 'AIRFLOW-WORKER' in self.hostname.upper():
-            try:
-                from airflow.models import Variable
-                return Variable.get('environment').upper()
-            except ImportError:
-                raise Exception('Airflow does not have environment variable.')
-        return 'LOC'
-
-    def _local(self) -> bool:
-        """
-            Retorna True se o environment for LOC.
-            Retorna False para qualquer outro valor diferente.
-        """
-
-        return True if self.environment == 'LOC' else False
+        return config.load(path=path)
 
     def _dataset_id(self) -> str:
         """
@@ -112,14 +174,6 @@ class Helper:
             return dataset_from_settings
         
 
-    def _project_id_mtd(self):
-        """
-            Função que determina qual PROJECT_ID (hml ou prd) utilizado para
-            consulta na tabela de metadata.
-        """
-
-        return params.__PROJECT_ID_MTD_HML__ if self.environment == 'HML' else params.__PROJECT_ID_MTD_PRD__
-
     def _default(self) -> bool:
         """
             Determina se o dataset_id configurado no ambiente local será default.
@@ -147,6 +201,38 @@ class Helper:
         """
         return True if not self.local else params.__CLI__.schema
 
+    def _rebuild(self) -> bool:
+        """
+            Função que retorna de settings se os Data Mocks devem ser
+            reconstruídos ignorando o cache local.
+
+            Se o ambiente for CLOUD, os mocks são sempre reconstruídos.
+            Se o ambiente for LOCAL, o cache pode ou não ser utilizado.
+        """
+        return True if not self.local else params.__CLI__.rebuild_mocks
+
+    def _push_down(self) -> bool:
+        """
+            Indica se os unittests serão avaliados no BigQuery por uma única
+            query de verificação, sem transferir o resultado do artefato.
+
+            Se o ambiente for CLOUD, o resultado é sempre transferido.
+        """
+        return False if not self.local else params.__CLI__.push_down
+
+    def _batch(self) -> bool:
+        """
+            Indica se os testcases da suite serão executados em lote: um envio
+            por tabela, uma execução do artefato e um fetch para toda a suite.
+
+            Se o ambiente for CLOUD, os testcases são executados individualmente.
+            Não se aplica com --push-down, sem execução da query ou com
+            isolation truncate na suite.
+        """
+        if not self.local or not self.run or self.push_down or self.config.isolation == 'truncate':
+            return False
+        return params.__CLI__.batch
+
     def _wlst(self) -> bool:
         """
             Função que retorna de settings se as wordlists devem
@@ -180,9 +266,12 @@ class Helper:
 
 def temp_file_exists() -> None:
     """
-        Rotina que verifica se já existe um arquivo na pasta temp com o nome de algum dataset e exclui o dataset.
+        Rotina que verifica se já existe um arquivo na pasta temp com o nome de algum dataset
+        e envia o dataset para remoção em segundo plano junto aos datasets de mock expirados
+        (ver collector.start), sem bloquear a preparação da suite.
     """
     path_file = PurePath('./tests/tmp/datasets/')
+    leftovers = list()
     
     if os.path.exists(path_file):
         files = os.listdir(path_file)
@@ -191,11 +280,13 @@ def temp_file_exists() -> None:
                 temp_file = os.path.join(path_file, file)
                 with open(temp_file, 'r') as f:
                     dataset_id = f.read()
-                    Governance().check_dataset_name(dataset_id)
-                    if params.__HELPER__.dataset_id != dataset_id:
-                        Client().drop_dataset(dataset_id)
-                        f.close()
-                        temp_file_deleted()
+
+                Governance().check_dataset_name(dataset_id)
+                if params.__HELPER__.dataset_id != dataset_id:
+                    leftovers.append(dataset_id)
+                    os.remove(temp_file)
+
+    collector.start(leftovers=leftovers)
 
 
 def temp_file_create() -> None:
@@ -12,5 +12,12 @@ __REFERENCES__ = \
 __HELPER__ = None
 __CLI__ = None
 __USER_EMAIL__ = None
+__CLOCK__ = None
 __DAYS_TO_UPDATE_SCHEMA__ = 3
-
+__MOCK_CACHE_SIZE__ = 512 * 1024 ** 2
+__FETCH_PAGE_SIZE__ = 10000
+__MAX_RESULT_ROWS__ = 1000000
+__MAX_RESULT_BYTES__ = 1024 ** 3
+__DISTINCT_SPILL__ = 1000000
+__DATASET_EXPIRATION__ = 24 * 60 * 60
+__COLLECTOR_WORKERS__ = 8
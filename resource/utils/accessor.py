@@ -0,0 +1,92 @@
+"""
+    Script responsável por compilar expressões de acesso restritas, como
+    mock.key ou mock.person['id'], utilizadas em fetch.search do config.yaml
+    no lugar de eval. São permitidos apenas atributos públicos e chaves
+    literais a partir de um nome raiz. As expressões compiladas são
+    mantidas em cache.
+"""
+
+import ast
+from functools import lru_cache
+
+
+class Accessor:
+    """
+        Expressão de acesso compilada.
+
+        Attributes:
+        :param: expression -> Expressão original.
+        :param: root -> Nome raiz da expressão (ex: mock).
+        :param: steps -> Passos de acesso: ('attr', nome) ou ('item', chave).
+    """
+
+    __slots__ = ('expression', 'root', 'steps')
+
+    def __init__(self, expression: str, root: str, steps: tuple):
+        self.expression = expression
+        self.root = root
+        self.steps = steps
+
+    def __call__(self, **names):
+        """
+            Resolve a expressão a partir dos objetos informados por nome.
+
+            Exemplo: accessor(mock=mock)
+        """
+
+        if self.root not in names:
+            raise Exception(f'Name {self.root} not available for expression: {self.expression}')
+
+        value = names[self.root]
+
+        for kind, key in self.steps:
+            value = getattr(value, key) if kind == 'attr' else value[key]
+
+        return value
+
+    def __repr__(self):
+        return f'<Accessor {self.expression}>'
+
+
+@lru_cache(maxsize=64)
+def parse(expression: str) -> Accessor:
+    """
+        Compila uma expressão de acesso. Chamadas, operadores e atributos
+        privados (iniciados por _) não são permitidos.
+
+        :param: expression -> Expressão a ser compilada (ex: mock.key).
+    """
+
+    if not isinstance(expression, str) or not expression.strip():
+        raise Exception(f'Access expression not informed: {expression}')
+
+    try:
+        node = ast.parse(expression.strip(), mode='eval').body
+    except SyntaxError:
+        raise Exception(f'Invalid access expression: {expression}')
+
+    steps = list()
+
+    while not isinstance(node, ast.Name):
+
+        if isinstance(node, ast.Attribute) and not node.attr.startswith('_'):
+            steps.append(('attr', node.attr))
+
+        elif isinstance(node, ast.Subscript):
+            key = node.slice
+
+            # Python < 3.9 encapsula a chave em ast.Index
+            if type(key).__name__ == 'Index':
+                key = key.value
+
+            if not isinstance(key, ast.Constant):
+                raise Exception(f'Access expression keys should be literals: {expression}')
+
+            steps.append(('item', key.value))
+
+        else:
+            raise Exception(f'Unsupported access expression: {expression}. Use attributes and literal keys (ex: mock.key).')
+
+        node = node.value
+
+    return Accessor(expression=expression, root=node.id, steps=tuple(reversed(steps)))
@@ -4,6 +4,7 @@
 """
 
 
+import logging
 from tests.resource.api.client import Client
 from tests.resource.utils import dataquality
 from tests.resource.helpers import artefact
@@ -20,14 +21,23 @@ config = None
 evidence = None
 testware = None
 
+# Suite provisionada: (suite, dataset_id, default)
+scope = None
 
-def setUpClass(path: str, suite: str, testcase: str):
+# Resultados dos testcases executados em lote: testcase -> (mock, checks, result)
+batched = dict()
+
+
+def setUpClass(path: str, suite: str, testcase: str, batch: list = None):
 
     """
         Trecho responsável por verificar o ambiente de teste, preparar e executar o 
         envio do Mock para os módulos de teste.
+
+        :param: batch -> Testcases da suite executados em lote com --batch.
     """
     global mock
+    global scope
     global config
     global evidence
     global testware
@@ -35,26 +45,87 @@ def setUpClass(path: str, suite: str, testcase: str):
     # Inicializa configurações de ambiente
     params.__HELPER__ = helper.Helper(path=path, suite=suite, testcase=testcase)
 
-    # Executa a rotina de validação do arquivo temp_file.
-    helper.temp_file_exists()
+    current = (suite, params.__HELPER__.dataset_id, params.__HELPER__.default)
+    provision = scope != current
+
+    # O dataset é preparado apenas no primeiro testcase da suite
+    if provision:
+
+        # Encerra a suite anterior
+        tearDownSuite()
+
+        # Executa a rotina de validação do arquivo temp_file.
+        helper.temp_file_exists()
 
-    # Executa a rotina de criação do arquivo temp_file.
-    helper.temp_file_create()
+        # Executa a rotina de criação do arquivo temp_file.
+        helper.temp_file_create()
 
     # Carrega o Artefato de Teste
     testware = artefact.Artefact()
 
+    # Cria dataset e tabelas dependentes para a query uma única vez por suite
+    if provision:
+        events.create_artefact_objects(artefact=testware)
+        scope = current
+
+        # Executa de uma só vez os testcases da suite com --batch
+        if params.__HELPER__.batch and batch:
+            batched.update(run_batch(path=path, suite=suite, testcases=batch, testware=testware))
+
+    # Testcase já executado em lote: apenas disponibiliza o resultado
+    if testcase in batched:
+        mock, artefact.checks, artefact.result = batched.pop(testcase)
+        evidence = artefact.result
+        return
+
     # Carrega o Data Mock
     mock = mocker.build(path=path, suite=suite, testcase=testcase)
-
-    # Cria dataset e tabelas dependentes para a query
-    events.create_artefact_objects(artefact=testware)
     
-    # Envia Data Mock
-    events.mockup_to_bigquery(mock=mock.events)
+    # Envia Data Mock (com --batch, testcases isolados utilizam tabelas apenas
+    # com suas linhas, exceto no dataset default, que é compartilhado)
+    isolated = params.__HELPER__.batch and not params.__HELPER__.default and bool(mock.settings.get('isolated'))
+    events.mockup_to_bigquery(mock=mock.events, truncate=isolated)
 
     # Executa a Query correspondente
-    evidence = artefact.run(artefact=testware, mock=mock)
+    if params.__HELPER__.push_down:
+        evidence = artefact.push_down(artefact=testware, mock=mock, unittests=mock.unittests)
+    else:
+        evidence = artefact.run(artefact=testware, mock=mock)
+
+
+def run_batch(path: str, suite: str, testcases: list, testware) -> dict:
+    """
+        Constrói os Data Mocks dos testcases, envia todos em um único job
+        por tabela, executa o artefato uma vez e separa o resultado por
+        testcase (ver artefact.batch). Testcases com o mesmo valor de
+        fetch.search não podem ser separados e são executados individualmente.
+
+        Retorna dicionário testcase -> (mock, checks, result).
+    """
+
+    mocks = dict()
+    keys = dict()
+
+    for testcase in testcases:
+        mock = mocker.build(path=path, suite=suite, testcase=testcase)
+        keys.setdefault(artefact.search(testware, mock), list()).append(testcase)
+        mocks[testcase] = mock
+
+    for key, shared in keys.items():
+        if len(shared) > 1:
+            logging.warning(f"Testcases {', '.join(shared)} share the fetch search value {key} and will run individually")
+            for testcase in shared:
+                mocks.pop(testcase)
+
+    if not mocks:
+        return dict()
+
+    # Envia todos os Data Mocks com um job por tabela
+    events.mockup_to_bigquery(mock=events.merge([mock.events for mock in mocks.values()]))
+
+    results = artefact.batch(artefact=testware, mocks=mocks)
+
+    return {testcase: (mocks[testcase], *results[testcase]) for testcase in mocks}
 
 
 def tearDownClass(status: str, duration: str, units: list):
@@ -62,13 +133,6 @@ def tearDownClass(status: str, duration: str, units: list):
     global mock
     global evidence
 
-    # Valida o dataset configurado e argumento de persistência para expurgo.
-    if not params.__HELPER__.default and not params.__CLI__.persist_dataset:
-        
-        dataset_id = params.__HELPER__.dataset_id
-        Client().drop_dataset(dataset_id)
-        helper.temp_file_deleted()
-
     # Plota gráfico para cenário correspondente
     graph.build(mock, evidence)
 
@@ -81,3 +145,42 @@ def tearDownClass(status: str, duration: str, units: list):
     )
 
     logger.send(log, target='log_result')
+
+
+def release():
+    """
+        Libera o resultado do artefato e o Data Mock da classe de teste.
+        Executado ao final de toda classe de teste, inclusive com erro
+        (ver handlers.tearDownClass).
+    """
+
+    global mock
+    global evidence
+
+    artefact.release()
+    mock = None
+    evidence = None
+
+
+def tearDownSuite():
+    """
+        Encerra a suite provisionada: remove o dataset quando não for o
+        default e não houver argumento de persistência. Executado ao trocar
+        de suite e ao final da execução (ver handlers.tearDownModule).
+    """
+
+    global scope
+
+    if scope is None:
+        return
+
+    suite, dataset_id, default = scope
+    scope = None
+
+    # Valida o dataset configurado e argumento de persistência para expurgo.
+    if not default and not params.__CLI__.persist_dataset:
+        Client().drop_dataset(dataset_id)
+        helper.temp_file_deleted()
+
+    events.release()
+    batched.clear()
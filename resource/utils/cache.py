@@ -0,0 +1,200 @@
+"""
+    Script responsável por persistir em disco os Data Mocks já construídos.
+    Cada testcase é armazenado em Parquet (um arquivo por tabela) sob uma
+    chave calculada a partir do bloco YAML, do código das entidades e da
+    semente. O diretório é limitado por tamanho total com descarte LRU.
+
+    Valores únicos por execução (token, ex: Patient Key) são registrados no
+    manifesto e substituídos pelo valor da execução atual ao carregar.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from tests.resource.helpers import params
+from tests.resource.utils.logger import logger
+
+
+PATH = './tests/tmp/mocks'
+MANIFEST = 'manifest.json'
+
+
+def digest(block: dict, sources: list, seed: int) -> str:
+    """
+        Retorna a chave do cache para um testcase.
+
+        :param: block -> Bloco YAML do testcase com base_date já resolvido.
+        :param: sources -> Lista de arquivos .py que influenciam a construção.
+        :param: seed -> Semente utilizada pelos geradores.
+    """
+
+    sha = hashlib.sha256()
+    sha.update(json.dumps(block, sort_keys=True, default=str).encode('utf-8'))
+
+    for source in sorted(set(sources)):
+        with open(source, 'rb') as f:
+            sha.update(f.read())
+
+    sha.update(str(seed).encode('utf-8'))
+
+    return sha.hexdigest()
+
+
+def _plain(value):
+    """
+        Converte arrays numpy lidos do Parquet (campos repetidos)
+        de volta para listas, inclusive dentro de estruturas aninhadas.
+    """
+
+    if isinstance(value, np.ndarray):
+        return [_plain(item) for item in value.tolist()]
+    elif isinstance(value, list):
+        return [_plain(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def _swap(value, old: str, new: str):
+    """
+        Substitui o token armazenado pelo atual em um valor, inclusive
+        dentro de textos (ex: concatenações), em caixa alta ou baixa e
+        em estruturas aninhadas.
+
+        Valores derivados do token por transformações irreversíveis
+        (ex: hash do Patient Key) não são substituídos e mantêm o valor
+        da execução que gerou o cache. Entidades com esses campos devem
+        ser construídas com --rebuild-mocks.
+    """
+
+    if isinstance(value, str):
+        for previous, current in ((old, new), (old.lower(), new.lower()), (old.upper(), new.upper())):
+            value = value.replace(previous, current)
+        return value
+    elif isinstance(value, list):
+        return [_swap(item, old, new) for item in value]
+    elif isinstance(value, dict):
+        return {key: _swap(item, old, new) for key, item in value.items()}
+    return value
+
+
+def load(key: str, token: str = None):
+    """
+        Retorna os eventos (dicionário de dataframes por tabela) armazenados
+        para a chave informada ou None quando não houver cache.
+
+        :param: token -> Valor da execução atual que substitui o token
+        registrado no cache (ver save e _swap).
+    """
+
+    target = Path(PATH) / key
+    manifest = target / MANIFEST
+
+    if not manifest.exists():
+        return None
+
+    with open(manifest, 'r', encoding='utf8') as f:
+        stored_manifest = json.load(f)
+
+    entities = stored_manifest['entities']
+    stored_token = stored_manifest.get('token')
+    swap = token is not None and stored_token is not None and token != stored_token
+
+    events = dict()
+
+    for entitie, stored in entities.items():
+        if not stored:
+            events[entitie] = None
+            continue
+
+        df = pd.read_parquet(target / f'{entitie}.parquet')
+
+        for column in df.columns:
+            if df[column].dtype == object:
+                index = df[column].first_valid_index()
+
+                if index is not None and isinstance(df[column][index], (np.ndarray, dict)):
+                    df[column] = df[column].map(_plain)
+
+            if swap and (df[column].dtype == object or pd.api.types.is_string_dtype(df[column].dtype)):
+                df[column] = df[column].map(lambda value: _swap(value, stored_token, token))
+
+        events[entitie] = df
+
+    # Marca o uso mais recente para o descarte LRU
+    os.utime(target)
+
+    return events
+
+
+def save(key: str, events: dict, token: str = None) -> None:
+    """
+        Persiste os eventos construídos para a chave informada. A escrita
+        é feita em diretório temporário e renomeada ao final para evitar
+        caches parciais. Falhas de serialização apenas desativam o cache
+        do testcase.
+
+        :param: token -> Valor único da execução presente nos eventos.
+    """
+
+    target = Path(PATH) / key
+    staging = Path(PATH) / f'.{key}.{os.getpid()}'
+
+    try:
+        staging.mkdir(parents=True, exist_ok=True)
+        entities = dict()
+
+        for entitie, df in events.items():
+            entities[entitie] = df is not None
+
+            if df is not None:
+                df.to_parquet(staging / f'{entitie}.parquet', index=False)
+
+        with open(staging / MANIFEST, 'w', encoding='utf8') as f:
+            json.dump({'entities': entities, 'token': token}, f)
+
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+
+    except Exception as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        logger.warning(f'Cannot cache Data Mock: {e}')
+        return
+
+    evict(limit=params.__MOCK_CACHE_SIZE__)
+
+
+def _size(path: Path) -> int:
+    """
+        Retorna o tamanho total em bytes dos arquivos de um diretório.
+    """
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def evict(limit: int) -> None:
+    """
+        Remove os caches menos recentemente usados até que o tamanho
+        total do diretório seja menor ou igual ao limite em bytes.
+    """
+
+    root = Path(PATH)
+
+    if not root.exists():
+        return
+
+    entries = [entry for entry in root.iterdir() if entry.is_dir() and not entry.name.startswith('.')]
+    entries = sorted(entries, key=lambda entry: entry.stat().st_mtime)
+
+    sizes = {entry: _size(entry) for entry in entries}
+    total = sum(sizes.values())
+
+    for entry in entries:
+        if total <= limit:
+            break
+
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
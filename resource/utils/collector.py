@@ -0,0 +1,170 @@
+"""
+    Script responsável por remover datasets de mock órfãos, deixados por
+    execuções interrompidas desta ou de outras máquinas. Os datasets de mock
+    são criados com labels de owner, run_id, criação e expiração (ver
+    Governance.dataset_labels) e o coletor encontra os expirados em uma
+    única listagem, removendo-os de forma concorrente em segundo plano,
+    fora do caminho crítico dos testes.
+
+    Também pode ser executado isoladamente:
+
+    python -m tests.resource.utils.collector
+"""
+
+import sys
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tests.resource.helpers import params
+from tests.resource.api.client import Client
+from tests.resource.utils.logger import logger
+from tests.resource.utils.governance import Governance
+
+
+# Indica se os datasets expirados já foram buscados no processo
+scanned = False
+
+# Coletas em andamento (ver start e join)
+threads = list()
+
+
+def expired(datasets: dict, now: float = None) -> list:
+    """
+        Retorna os datasets de mock com expiração vencida, exceto o
+        dataset em uso pelo Helper e os mantidos com --persist-dataset
+        (label persist).
+
+        :param: datasets -> Dicionário dataset_id -> labels (ver Client.list_datasets).
+        :param: now -> Epoch de referência. Por default o horário atual.
+    """
+
+    now = time.time() if now is None else now
+    current = params.__HELPER__.dataset_id if params.__HELPER__ else None
+    found = list()
+
+    for dataset_id, labels in datasets.items():
+
+        if dataset_id == current or labels.get('persist') == 'true':
+            continue
+
+        try:
+            Governance().check_dataset_name(dataset_id)
+            expires = int(labels.get('expires'))
+        except Exception:
+            continue
+
+        if expires <= now:
+            found.append(dataset_id)
+
+    return sorted(found)
+
+
+def drop(dataset_ids: list) -> list:
+    """
+        Remove os datasets informados de forma concorrente e retorna os
+        removidos. Falhas são apenas registradas, sem interromper a coleta.
+    """
+
+    def remove(dataset_id: str):
+        try:
+            Client().drop_dataset(dataset_id)
+            return dataset_id
+        except Exception as e:
+            logger.warning(f'Could not drop dataset {dataset_id}: {e}')
+
+    if not dataset_ids:
+        return list()
+
+    with ThreadPoolExecutor(max_workers=params.__COLLECTOR_WORKERS__) as executor:
+        dropped = [x for x in executor.map(remove, dataset_ids) if x]
+
+    logger.info(f'Dropped {len(dropped)} orphan dataset(s): {", ".join(dropped)}')
+
+    return dropped
+
+
+def persisted(datasets: dict) -> set:
+    """
+        Retorna os datasets mantidos com --persist-dataset (label persist).
+
+        :param: datasets -> Dicionário dataset_id -> labels (ver Client.list_datasets).
+    """
+
+    return {dataset_id for dataset_id, labels in datasets.items() if labels.get('persist') == 'true'}
+
+
+def collect(leftovers: list = None, scan: bool = True) -> list:
+    """
+        Remove os datasets informados e, quando scan for True, os datasets
+        de mock expirados encontrados pela listagem por label. Os datasets
+        informados passam pela mesma listagem: os mantidos com
+        --persist-dataset não são removidos e, se a listagem falhar,
+        nenhum dataset é removido.
+
+        :param: leftovers -> Datasets a serem removidos (ex: registrados em ./tests/tmp/datasets).
+    """
+
+    try:
+        datasets = Client().list_datasets(label=Governance().dataset_filter())
+    except Exception as e:
+        logger.warning(f'Could not list orphan datasets: {e}')
+        return list()
+
+    targets = set(leftovers or list()) - persisted(datasets)
+
+    if scan:
+        targets.update(expired(datasets))
+
+    return drop(sorted(targets))
+
+
+def start(leftovers: list = None) -> None:
+    """
+        Inicia a coleta em segundo plano, sem bloquear a execução. Os datasets
+        expirados são buscados apenas na primeira chamada do processo.
+
+        :param: leftovers -> Datasets a serem removidos além dos expirados.
+    """
+    global scanned
+
+    scan = not scanned
+    scanned = True
+
+    if not leftovers and not scan:
+        return
+
+    worker = threading.Thread(target=collect, args=(list(leftovers or list()), scan), name='collector', daemon=True)
+    worker.start()
+    threads.append(worker)
+
+
+def join(timeout: float = None) -> None:
+    """
+        Aguarda as coletas em segundo plano iniciadas por start.
+    """
+
+    while threads:
+        threads.pop(0).join(timeout)
+
+
+def main(argv: list = None) -> int:
+    """
+        Executa a coleta isoladamente, sem depender da execução de testes.
+    """
+
+    parser = argparse.ArgumentParser(description='Drop expired mock datasets.')
+    parser.add_argument('--dry-run', '-d', action='store_true', help='Only list expired mock datasets.')
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        found = expired(Client().list_datasets(label=Governance().dataset_filter()))
+        logger.info(f'Found {len(found)} orphan dataset(s): {", ".join(found)}')
+        return 0
+
+    collect()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
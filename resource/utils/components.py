@@ -4,8 +4,10 @@
 """
 
 
+from datetime import datetime
 from tests.resource.utils import generator as gen
 from tests.resource.utils import validator as val
+from tests.resource.utils import scheduler
 
 
 class Person:
@@ -14,13 +16,14 @@ class Person:
 
         Attributes:
         :base_date: -> Data de referência para adequar a idade ao período.
+        :salt: -> Valor único da execução (run_id) combinado ao Patient Key.
     """
 
-    def __init__(self, base_date: str, tree: dict):
+    def __init__(self, base_date: str, tree: dict, salt: str = ''):
         self.cip = self.cip()
         self.cpf = self.cpf(tree)
         self.birth_date = self.birth_date(base_date, tree)
-        self.key = self.key()
+        self.key = self.key(salt)
         self.gender = self.gender(tree)
         self.idcode = self.idcode(tree)
         self.name = self.name()
@@ -56,14 +59,18 @@ class Person:
 
         return tree.get('birth_date', default)
 
-    def key(self) -> str:
+    def key(self, salt: str = '') -> str:
         """
             Retorna o Patient Key codificado através da junção
             do seu CPF com sua data de nascimento em formato SHA1
             de 40 caracteres.
+
+            Como os dados são reproduzíveis pela semente, o salt da
+            execução mantém o Patient Key único entre execuções que
+            compartilham as mesmas tabelas (ex: dataset default).
         """
         return gen.hashcode(
-            value=f'{self.cpf}{self.birth_date}', 
+            value=f'{self.cpf}{self.birth_date}{salt}', 
             mode='SHA1'
         )
 
@@ -134,7 +141,8 @@ class Interval:
     
     """
         Componente utilizado para calcular diferença entre datas a partir de um 
-        intervalo informado. 
+        intervalo informado. As datas são mantidas em datetime e apenas o
+        resultado final (interval_date) é serializado em string.
     """
     
     def __init__(self, absolute_date: str, relative_date: str = None, diff: str = 'D-0', debit: int = None):
@@ -145,6 +153,7 @@ class Interval:
         self.relative_date = self.relative_date(relative_date)
         self.current_date = self.current_date()
         self.chosen_date = self.chosen_date(diff)
+        self.interval_datetime = self.interval_datetime()
         self.interval_date = self.interval_date()
 
     def diff(self, diff):
@@ -170,32 +179,40 @@ class Interval:
     def debit(self, debit):
         return debit
 
-    def absolute_date(self, absolute_date):
+    def absolute_date(self, absolute_date) -> datetime:
         """
             Retorna o base_date absoluto calculado pelo Mocker
         """
         # Se o base date for absoluto (YYYY-MM-DD)
-        if val.is_date(absolute_date):
-            return val.is_date(absolute_date)
+        found = scheduler.date(absolute_date)
+
+        if found is not None:
+            return found
 
         # Se o base_date for um alias (D-X)
         elif val.is_alias(absolute_date):
-            return gen.alias_date(absolute_date, keep_hms=False)
+            return gen.alias_date(absolute_date, keep_hms=False, string=False)
 
-    def relative_date(self, relative_date):
+    def relative_date(self, relative_date) -> datetime:
         """
             Determina como data relativa a última data gerada do intervalo anterior.
         """     
         # Verifica se na 1ª passagem é pretendido usar a data relativa que virá
         # como None. Neste caso, a data relativa será do mesmo valor que a absoluta.   
         if relative_date:
-            return relative_date
+            if isinstance(relative_date, datetime):
+                return relative_date
+            return scheduler.timestamp(relative_date)
         return self.absolute_date
 
-    def current_date(self):
-        return gen.datetime_from_current()
+    def current_date(self) -> datetime:
+        """
+            Retorna o relógio congelado da execução para aliases relativos
+            a data corrente (**).
+        """
+        return scheduler.clock()
     
-    def chosen_date(self, diff):
+    def chosen_date(self, diff) -> datetime:
         """
             Determina se a data base para cálculo do intervalo deve ser feita
             através da data absoluta ou relativa (data anterior).
@@ -208,11 +225,17 @@ class Interval:
         else:
             return self.absolute_date
 
-    def interval_date(self):
+    def interval_datetime(self) -> datetime:
         """
             Calcula a nova data de acordo com a data inicial pretendida e o intervalo.
         """  
-        return gen.alias_date(alias=self.diff, keep_hms=False, start_date=self.chosen_date, debit=self.debit)
+        return gen.alias_date(alias=self.diff, keep_hms=False, start_date=self.chosen_date, debit=self.debit, string=False)
+
+    def interval_date(self) -> str:
+        """
+            Retorna a nova data serializada em YYYY-MM-DD HH:MM:SS.
+        """
+        return scheduler.serialize(self.interval_datetime)
 
 
 class Base_Date:
@@ -233,8 +256,10 @@ class Base_Date:
             Valida e calcula a data do base_date que será uma constante
         """
         # Se o base date for absoluto (YYYY-MM-DD)
-        if val.is_date(date):
-            return val.is_date(date)
+        found = scheduler.date(date)
+
+        if found is not None:
+            return scheduler.serialize(found)
 
         # Se o base_date for um alias (D-X)
         elif val.is_alias(date):
@@ -14,3 +14,9 @@ def custom_yaml_datetime(loader, node):
         return None
 
 yaml.add_constructor('tag:yaml.org,2002:timestamp', custom_yaml_datetime, Loader=yaml.SafeLoader)
+
+# Loader acelerado em C (libyaml) quando disponível na instalação do PyYAML
+if hasattr(yaml, 'CSafeLoader'):
+    yaml.add_constructor('tag:yaml.org,2002:timestamp', custom_yaml_datetime, Loader=yaml.CSafeLoader)
+
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
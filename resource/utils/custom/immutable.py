@@ -0,0 +1,70 @@
+"""
+    Script com estruturas imutáveis para árvores YAML compartilhadas
+    em cache. Cópias profundas (deepcopy) retornam estruturas comuns
+    e mutáveis para quem precisar alterar os valores.
+"""
+
+from copy import deepcopy
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} is immutable. Use deepcopy to get a mutable copy.')
+
+
+class FrozenDict(dict):
+    """
+        Dicionário somente leitura.
+    """
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __deepcopy__(self, memo):
+        return {key: deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """
+        Lista somente leitura.
+    """
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    extend = _immutable
+    insert = _immutable
+    remove = _immutable
+    pop = _immutable
+    clear = _immutable
+    sort = _immutable
+    reverse = _immutable
+
+    def __deepcopy__(self, memo):
+        return [deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def freeze(value):
+    """
+        Converte recursivamente dicionários e listas de uma árvore
+        em suas versões imutáveis.
+    """
+
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    elif isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
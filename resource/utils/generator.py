@@ -4,7 +4,6 @@
     com suas respectivas regras de criação para evitar informações nulas.
 """
 
-import re
 import uuid
 import string
 import random
@@ -13,6 +12,38 @@ import numpy as np
 from datetime import datetime
 from datetime import timedelta
 from dateutil.relativedelta import relativedelta
+from tests.resource.utils import scheduler
+
+
+class Stream:
+    """
+        Contexto de fontes pseudo-aleatórias compartilhado pelos geradores
+        e componentes. Com uma semente informada, toda a massa de dados
+        gerada a partir dele é reproduzível.
+
+        Attributes:
+        :param: seed -> Semente inteira. Se None, as fontes não são determinísticas.
+    """
+
+    def __init__(self, seed: int = None):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.numpy = np.random.default_rng(seed)
+
+
+stream = Stream()
+
+
+def seed(value: int = None) -> Stream:
+    """
+        Reinicia o contexto pseudo-aleatório dos geradores com a
+        semente informada e retorna o novo contexto.
+    """
+
+    global stream
+    stream = Stream(seed=value)
+    return stream
+
 
 def gender() -> str:
     """
@@ -20,7 +51,7 @@ def gender() -> str:
         M ou F com 50% de chances para cada um.
     """
 
-    return np.random.choice(['M', 'F'], size=1, p=[.5, .5]).item()
+    return stream.numpy.choice(['M', 'F'], size=1, p=[.5, .5]).item()
 
 
 def attendance():
@@ -104,7 +135,7 @@ def idcode(numeric: bool = True, length: int = 0, sep: str = '', min_value = 100
         max_value = (10 ** length) - 1
 
     # Máscara para preservar leading zeros
-    chosen = f'%0{length}d' % random.randint(min_value, max_value)
+    chosen = f'%0{length}d' % stream.random.randint(min_value, max_value)
 
     if not numeric:
         return f'{chosen[:-1]}{sep}{chosen[-1:]}'
@@ -123,7 +154,7 @@ def cpf(formatting: bool = False) -> str:
         source: https://gist.github.com/lucascnr/24c70409908a31ad253f97f9dd4c6b7c
     """
 
-    _cpf = [random.randint(0, 9) for _ in range(9)]
+    _cpf = [stream.random.randint(0, 9) for _ in range(9)]
 
     for _ in range(2):
         val = sum([(len(_cpf) + 1 - i) * v for i, v in enumerate(_cpf)]) % 11
@@ -142,7 +173,7 @@ def uf() -> str:
            'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO',
            'RR', 'SC', 'SP', 'SE', 'TO']
 
-    return random.choice(uf.choices)
+    return stream.random.choice(uf.choices)
 
 
 def crm() -> str:
@@ -154,8 +185,8 @@ def crm() -> str:
     uf()
     choices = uf.choices
 
-    number = '%08d' % random.randint(0, 99999999)
-    _crm = f'CRM-{random.choice(choices)}-{number}'
+    number = '%08d' % stream.random.randint(0, 99999999)
+    _crm = f'CRM-{stream.random.choice(choices)}-{number}'
 
     return _crm
 
@@ -179,7 +210,7 @@ def identifier() -> str:
         Função que gera um identificador único
         utilizando lib built-in uuid na versão 4.
     """
-    return str(uuid.uuid4())
+    return str(uuid.UUID(int=stream.random.getrandbits(128), version=4))
 
 
 def boolean(string: bool = False) -> bool:
@@ -188,7 +219,7 @@ def boolean(string: bool = False) -> bool:
         pseudo-aleatório.
     """
 
-    chosen = random.choice([True, False])
+    chosen = stream.random.choice([True, False])
     return chosen if not string else str(chosen)
 
 
@@ -197,7 +228,7 @@ def choice(variance: list) -> str:
         Função que recebe uma lista e escolhe
         um dos elementos para retorno.
     """
-    return random.choice(variance)
+    return stream.random.choice(variance)
 
 
 def percentual(string: bool = False, decimals: int = 5, max: int = 5) -> float:
@@ -206,7 +237,7 @@ def percentual(string: bool = False, decimals: int = 5, max: int = 5) -> float:
         de casas decimais e o maior valor para geração.
     """
 
-    chosen = random.uniform(0, max)
+    chosen = stream.random.uniform(0, max)
     rounds = round(chosen, decimals)
     return rounds if not string else str(rounds)
 
@@ -218,10 +249,10 @@ def accession_number() -> str:
     """
 
     def digit(digits):
-        return f'%0{digits}d' % random.randint(0, 9)
+        return f'%0{digits}d' % stream.random.randint(0, 9)
 
     def letter():
-        return f'{random.choice(string.ascii_uppercase)}'
+        return f'{stream.random.choice(string.ascii_uppercase)}'
 
     chosen = list()
     chosen.append(digit(3))
@@ -238,9 +269,10 @@ def accession_number() -> str:
     return ''.join(chosen)
 
 
-def alias_date(alias: str, keep_hms=True, start_date: str = None, debit: int = None):
+def alias_date(alias: str, keep_hms=True, start_date: str = None, debit: int = None, string: bool = True):
     """
-        Determina um base_date de acordo com alias estabelecido.
+        Determina um base_date de acordo com alias estabelecido. Sem start_date,
+        o alias é relativo ao relógio congelado da execução.
         Exemplos:
         Y-5 -> base_date será 5 anos atrás a partir de hoje
         M-2 -> base_date será 2 meses atrás a partir de hoje
@@ -249,48 +281,24 @@ def alias_date(alias: str, keep_hms=True, start_date: str = None, debit: int = N
         H-1 -> base_date será 1 hora atrás a partir de hoje
         MIN-35 -> base_date será 35 minutos atrás a partir de hoje
         SEC-12 -> base_date será 12 segundos atrás a partir de hoje
+
+        :param: start_date -> Data inicial em string ou datetime.
+        :param: string -> Se False retorna a data calculada em datetime.
     """
 
     if not start_date:
-        start_date = datetime_from_current(string=False)
-    else:
-        start_date = datetime.strptime(start_date, '%Y-%m-%d %H:%M:%S')
-
-    alias = alias.replace(' ', '')
-    template = re.split("([+-])", alias)
-
-    sched = {
-        'unity': template[0].upper(),
-        'operator': template[1],
-        'interval': int(template[-1])
-    }
-
-    rel = {
-        'Y': relativedelta(years=sched['interval']),
-        'M': relativedelta(months=sched['interval']),
-        'W': relativedelta(weeks=sched['interval']),
-        'D': relativedelta(days=sched['interval']),
-        'H': relativedelta(hours=sched['interval']),
-        'MIN': relativedelta(minutes=sched['interval']),
-        'SEC': relativedelta(seconds=sched['interval'])
-    }
-
-    interval = rel.get(sched['unity'])
-
-    if sched['operator'] == '-':
-        diff = start_date - interval
-    else:
-        diff = start_date + interval
+        start_date = scheduler.clock()
+    elif isinstance(start_date, str):
+        start_date = scheduler.timestamp(start_date)
 
-    if debit:
-        diff = diff - relativedelta(days=debit)
+        if start_date is None:
+            raise ValueError(f'Not a valid start date for alias {alias}')
 
-    to_timestamp = datetime.timestamp(diff)
-    to_datetime = datetime.fromtimestamp(to_timestamp)
+    diff = scheduler.offset(alias).apply(start_date, debit=debit)
 
     if keep_hms:
-        to_datetime = to_datetime.replace(hour=0, minute=0, second=0, microsecond=0)
+        diff = diff.replace(hour=0, minute=0, second=0, microsecond=0)
 
-    final_date = to_datetime.strftime('%Y-%m-%d %H:%M:%S')
-
-    return final_date
+    if string:
+        return scheduler.serialize(diff)
+    return diff
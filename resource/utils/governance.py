@@ -2,6 +2,9 @@
   Mnemonic script GDDL Default Values
 """
 
+import re
+import time
+
 __MNEMONIC_GDDL_DATASET__ = 'ds'
 __MNEMONIC_LIB_IDENTIFIER__ = 'mock'    
 
@@ -20,3 +23,35 @@ class Governance:
     rule = f'{__MNEMONIC_GDDL_DATASET__}_{__MNEMONIC_LIB_IDENTIFIER__}'
     if not dataset.startswith(rule):
         raise Exception(f"""{dataset} is an invalid name. You should start using {rule}""")
+
+  def dataset_labels(cls, owner: str, run_id: str, expiration: int, persist: bool = False) -> dict:
+    """
+      Método que retorna os labels dos datasets de mock: identificação da
+      biblioteca, owner (hostname), run_id, criação, expiração em epoch
+      (segundos) e persistência. Utilizados pelo coletor de datasets órfãos.
+
+      :param: expiration -> Tempo em segundos até o dataset ser considerado órfão.
+      :param: persist -> Dataset mantido com --persist-dataset, nunca coletado.
+    """
+
+    created = int(time.time())
+
+    # Labels aceitam apenas letras minúsculas, números, _ e - (até 63 caracteres)
+    def value(text: str) -> str:
+        return re.sub(r'[^a-z0-9_-]', '-', str(text).lower())[:63]
+
+    return {
+        f'{__MNEMONIC_GDDL_DATASET__}_{__MNEMONIC_LIB_IDENTIFIER__}': 'true',
+        'owner': value(owner),
+        'run_id': value(run_id),
+        'created': str(created),
+        'expires': str(created + expiration),
+        'persist': 'true' if persist else 'false'
+    }
+
+  def dataset_filter(cls) -> str:
+    """
+      Método que retorna o filtro de listagem dos datasets de mock por label.
+    """
+
+    return f'labels.{__MNEMONIC_GDDL_DATASET__}_{__MNEMONIC_LIB_IDENTIFIER__}:true'
@@ -0,0 +1,208 @@
+"""
+    Script responsável por indexar arquivos test.yaml pelos testcases de
+    primeiro nível. O índice guarda o intervalo de bytes de cada testcase
+    para que apenas os blocos selecionados sejam interpretados, mantendo
+    o custo de um testcase independente do tamanho da suite.
+"""
+
+import os
+import re
+import time
+import yaml
+from tests.resource.utils.logger import logger
+from tests.resource.utils.custom import constructor_yaml
+from tests.resource.utils.custom.immutable import freeze
+
+
+# Chave de primeiro nível: linha na coluna 0 que não seja comentário,
+# item de lista, diretiva ou marcador de documento.
+KEY = re.compile(rb'^(?P<key>"[^"\n]*"|\'[^\'\n]*\'|[^\s#\'"\-?:{}\[\],&*!|>%@`][^:#\n]*?)[ \t]*:(?:[ \t]|\r?\n|$)')
+
+# Caches por caminho absoluto: ((mtime, tamanho), valor)
+indexes = dict()
+blocks = dict()
+labels = dict()
+
+
+def _signature(path: str) -> tuple:
+    """
+        Retorna a assinatura do arquivo (data de modificação e tamanho)
+        utilizada para invalidar os caches.
+    """
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Exception(f'Cannot open YAML, SQL ou TXT file for path: {path}')
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _unquote(key: bytes) -> str:
+    """
+        Remove aspas de uma chave YAML.
+    """
+
+    key = key.decode('utf8')
+    if len(key) > 1 and key[0] == key[-1] and key[0] in ('"', "'"):
+        return key[1:-1]
+    return key
+
+
+def index(path: str) -> dict:
+    """
+        Retorna o índice do arquivo: testcase -> (início, fim) em bytes.
+        O índice é reconstruído apenas quando o arquivo for alterado.
+    """
+
+    target = os.path.abspath(path)
+    signature = _signature(target)
+
+    cached = indexes.get(target)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    spans = dict()
+    current = None
+    offset = 0
+
+    with open(target, 'rb') as f:
+        for line in f:
+            found = KEY.match(line)
+
+            if found and not line.startswith((b'---', b'...')):
+                if current is not None:
+                    spans[current[0]] = (current[1], offset)
+                current = (_unquote(found.group('key')), offset)
+
+            offset += len(line)
+
+    if current is not None:
+        spans[current[0]] = (current[1], offset)
+
+    indexes[target] = (signature, spans)
+
+    return spans
+
+
+def testcases(path: str) -> list:
+    """
+        Retorna os IDs de testcases do arquivo sem interpretar o YAML.
+    """
+    return list(index(path).keys())
+
+
+def read(path: str, testcase: str):
+    """
+        Retorna a árvore imutável de um único testcase interpretando apenas
+        o seu intervalo de bytes. Caso o bloco não possa ser interpretado
+        isoladamente (ex: âncoras definidas em outro testcase), o arquivo
+        completo é interpretado.
+
+        Retorna None quando o testcase não existir no arquivo.
+    """
+
+    target = os.path.abspath(path)
+    signature = _signature(target)
+
+    cached = blocks.get((target, testcase))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    span = index(target).get(testcase)
+
+    if span is None:
+        return None
+
+    start = time.perf_counter()
+
+    with open(target, 'rb') as f:
+        f.seek(span[0])
+        content = f.read(span[1] - span[0]).decode('utf8')
+
+    try:
+        loaded = yaml.load(content, Loader=constructor_yaml.Loader)
+        tree = list(loaded.values())[0] if isinstance(loaded, dict) and len(loaded) == 1 else None
+    except yaml.YAMLError:
+        tree = None
+
+    if tree is None:
+        from tests.resource.utils import validator as val
+        tree = val.read_file(dir=target).get(testcase)
+    else:
+        tree = freeze(tree)
+        logger.info(f'Parsed {testcase} in {time.perf_counter() - start:.3f}s')
+
+    blocks[(target, testcase)] = (signature, tree)
+
+    return tree
+
+
+def tags(path: str) -> dict:
+    """
+        Retorna as tags (documentation.tags) de todos os testcases do arquivo
+        percorrendo os eventos do parser, sem construir a árvore completa.
+        O índice é imutável (ver freeze) e compartilhado entre as chamadas.
+    """
+
+    target = os.path.abspath(path)
+    signature = _signature(target)
+
+    cached = labels.get(target)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    found = dict()
+
+    # Pilha de containers abertos: [tipo, chave atual, aguardando chave]
+    stack = list()
+
+    def location() -> tuple:
+        return tuple(entry[1] for entry in stack if entry[0] == 'map')
+
+    with open(target, 'rb') as f:
+        for event in yaml.parse(f, Loader=constructor_yaml.Loader):
+
+            if isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent, yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                parent = stack[-1] if stack else None
+                is_key = parent is not None and parent[0] == 'map' and parent[2]
+
+                if is_key:
+                    parent[1] = event.value if isinstance(event, yaml.ScalarEvent) else None
+                    parent[2] = False
+
+                    if len(stack) == 1 and parent[1] is not None:
+                        found[parent[1]] = list()
+
+                elif isinstance(event, yaml.ScalarEvent):
+                    keys = location()
+
+                    if len(keys) == 3 and keys[1:] == ('documentation', 'tags') and keys[0] in found:
+                        in_sequence = stack[-1][0] == 'seq' and len(stack) == 4
+                        at_key = stack[-1][0] == 'map' and len(stack) == 3
+
+                        if (in_sequence or at_key) and event.value not in ('', '~', 'null'):
+                            found[keys[0]].append(event.value)
+
+                    if parent is not None and parent[0] == 'map':
+                        parent[2] = True
+
+                elif isinstance(event, yaml.AliasEvent):
+                    if parent is not None and parent[0] == 'map':
+                        parent[2] = True
+
+                if isinstance(event, yaml.MappingStartEvent):
+                    stack.append(['map', None, True])
+                elif isinstance(event, yaml.SequenceStartEvent):
+                    stack.append(['seq', None, False])
+
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                stack.pop()
+
+                if stack and stack[-1][0] == 'map':
+                    stack[-1][2] = True
+
+    found = freeze(found)
+    labels[target] = (signature, found)
+
+    return found
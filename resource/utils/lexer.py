@@ -0,0 +1,502 @@
+"""
+    Script responsável por extrair as referências de tabelas de uma query
+    do BigQuery. A query é percorrida uma única vez por um lexer que ignora
+    comentários e literais de texto, reconhecendo referências com ou sem
+    crases, sem project_id, tabelas coringa (*), alvos de MERGE, INSERT e
+    UPDATE e os filtros de _TABLE_SUFFIX.
+    Também separa os statements de um script. Os resultados são mantidos
+    em cache por query.
+"""
+
+import re
+from functools import lru_cache
+
+
+TOKENS = re.compile(r"""
+    (?P<comment>--[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z))
+    |(?P<string>[rRbB]{0,2}(?:'''.*?(?:'''|\Z)|\"\"\".*?(?:\"\"\"|\Z)|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"))
+    |(?P<quoted>`(?:\\.|[^`\\])*`)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_]*(?:-[A-Za-z0-9_]+)*\*?)
+    |(?P<number>[0-9]+(?:\.[0-9]+)?)
+    |(?P<symbol>[.,();=<>!*])
+    |(?P<space>\s+)
+    |(?P<other>.)
+""", re.S | re.X)
+
+# Palavras que encerram uma referência de tabela (não são aliases)
+RESERVED = {
+    'AS', 'ON', 'USING', 'WHERE', 'GROUP', 'ORDER', 'HAVING', 'QUALIFY', 'WINDOW', 'LIMIT',
+    'JOIN', 'INNER', 'LEFT', 'RIGHT', 'FULL', 'CROSS', 'OUTER', 'NATURAL', 'UNION', 'EXCEPT',
+    'INTERSECT', 'SELECT', 'FROM', 'WITH', 'FOR', 'TABLESAMPLE', 'PIVOT', 'UNPIVOT', 'SET',
+    'WHEN', 'THEN', 'AND', 'OR', 'NOT', 'VALUES', 'INTO', 'MATCHED', 'BY', 'UNNEST'
+}
+
+OPERATORS = {'=', '<', '>', '!'}
+
+
+class Token:
+    """
+        Token da query.
+
+        Attributes:
+        :param: kind -> Tipo do token (string, quoted, word, number, symbol ou other).
+        :param: value -> Texto do token.
+        :param: start -> Posição inicial do token na query.
+    """
+
+    __slots__ = ('kind', 'value', 'upper', 'start', 'end')
+
+    def __init__(self, kind: str, value: str, start: int = 0):
+        self.kind = kind
+        self.value = value
+        self.upper = value.upper() if kind == 'word' else value
+        self.start = start
+        self.end = start + len(value)
+
+    def __repr__(self):
+        return f'<Token {self.kind} {self.value}>'
+
+
+class Reference:
+    """
+        Referência de tabela encontrada na query.
+
+        Attributes:
+        :param: parts -> Partes do table_id (project_id, dataset_id, tabela).
+        :param: alias -> Alias informado para a tabela.
+        :param: suffixes -> Valores de _TABLE_SUFFIX filtrados para tabelas coringa.
+        :param: span -> Posições (início, fim) do nome da tabela na query.
+    """
+
+    __slots__ = ('parts', 'alias', 'suffixes', 'span')
+
+    def __init__(self, parts: list, alias: str = None, span: tuple = None):
+        self.parts = tuple(parts)
+        self.alias = alias
+        self.suffixes = set()
+        self.span = span
+
+    @property
+    def table_id(self) -> str:
+        return '.'.join(self.parts)
+
+    @property
+    def table_name(self) -> str:
+        return self.parts[-1]
+
+    @property
+    def location(self) -> str:
+        return '.'.join(self.parts[:-1])
+
+    @property
+    def wildcard(self) -> bool:
+        return self.parts[-1].endswith('*')
+
+    def __repr__(self):
+        return f'<Reference {self.table_id}>'
+
+
+def tokenize(content: str) -> list:
+    """
+        Retorna a lista de tokens da query, sem espaços e comentários.
+    """
+
+    return [
+        Token(match.lastgroup, match.group(), match.start())
+        for match in TOKENS.finditer(content)
+        if match.lastgroup not in ('space', 'comment')
+    ]
+
+
+def _literal(token: Token) -> str:
+    """
+        Retorna o conteúdo de um literal de texto sem prefixo e aspas.
+    """
+
+    value = token.value.lstrip('rRbB')
+    quote = 3 if value[:3] in ("'''", '"""') else 1
+    return value[quote:-quote]
+
+
+def _name(tokens: list, index: int) -> tuple:
+    """
+        Lê um nome composto (partes separadas por ponto, com ou sem crases)
+        a partir de index e retorna as partes e o índice seguinte.
+    """
+
+    parts = list()
+
+    while index < len(tokens) and tokens[index].kind in ('word', 'quoted'):
+        token = tokens[index]
+
+        if token.kind == 'quoted':
+            parts.extend(token.value[1:-1].split('.'))
+        else:
+            parts.append(token.value)
+
+        index += 1
+
+        if index + 1 < len(tokens) and tokens[index].value == '.' and tokens[index + 1].kind in ('word', 'quoted'):
+            index += 1
+        else:
+            break
+
+    return parts, index
+
+
+def _closing(tokens: list, index: int) -> int:
+    """
+        Retorna o índice seguinte ao parêntese que fecha o parêntese em index.
+    """
+
+    depth = 0
+
+    for position in range(index, len(tokens)):
+        if tokens[position].value == '(':
+            depth += 1
+        elif tokens[position].value == ')':
+            depth -= 1
+            if depth == 0:
+                return position + 1
+
+    return len(tokens)
+
+
+def _alias(tokens: list, index: int) -> tuple:
+    """
+        Lê o alias opcional (com ou sem AS) a partir de index e retorna
+        o alias e o índice seguinte.
+    """
+
+    if index < len(tokens) and tokens[index].upper == 'AS':
+        index += 1
+        if index < len(tokens) and tokens[index].kind in ('word', 'quoted'):
+            return tokens[index].value.strip('`'), index + 1
+        return None, index
+
+    if index < len(tokens) and tokens[index].kind in ('word', 'quoted') and tokens[index].upper not in RESERVED:
+        return tokens[index].value.strip('`'), index + 1
+
+    return None, index
+
+
+def _ctes(tokens: list) -> set:
+    """
+        Retorna os nomes das CTEs declaradas (WITH nome AS (...), nome AS (...))
+        e das tabelas temporárias de scripts (CREATE TEMP TABLE nome).
+    """
+
+    names = set()
+
+    for index in range(1, len(tokens) - 2):
+        if tokens[index].kind in ('word', 'quoted') and tokens[index + 1].upper == 'AS' and tokens[index + 2].value == '(':
+            if tokens[index - 1].upper in ('WITH', 'RECURSIVE') or tokens[index - 1].value == ',':
+                names.add(tokens[index].value.strip('`').lower())
+
+    for index in range(2, len(tokens)):
+        if tokens[index - 1].upper == 'TABLE' and tokens[index - 2].upper in ('TEMP', 'TEMPORARY'):
+            if tokens[index].kind in ('word', 'quoted'):
+                names.add(tokens[index].value.strip('`').lower())
+
+    return names
+
+
+def _suffixes(tokens: list, references: list) -> None:
+    """
+        Atribui às tabelas coringa os valores literais comparados com
+        _TABLE_SUFFIX (=, >=, <=, IN e BETWEEN). Filtros qualificados por
+        alias se aplicam apenas à tabela do alias.
+    """
+
+    wildcards = [reference for reference in references if reference.wildcard]
+
+    if not wildcards:
+        return
+
+    for index, token in enumerate(tokens):
+
+        if token.upper != '_TABLE_SUFFIX':
+            continue
+
+        targets = wildcards
+
+        if index >= 2 and tokens[index - 1].value == '.' and tokens[index - 2].kind in ('word', 'quoted'):
+            alias = tokens[index - 2].value.strip('`').lower()
+            targets = [x for x in wildcards if x.alias and x.alias.lower() == alias] or wildcards
+
+        values = list()
+        position = index + 1
+
+        while position < len(tokens) and tokens[position].value in OPERATORS:
+            position += 1
+
+        if position < len(tokens):
+            if tokens[position].kind == 'string' and position > index + 1:
+                values.append(_literal(tokens[position]))
+
+            elif tokens[position].upper == 'IN' and position + 1 < len(tokens) and tokens[position + 1].value == '(':
+                end = _closing(tokens, position + 1)
+                values.extend(_literal(x) for x in tokens[position + 2:end - 1] if x.kind == 'string')
+
+            elif tokens[position].upper == 'BETWEEN':
+                values.extend(_literal(x) for x in tokens[position + 1:position + 4] if x.kind == 'string')
+
+        for reference in targets:
+            reference.suffixes.update(values)
+
+
+@lru_cache(maxsize=256)
+def statements(content: str) -> tuple:
+    """
+        Retorna os statements da query separados por ponto e vírgula,
+        ignorando os que estiverem em comentários e literais de texto.
+        Statements vazios (ex: ; final) não são retornados.
+
+        :param: content -> Query a ser analisada.
+    """
+
+    found = list()
+    start = 0
+    filled = False
+
+    for match in TOKENS.finditer(content):
+
+        if match.lastgroup in ('space', 'comment'):
+            continue
+
+        if match.group() == ';':
+            if filled:
+                found.append(content[start:match.start()].strip())
+            start = match.end()
+            filled = False
+        else:
+            filled = True
+
+    if filled:
+        found.append(content[start:].strip())
+
+    return tuple(found)
+
+
+def _register(tokens: list, index: int, parts: list, position: int, alias: str, state: tuple) -> None:
+    """
+        Registra a referência candidata do nome lido entre index e position,
+        exceto CTEs e INFORMATION_SCHEMA. Colunas de aliases (junções
+        implícitas) são descartadas ao final do statement (ver _statement).
+
+        :param: state -> Tupla (referências encontradas, aliases, CTEs).
+    """
+
+    found, aliases, ctes = state
+    first = parts[0].lower()
+
+    if len(parts) == 1 and first in ctes:
+        pass
+    elif 'INFORMATION_SCHEMA' in (part.upper() for part in parts):
+        pass
+    else:
+        found.append(Reference(parts=parts, alias=alias, span=(tokens[index].start, tokens[position - 1].end)))
+
+    if alias:
+        aliases.add(alias.lower())
+
+
+def _sources(tokens: list, index: int, state: tuple) -> tuple:
+    """
+        Lê a lista de fontes (separadas por vírgula) de um FROM ou JOIN a
+        partir de index. Retorna o índice seguinte e se a leitura parou em
+        um parêntese (subquery ou junção entre parênteses), cuja lista
+        continua após o parêntese (ver _nested).
+    """
+
+    aliases = state[1]
+
+    while index < len(tokens):
+
+        # Subquery: a leitura continua dentro dos parênteses
+        if tokens[index].value == '(':
+            return index, True
+
+        parts, position = _name(tokens, index)
+
+        if not parts:
+            break
+
+        # UNNEST e funções de tabela
+        if position < len(tokens) and tokens[position].value == '(':
+            position = _closing(tokens, position)
+            alias, position = _alias(tokens, position)
+            if alias:
+                aliases.add(alias.lower())
+
+        else:
+            end = position
+            alias, position = _alias(tokens, position)
+            _register(tokens, index, parts, end, alias, state)
+
+        index = position
+
+        if index < len(tokens) and tokens[index].value == ',':
+            index += 1
+            continue
+        break
+
+    return index, False
+
+
+def _target(tokens: list, index: int, state: tuple) -> int:
+    """
+        Lê a tabela alvo de MERGE, INSERT INTO, UPDATE ou a fonte de USING
+        do MERGE a partir de index. Ações das cláusulas WHEN do MERGE
+        (ex: UPDATE SET, INSERT ROW, INSERT (colunas)) não são tabelas.
+    """
+
+    if index >= len(tokens) or tokens[index].upper in RESERVED or tokens[index].upper == 'ROW':
+        return index
+
+    parts, position = _name(tokens, index)
+
+    if not parts:
+        return index
+
+    end = position
+    alias, position = _alias(tokens, position)
+    _register(tokens, index, parts, end, alias, state)
+
+    return position
+
+
+def _nested(tokens: list, index: int, state: tuple, levels: list, lists: list) -> int:
+    """
+        Abre o nível do parêntese em index, lido por _sources. Em junções
+        entre parênteses (ex: FROM (a JOIN b ON ...)), a primeira fonte é
+        lida como uma lista de fontes. Retorna o índice seguinte.
+    """
+
+    nested = True
+
+    while nested:
+        levels.append(False)
+        lists.append(True)
+        index += 1
+
+        if index >= len(tokens) or tokens[index].upper in ('SELECT', 'WITH'):
+            break
+
+        index, nested = _sources(tokens, index, state)
+
+    return index
+
+
+def _statement(tokens: list, ctes: set) -> list:
+    """
+        Retorna as referências de tabelas de um statement. Nomes compostos
+        iniciados por um alias do statement (ex: t.items) são arrays do
+        alias (junções implícitas), inclusive em subqueries correlacionadas
+        declaradas antes do alias, e são descartados ao final.
+    """
+
+    found = list()
+    state = (found, set(ctes), ctes)
+
+    # Indica, por nível de parênteses, se há um SELECT no nível (FROM de tabela)
+    # ou não (ex: EXTRACT(DAY FROM date))
+    levels = [True]
+
+    # Indica, por nível de parênteses, se o parêntese é uma subquery de uma
+    # lista de fontes, que continua após o parêntese (ex: FROM (...) x, y)
+    lists = [False]
+    index = 0
+
+    while index < len(tokens):
+        token = tokens[index]
+
+        if token.value == '(':
+            levels.append(False)
+            lists.append(False)
+            index += 1
+            continue
+
+        if token.value == ')':
+            listed = lists[-1]
+
+            if len(levels) > 1:
+                levels.pop()
+                lists.pop()
+            index += 1
+
+            if listed:
+                alias, index = _alias(tokens, index)
+                if alias:
+                    state[1].add(alias.lower())
+
+                if index < len(tokens) and tokens[index].value == ',':
+                    index, nested = _sources(tokens, index + 1, state)
+                    if nested:
+                        index = _nested(tokens, index, state, levels, lists)
+
+            # Alias de subquery
+            elif index < len(tokens) and tokens[index].upper == 'AS' and index + 1 < len(tokens):
+                state[1].add(tokens[index + 1].value.strip('`').lower())
+            continue
+
+        if token.upper == 'SELECT':
+            levels[-1] = True
+
+        following = tokens[index + 1].upper if index + 1 < len(tokens) else None
+
+        if token.upper in ('MERGE', 'INSERT') and following == 'INTO':
+            index += 1
+            continue
+
+        if token.upper in ('MERGE', 'INSERT', 'INTO', 'UPDATE', 'USING'):
+            index = _target(tokens, index + 1, state)
+            continue
+
+        # IS [NOT] DISTINCT FROM compara valores, não lê tabelas
+        previous = tokens[index - 1].upper if index > 0 else None
+
+        if not (token.upper == 'JOIN' or (token.upper == 'FROM' and levels[-1] and previous != 'DISTINCT')):
+            index += 1
+            continue
+
+        index, nested = _sources(tokens, index + 1, state)
+
+        if nested:
+            index = _nested(tokens, index, state, levels, lists)
+
+    aliases = state[1]
+
+    return [
+        reference for reference in found
+        if len(reference.parts) == 1 or reference.parts[0].lower() not in aliases - {(reference.alias or '').lower()}
+    ]
+
+
+@lru_cache(maxsize=256)
+def references(content: str) -> tuple:
+    """
+        Retorna as referências de tabelas da query (após FROM, JOIN e listas
+        separadas por vírgula, inclusive após subqueries e em junções entre
+        parênteses, e alvos de MERGE, INSERT, UPDATE e USING), ignorando
+        subqueries, UNNEST, funções de tabela, CTEs, arrays de aliases
+        (junções implícitas), IS DISTINCT FROM e INFORMATION_SCHEMA.
+        Os aliases valem por statement do script.
+
+        :param: content -> Query a ser analisada.
+    """
+
+    tokens = tokenize(content)
+    ctes = _ctes(tokens)
+    found = list()
+    start = 0
+
+    for index, token in enumerate(tokens):
+        if token.value == ';':
+            found.extend(_statement(tokens[start:index], ctes))
+            start = index + 1
+
+    found.extend(_statement(tokens[start:], ctes))
+    _suffixes(tokens, found)
+
+    return tuple(found)
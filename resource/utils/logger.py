@@ -1,19 +1,120 @@
 """
     Script para instanciar uma variável de escopo global na padronização
     de log ao executar rotina para criação de Data Mock.
+
+    Os registros são enfileirados sem bloqueio (QueueHandler) e escritos
+    por uma thread em segundo plano (QueueListener), em texto ou em JSON
+    lines (ver configure). Cada registro recebe o contexto ligado à thread
+    ou worker atual por bind: run_id, suite, testcase, fase e tempo
+    decorrido desde o início do testcase.
 """
 
+import json
+import time
+import atexit
 import logging
+from queue import Queue
+from contextvars import ContextVar
+from logging.handlers import QueueHandler
+from logging.handlers import QueueListener
+from tests.resource.helpers import params
+
+
+FORMAT = '[{levelname:^8s}] - {asctime} - {message}'
+DATEFMT = '%Y-%m-%d %H:%M:%S'
+
+# Campos de contexto dos registros
+FIELDS = ('run_id', 'suite', 'testcase', 'phase', 'elapsed')
+
+# Contexto da thread ou worker atual (ver bind)
+context = ContextVar('context', default=dict())
+
+
+class Context(logging.Filter):
+    """
+        Filtro que adiciona aos registros os campos de contexto (FIELDS).
+        Executado na thread que emite o registro, antes do enfileiramento.
+    """
+
+    def filter(self, record) -> bool:
+        current = context.get()
+        started = current.get('started')
+
+        record.run_id = current.get('run_id') or (params.__HELPER__.run_id if params.__HELPER__ else None)
+        record.suite = current.get('suite')
+        record.testcase = current.get('testcase')
+        record.phase = current.get('phase')
+        record.elapsed = round(time.perf_counter() - started, 3) if started is not None else None
+
+        return True
+
+
+class Json(logging.Formatter):
+    """
+        Formatador de JSON lines com os campos de contexto.
+    """
+
+    def format(self, record) -> str:
+        payload = {
+            'time': self.formatTime(record, DATEFMT),
+            'level': record.levelname,
+            'message': record.getMessage()
+        }
+
+        payload.update({field: getattr(record, field, None) for field in FIELDS})
+
+        return json.dumps(payload, default=str)
+
+
+def bind(**fields) -> None:
+    """
+        Liga campos ao contexto da thread ou worker atual, mantendo os já
+        ligados. started (time.perf_counter) é a referência do elapsed.
+
+        Exemplo: bind(suite='MySuite', testcase='ACT_001', phase='setup', started=time.perf_counter())
+    """
+
+    context.set({**context.get(), **fields})
+
+
+def unbind() -> None:
+    """
+        Remove os campos ligados ao contexto da thread ou worker atual.
+    """
+
+    context.set(dict())
+
+
+def configure(json_lines: bool = False) -> None:
+    """
+        Define o formato de saída do log: texto (default) ou JSON lines
+        com os campos de contexto.
+    """
+
+    stream.setFormatter(Json() if json_lines else logging.Formatter(FORMAT, datefmt=DATEFMT, style='{'))
+
+
+stream = logging.StreamHandler()
+records = Queue(-1)
+handler = QueueHandler(records)
+handler.setFormatter(logging.Formatter('%(message)s'))
+handler.addFilter(Context())
+listener = QueueListener(records, stream)
 
 logger = logging
 
 try:
+    configure()
+
     logger.basicConfig(
-        format='[{levelname:^8s}] - {asctime} - {message}', 
         level=logging.INFO,
-        datefmt='%Y-%m-%d %H:%M:%S',
-        style='{'
+        handlers=[handler]
     )
 
 except:
-    raise Exception('Not a valid logger settings')
\ No newline at end of file
+    raise Exception('Not a valid logger settings')
+
+listener.start()
+
+# Escreve os registros pendentes ao encerrar o processo
+atexit.register(listener.stop)
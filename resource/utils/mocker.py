@@ -5,12 +5,31 @@
 """
 
 from __future__ import annotations
+import inspect
 import pandas as pd
 from copy import deepcopy
 from tests.resource.entities import mockups
+from tests.resource.helpers import params
+from tests.resource.utils import cache
+from tests.resource.utils import scheduler
+from tests.resource.utils import indexer
 from tests.resource.utils import components
+from tests.resource.utils import vectorized
+from tests.resource.utils import generator as gen
 from tests.resource.utils.logger import logger
 from tests.resource.utils import validator as val
+from tests.resource.utils.custom import immutable
+from tests.resource.utils.custom import constructor_yaml
+
+
+# Chaves de um evento que não são tratadas como alias de data
+IGNORED = ('parents', 'interval', 'count', 'step', 'generate')
+
+# Módulos cujo código influencia a construção e o cache dos Data Mocks
+SOURCES = (
+    params, cache, scheduler, indexer, components, vectorized,
+    gen, val, immutable, constructor_yaml
+)
 
 
 class Mocker:
@@ -23,17 +42,21 @@ class Mocker:
         self.suite = suite
         self.testcase = testcase
         self.yaml = self._yaml(path)
+        self.seed = self._seed()
         self.trees = dict()
+        self.bulks = dict()
         self.last_date = None
         self.last_inherance = 0
         self.settings = self._settings()
+        self.timeline = self._timeline()
         self.person = self._person()
         self.key = self._key()
         self.documentation = self._documentation()
         self.unittests = self._unittests()
         self.titles = self._titles()
         self.identifiers = self._identifiers()
-        self.events = self._events()
+        self.digest = self._digest()
+        self.events = self._load()
 
     def _yaml(self, path: str) -> dict:
         """
@@ -42,9 +65,34 @@ class Mocker:
         """
 
         location = path.replace('test.py', 'test.yaml')
-        target = val.read_file(dir=location)
 
-        return target[self.testcase] 
+        # Interpreta apenas o bloco do testcase pelo índice do arquivo
+        target = indexer.read(path=location, testcase=self.testcase)
+
+        if target is None:
+            raise Exception(f'Testcase {self.testcase} not found in {location}.')
+
+        # Cópia mutável da árvore compartilhada em cache
+        return deepcopy(target)
+
+    def _seed(self) -> int:
+        """
+            Determina a semente do testcase e reinicia o contexto pseudo-aleatório
+            dos geradores. Por padrão a semente é derivada do nome da suite e do
+            testcase, podendo ser sobrescrita por seed em settings.
+        """
+
+        seed = self.yaml.get('settings', dict()).get('seed')
+
+        if seed is None:
+            seed = int(gen.hashcode(value=f'{self.suite}.{self.testcase}', mode='SHA1')[:8], 16)
+
+        elif not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+            raise Exception(f'Seed should be a non-negative integer. Got: {seed}.')
+
+        gen.seed(seed)
+
+        return seed
 
     def _mockups(self, target:str) -> str:
         """
@@ -90,6 +138,28 @@ class Mocker:
         
         return tree
 
+    def _timeline(self) -> list:
+        """
+            Resolve as datas de todos os eventos do testcase em uma única
+            passagem contra o relógio congelado da execução.
+        """
+
+        events = list()
+
+        for event in self.yaml['mockup']:
+            tree = list(event.values())[0]
+            aliases = tuple(value for key, value in tree.items()
+                            if key not in IGNORED and isinstance(value, str) and val.is_interval_alias(value))
+            events.append((aliases, str(tree.get('interval'))))
+
+        timeline = scheduler.timeline(
+            base_date=self.settings.get('base_date'),
+            events=tuple(events),
+            clock=scheduler.clock()
+        )
+
+        return timeline.moments
+
     def _person(self) -> components.Person:
         """
             Verifica se o testcase possui valores globais obrigatórios
@@ -98,7 +168,8 @@ class Mocker:
         # Retorna a instância de um novo paciente
         return components.Person(
             base_date=self.settings.get('base_date'),
-            tree=self.yaml.get('person', dict())
+            tree=self.yaml.get('person', dict()),
+            salt=params.__HELPER__.run_id if params.__HELPER__ else ''
         )
 
     def _documentation(self) -> str:
@@ -118,15 +189,15 @@ class Mocker:
 
         return self.yaml['unittests']
 
-    def _tree(self, event) -> dict:
+    def _tree(self, event, index: int) -> dict:
         """
-            Atualiza o intervalo de datas entre eventos e recicla
+            Atribui as datas resolvidas pela linha do tempo ao evento e recicla
             eventos já instanciados por suas chamadas em títulos.
         """
 
-        # Obtém os parâmetros do evento recebido.
+        # Obtém os parâmetros do evento recebido e suas datas resolvidas.
         tree = list(event.values())[0]
-        diffs = dict()
+        moment = self.timeline[index]
         
         # Procura para cada parâmetro do evento, ocorrências de listas
         for key, value in tree.items():
@@ -136,9 +207,9 @@ class Mocker:
 
                 # Para cada elemento na lista, se o seu nome corresponder a
                 # uma instância então é feito a troca.
-                for index, element in enumerate(value):
+                for position, element in enumerate(value):
                     if any(_key.startswith(element) for _key in self.trees.keys()):
-                        value[index] = next((self.trees[_key] for _key in self.trees if _key.startswith(element)), None)
+                        value[position] = next((self.trees[_key] for _key in self.trees if _key.startswith(element)), None)
 
             # Sobrescreve o valor de um grupo referenciado por outra instância acesso via padrão instance.value
             elif any(_key.startswith(str(value).split('.')[0])  for _key in self.trees.keys()) and key != 'parents' and value != '':
@@ -146,24 +217,75 @@ class Mocker:
                 instancied = next((self.trees[_key] for _key in self.trees if _key.startswith(str(value).split('.')[0])), None)
                 tree[key] = instancied.get(str(value).split('.')[-1])
 
-            if isinstance(value, str) and val.is_interval_alias(value) and key != 'parents' and key != 'interval':
-                tree[key] = components.Interval(absolute_date=self.settings.get('base_date'), relative_date=self.last_date, diff=value).interval_date
-                diffs[value] = tree.get(key)
-
-        if diffs:
-            recent = max(diffs, key=diffs.get)
-            intern_date = components.Interval(absolute_date=self.settings.get('base_date'), relative_date=self.last_date, diff=str(recent))
-            tree['interval2'] = intern_date.interval_date
-            tree['interval'] = self.settings.get('base_date'), self.last_date, str(recent)       
-            self.last_date = diffs.get(recent)
-        else:
-            intern_date = components.Interval(absolute_date=self.settings.get('base_date'), relative_date=self.last_date, diff=str(tree.get('interval')))
-            tree['interval2'] = intern_date.interval_date
-            tree['interval'] = self.settings.get('base_date'), self.last_date, str(tree.get('interval'))
-            self.last_date = tree.get('interval2')
+            if isinstance(value, str) and val.is_interval_alias(value) and key not in IGNORED:
+                tree[key] = moment['dates'][value]
+
+        tree['interval2'] = moment['interval2']
+        tree['interval'] = moment['interval']
+        self.last_date = moment['interval2']
 
         return tree
 
+    def _directive(self, event: dict) -> dict:
+        """
+            Remove do evento as diretivas de geração em lote (count, step e
+            generate) para que não sejam tratadas como colunas do mock.
+        """
+
+        tree = list(event.values())[0]
+        directive = dict()
+
+        for key in ('count', 'step', 'generate'):
+            if key in tree:
+                directive[key] = tree.pop(key)
+
+        if not directive:
+            return directive
+
+        count = directive.get('count')
+
+        if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+            raise Exception(f'Mockup count should be a positive integer. Got: {count}.')
+
+        step = directive.get('step')
+
+        if step is not None and not val.is_interval_alias(str(step)):
+            raise Exception(f'Not a valid step interval: {step}')
+
+        return directive
+
+    def _bulk(self, mirror: dict, directive: dict, dates: set) -> pd.DataFrame:
+        """
+            Expande a instância de um evento para o total de linhas da
+            diretiva count, montando cada coluna de uma só vez.
+
+            - Colunas em generate são preenchidas pelo gerador vetorizado
+            informado ou por uma escolha entre os valores de uma lista.
+            - Colunas de data do evento são deslocadas a cada linha pelo step.
+            - Demais colunas repetem o valor da instância.
+        """
+
+        size = directive.get('count')
+        step = directive.get('step')
+        generate = directive.get('generate') or dict()
+        columns = dict()
+
+        for column, value in mirror.items():
+            if isinstance(value, str) and value in dates and step:
+                columns[column] = vectorized.date_offset(start=value, alias=str(step), size=size)
+            else:
+                columns[column] = [value] * size
+
+        for column, generator in generate.items():
+            if isinstance(generator, list):
+                columns[column] = vectorized.choice(generator, size=size)
+            elif generator in vectorized.generators:
+                columns[column] = vectorized.generators[generator](size=size)
+            else:
+                raise Exception(f'Not a valid generator for {column}: {generator}')
+
+        return pd.DataFrame(columns)
+
     def _options(self, alias: str, mirror: dict, forbidden: bool = True) -> dict:
         """
             Função que realiza o replace de valores-_key do 
@@ -232,9 +354,16 @@ class Mocker:
             # Obtém o nome do título do evento atual
             title = list(event.keys())[0]
             
+            # Separa as diretivas de geração em lote do agrupamento
+            event = deepcopy(event)
+            directive = self._directive(event)
+
             # Verifica seu agrupamento substituindo nome de outros agrupamentos
             # por suas respectivas instâncias.
-            tree = self._tree(event=deepcopy(event))
+            tree = self._tree(event=event, index=index)
+
+            # Datas do evento que serão deslocadas em caso de geração em lote
+            dates = set(self.timeline[index]['dates'].values()) | {tree.get('interval2')}
 
             # Determina o identificador adequado para instância
             table_name = title.split('.')[-1]
@@ -261,6 +390,9 @@ class Mocker:
                         #self.trees[f'{title}.__parent__{index + 1}'] = mirror
                         self.trees[f"row_parent_{self.last_inherance}.{table_name}"] = mirror
 
+                        if directive:
+                            self.bulks[f"row_parent_{self.last_inherance}.{table_name}"] = self._bulk(mirror, directive, dates)
+
             
             # Cria a instância de um evento atual sem herança requerida.
             else:
@@ -272,7 +404,13 @@ class Mocker:
                 #self.last_date = mock.tree.get('interval2')
                 self.trees[f"row_{index + 1}.{table_name}"] = mirror
 
-            logger.info(f'Mocked {table_name}')
+                if directive:
+                    self.bulks[f"row_{index + 1}.{table_name}"] = self._bulk(mirror, directive, dates)
+
+            if directive:
+                logger.info(f'Mocked {directive.get("count")} row(s) for {table_name}')
+            else:
+                logger.info(f'Mocked {table_name}')
 
         # Preenche um dicionário onde todas as entidades únicas são _keys
         group_entities = dict()
@@ -280,21 +418,84 @@ class Mocker:
             group_entities[identifier] = list()
             
         # Une todas as entidades que são do mesmo tipo para o mesmo valor de _key
-        for key, value in self.trees.items():
+        for key in self.trees.keys():
             for entitie_key in group_entities:
                 if key.split('.')[-1] == entitie_key:
-                    group_entities[entitie_key].append(value)
+                    group_entities[entitie_key].append(key)
 
-        # Realiza a concatenação de dataframes para cada lista como valor nas _keys
-        for entitie, dataframes in group_entities.items():
+        # Realiza a concatenação de dataframes para cada lista como valor nas _keys.
+        # Linhas individuais são agrupadas em um único dataframe e eventos em lote
+        # entram com o dataframe já montado, preservando a ordem dos eventos.
+        for entitie, keys in group_entities.items():
             mocked = None
-            if dataframes:
-                mount = pd.DataFrame(dataframes)
+            if keys:
+                dataframes = list()
+                rows = list()
+
+                for key in keys:
+                    if key in self.bulks:
+                        if rows:
+                            dataframes.append(pd.DataFrame(rows))
+                            rows = list()
+                        dataframes.append(self.bulks[key])
+                    else:
+                        rows.append(self.trees[key])
+
+                if rows:
+                    dataframes.append(pd.DataFrame(rows))
+
+                mount = pd.concat(dataframes, ignore_index=True)
                 mocked = mount.convert_dtypes()
             group_entities[entitie] = mocked
 
         return group_entities
 
+    def _digest(self) -> str:
+        """
+            Retorna a chave do cache em disco do testcase, calculada pelo bloco
+            YAML (com base_date resolvido), pelo código dos módulos utilizados
+            na construção (ver SOURCES) e das entidades utilizadas e pela
+            semente. Aliases relativos a data corrente (**) também
+            consideram o relógio da execução.
+        """
+
+        block = {
+            'testcase': self.yaml,
+            'clock': scheduler.clock() if '**' in str(self.yaml.get('mockup')) else None
+        }
+
+        sources = [__file__] + [module.__file__ for module in SOURCES]
+
+        for identifier in self.identifiers:
+            sources.append(inspect.getsourcefile(self._mockups(identifier)))
+
+        return cache.digest(block=block, sources=sources, seed=self.seed)
+
+    def _load(self) -> dict:
+        """
+            Obtém os eventos do cache em disco quando disponível. Caso contrário,
+            ou com --rebuild-mocks, constrói os eventos e atualiza o cache.
+            O cache é utilizado apenas em ambiente local.
+        """
+
+        helper = params.__HELPER__
+        local = helper is not None and helper.local
+
+        if local and not helper.rebuild:
+            # O Patient Key do cache é de outra execução e é substituído pelo atual
+            events = cache.load(self.digest, token=self.person.key)
+
+            if events is not None:
+                logger.info(f'Loaded Data Mock from cache {self.digest[:12]}')
+                return events
+
+        events = self._events()
+
+        if local:
+            cache.save(self.digest, events, token=self.person.key)
+
+        return events
+
     def _key(self) -> str:
         """
             Retorna o person key da instância gerada para o teste.
@@ -0,0 +1,182 @@
+"""
+    Script responsável pelo modo --profile. Cada classe de teste (setUpClass,
+    asserções e tearDownClass) é executada sob o cProfile e o tempo total é
+    separado em CPU, espera por jobs do BigQuery e demais esperas. Ao final
+    da execução um relatório único das funções mais custosas é montado a
+    partir dos perfis de todos os testcases.
+"""
+
+import os
+import time
+import json
+import pstats
+import threading
+import cProfile
+from io import StringIO
+from contextlib import contextmanager
+from tests.resource.utils import validator as val
+from tests.resource.utils.logger import logger
+
+
+PATH = './tests/tmp/profiles'
+
+# Perfil do testcase em execução e resumos dos testcases finalizados
+active = None
+summaries = list()
+
+
+class Profile:
+    """
+        Perfil de execução de um testcase.
+
+        Attributes:
+        :param: suite -> Nome da suite.
+        :param: testcase -> Nome do testcase.
+    """
+
+    def __init__(self, suite: str, testcase: str):
+        self.suite = suite
+        self.testcase = testcase
+        self.profiler = cProfile.Profile()
+        self.waits = dict()
+        self.wall = None
+        self.cpu = None
+
+    def start(self) -> None:
+        """
+            Inicia a contagem de tempo e o cProfile.
+        """
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.profiler.enable()
+
+    def stop(self) -> dict:
+        """
+            Encerra o cProfile, grava o arquivo .prof do testcase e
+            retorna o resumo dos tempos em segundos.
+        """
+
+        self.profiler.disable()
+
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        bigquery = sum(self.waits.values())
+
+        folder = f'{PATH}/{self.suite}'
+        val.get_dir(path=folder)
+        target = f'{folder}/{self.testcase}.prof'
+        self.profiler.dump_stats(target)
+
+        return {
+            'suite': self.suite,
+            'testcase': self.testcase,
+            'wall': wall,
+            'cpu': cpu,
+            'bigquery': bigquery,
+            'other': max(wall - cpu - bigquery, 0.0),
+            'waits': dict(self.waits),
+            'file': target
+        }
+
+
+def start(suite: str, testcase: str) -> None:
+    """
+        Inicia o perfil de um testcase. Um perfil ainda ativo (ex: falha
+        anterior no setUpClass) é encerrado antes.
+    """
+    global active
+
+    if active is not None:
+        stop()
+
+    active = Profile(suite=suite, testcase=testcase)
+    active.start()
+
+
+def stop() -> None:
+    """
+        Encerra o perfil do testcase em execução e informa o resumo dos tempos.
+    """
+    global active
+
+    if active is None:
+        return
+
+    summary = active.stop()
+    active = None
+    summaries.append(summary)
+
+    val.write_file(
+        content=json.dumps(summary, indent=2),
+        file=summary['testcase'],
+        ext='json',
+        path=f"{PATH}/{summary['suite']}"
+    )
+
+    logger.info(
+        f"Profiled {summary['testcase']}: wall {summary['wall']:.3f}s, cpu {summary['cpu']:.3f}s, "
+        f"BigQuery {summary['bigquery']:.3f}s, other {summary['other']:.3f}s"
+    )
+
+
+@contextmanager
+def blocked(operation: str):
+    """
+        Contabiliza no perfil ativo o tempo bloqueado aguardando o BigQuery
+        (jobs, páginas de resultado e chamadas de DDL).
+
+        Chamadas de outras threads (ex: collector) não são contabilizadas.
+
+        :param: operation -> Nome da operação do Client.
+    """
+
+    if active is None or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    profile = active
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        profile.waits[operation] = profile.waits.get(operation, 0.0) + time.perf_counter() - start
+
+
+def report(top: int = 20) -> str:
+    """
+        Une os perfis dos testcases executados, grava e retorna o relatório
+        com os tempos por testcase e as top funções por tempo próprio.
+
+        :param: top -> Total de funções listadas no relatório.
+    """
+
+    stop()
+
+    if not summaries:
+        return ''
+
+    stream = StringIO()
+
+    stream.write(f"{'testcase':<40s} {'wall':>10s} {'cpu':>10s} {'bigquery':>10s} {'other':>10s}\n")
+
+    for summary in summaries:
+        stream.write(
+            f"{summary['suite'] + '.' + summary['testcase']:<40s} {summary['wall']:>10.3f} "
+            f"{summary['cpu']:>10.3f} {summary['bigquery']:>10.3f} {summary['other']:>10.3f}\n"
+        )
+
+    stream.write(
+        f"{'TOTAL':<40s} {sum(x['wall'] for x in summaries):>10.3f} {sum(x['cpu'] for x in summaries):>10.3f} "
+        f"{sum(x['bigquery'] for x in summaries):>10.3f} {sum(x['other'] for x in summaries):>10.3f}\n\n"
+    )
+
+    stats = pstats.Stats(*[x['file'] for x in summaries if os.path.exists(x['file'])], stream=stream)
+    stats.strip_dirs().sort_stats('tottime').print_stats(top)
+
+    content = stream.getvalue()
+
+    val.write_file(content=content, file='report', ext='txt', path=PATH)
+    logger.info(f'Saved profile report at {PATH}/report.txt\n{content}')
+
+    return content
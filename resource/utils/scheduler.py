@@ -0,0 +1,300 @@
+"""
+    Script responsável por compilar os aliases de data (ver Scheduler no README)
+    em deslocamentos reutilizáveis. Cada alias é interpretado uma única vez e
+    as datas são mantidas em datetime até a serialização final em string.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from dateutil.relativedelta import relativedelta
+from tests.resource.helpers import params
+
+
+PATTERN = '%Y-%m-%d %H:%M:%S'
+
+ALIAS = re.compile(r'^((Y|M|W|D|H|SEC|MIN)[+-][0-9]+)+$')
+TERM = re.compile(r'(SEC|MIN|Y|M|W|D|H)([+-])([0-9]+)')
+POSITIVE = re.compile(r'^[\d]+$')
+NEGATIVE = re.compile(r'^-[\d]+$')
+INTERVAL = re.compile(r'[^\w+-]')
+
+UNITS = {
+    'Y': 'years',
+    'M': 'months',
+    'W': 'weeks',
+    'D': 'days',
+    'H': 'hours',
+    'MIN': 'minutes',
+    'SEC': 'seconds'
+}
+
+
+class Offset:
+    """
+        Deslocamento compilado a partir de um alias de intervalo.
+
+        Attributes:
+        :param: alias -> Alias informado, podendo conter asteriscos e espaços.
+        Exemplos: D+1, H-3 *, M+1 **
+    """
+
+    def __init__(self, alias: str):
+        self.alias = alias
+        self.anchor = self._anchor(alias)
+        self.delta = self._delta(alias)
+
+    def _anchor(self, alias: str) -> int:
+        """
+            Retorna a referência do deslocamento pela quantidade de asteriscos:
+
+            - 0 -> Relativo ao base_date
+            - 1 -> Relativo ao evento anterior
+            - 2 -> Relativo a data corrente
+        """
+        stars = alias.count('*')
+        return stars if stars in (1, 2) else 0
+
+    def _delta(self, alias: str) -> relativedelta:
+        """
+            Soma todos os termos do alias (ex: D+1H-2) em um único relativedelta.
+        """
+
+        target = alias.replace('*', '').replace(' ', '').upper()
+
+        if not ALIAS.match(target):
+            raise Exception(f'Not a valid interval: {alias}')
+
+        delta = relativedelta()
+
+        for unity, operator, interval in TERM.findall(target):
+            amount = int(interval) if operator == '+' else -int(interval)
+            delta += relativedelta(**{UNITS[unity]: amount})
+
+        return delta
+
+    def apply(self, start: datetime, debit: int = None) -> datetime:
+        """
+            Aplica o deslocamento a uma data inicial.
+
+            :param: start -> Data de referência em datetime.
+            :param: debit -> Total de dias a serem subtraídos após o deslocamento.
+        """
+
+        moved = start + self.delta
+
+        if debit:
+            moved = moved - relativedelta(days=debit)
+
+        return moved
+
+
+class Timeline:
+    """
+        Resolve em uma única passagem as datas de todos os eventos de um
+        testcase contra um mesmo relógio congelado.
+
+        Attributes:
+        :param: base_date -> base_date já resolvido (YYYY-MM-DD HH:MM:SS).
+        :param: events -> Tupla com um par (aliases, interval) por evento, onde
+        aliases são os valores de colunas em alias e interval o valor da chave
+        interval do evento (usado quando não há aliases).
+        :param: clock -> Relógio congelado para aliases relativos a data corrente.
+    """
+
+    def __init__(self, base_date: str, events: tuple, clock: datetime):
+        self.base_date = base_date
+        self.clock = clock
+        self.moments = self._moments(events)
+
+    def _diff(self, diff) -> Offset:
+        """
+            Normaliza o intervalo da chave interval, podendo ser nulo,
+            um alias ou um número inteiro de dias.
+        """
+
+        if diff is None or diff == 'None':
+            target = '0'
+        else:
+            target = str(diff).replace('*', '').replace(' ', '')
+
+        checked = alias(target)
+
+        if not checked:
+            raise Exception(f'Not a valid interval: {diff}')
+
+        stars = str(diff).count('*')
+        return offset(f"{checked}{'*' * stars}")
+
+    def _moments(self, events: tuple) -> list:
+        """
+            Calcula as datas de cada evento encadeando a última data
+            escolhida como referência para aliases relativos (*).
+        """
+
+        absolute = timestamp(self.base_date)
+        anchors = {0: absolute, 2: self.clock}
+        last = None
+        moments = list()
+
+        for aliases, diff in events:
+
+            anchors[1] = last or absolute
+            dates = dict()
+
+            for target in aliases:
+                compiled = offset(target)
+                dates[target] = compiled.apply(anchors[compiled.anchor])
+
+            if dates:
+                recent = max(dates, key=dates.get)
+                chosen = dates[recent]
+                interval = str(recent)
+            else:
+                compiled = self._diff(diff)
+                chosen = compiled.apply(anchors[compiled.anchor])
+                interval = str(diff)
+
+            moments.append({
+                'dates': {target: serialize(value) for target, value in dates.items()},
+                'interval2': serialize(chosen),
+                'interval': (self.base_date, serialize(last) if last else None, interval)
+            })
+
+            last = chosen
+
+        return moments
+
+
+@lru_cache(maxsize=1024)
+def offset(alias: str) -> Offset:
+    """
+        Retorna o deslocamento compilado de um alias. O resultado
+        é mantido em cache para as próximas chamadas.
+    """
+    return Offset(alias)
+
+
+@lru_cache(maxsize=1024)
+def alias(value: str):
+    """
+        Verifica se o valor informado é um possível alias.
+        Exemplos: Y-3, M-4, D-5. Números inteiros são tratados
+        como dias (ex: 2 -> D+2, -2 -> D-2).
+    """
+
+    if ALIAS.match(value.upper()):
+        return value
+    elif POSITIVE.match(value):
+        return f'D+{value}'
+    elif NEGATIVE.match(value):
+        return f'D{value}'
+    return False
+
+
+@lru_cache(maxsize=1024)
+def interval(value: str) -> bool:
+    """
+        Verifica se o valor informado é um alias de intervalo,
+        desconsiderando espaços e asteriscos. Exemplo: D + 1 *
+    """
+    return bool(ALIAS.match(INTERVAL.sub('', value).upper()))
+
+
+@lru_cache(maxsize=4096)
+def timestamp(value: str):
+    """
+        Converte uma data completa (YYYY-MM-DD HH:MM:SS) para datetime.
+        Retorna None quando o valor não estiver no formato.
+    """
+    try:
+        return datetime.strptime(value, PATTERN)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def day(value: str):
+    """
+        Converte os 10 primeiros caracteres (YYYY-MM-DD) de um valor
+        para datetime. Retorna None quando o valor não estiver no formato.
+    """
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def clock() -> datetime:
+    """
+        Retorna o relógio congelado da execução. O horário é capturado
+        na primeira chamada e reutilizado por todos os testcases para
+        que aliases relativos a data corrente (**) não variem.
+    """
+
+    if params.__CLOCK__ is None:
+        params.__CLOCK__ = datetime.utcnow().replace(microsecond=0)
+
+    return params.__CLOCK__
+
+
+def date(value: str, now: datetime = None):
+    """
+        Converte uma data em datetime. Datas sem horário assumem o
+        horário de now (por padrão o relógio congelado da execução).
+        Retorna None quando o valor não for uma data válida.
+    """
+
+    if not isinstance(value, str):
+        return None
+
+    found = timestamp(value)
+
+    if found is not None:
+        return found
+
+    found = day(value)
+
+    if found is not None:
+        now = now or clock()
+        return found.replace(hour=now.hour, minute=now.minute, second=now.second)
+
+    return None
+
+
+def serialize(value: datetime) -> str:
+    """
+        Serializa uma data em string no formato YYYY-MM-DD HH:MM:SS.
+    """
+    return value.strftime(PATTERN)
+
+
+def resolve(aliases: list, base, debit: int = None, string: bool = True) -> list:
+    """
+        Resolve um vetor de aliases contra uma mesma data base.
+        Aliases repetidos são calculados uma única vez.
+
+        :param: aliases -> Lista de aliases (ex: [D+1, D+2, H-3]).
+        :param: base -> Data base em datetime ou string YYYY-MM-DD HH:MM:SS.
+        :param: string -> Se True retorna as datas serializadas.
+    """
+
+    if isinstance(base, str):
+        base = timestamp(base)
+
+    resolved = dict()
+
+    for target in set(aliases):
+        moved = offset(target).apply(base, debit=debit)
+        resolved[target] = serialize(moved) if string else moved
+
+    return [resolved[target] for target in aliases]
+
+
+@lru_cache(maxsize=256)
+def timeline(base_date: str, events: tuple, clock: datetime) -> Timeline:
+    """
+        Retorna a linha do tempo resolvida de um testcase. O resultado
+        é mantido em cache para os mesmos eventos, base_date e relógio.
+    """
+    return Timeline(base_date=base_date, events=events, clock=clock)
@@ -8,7 +8,7 @@ import pytz
 import time
 from json import dumps
 from io import StringIO
-from yaml import safe_load
+from yaml import load
 from pathlib import Path
 from pathlib import PurePath
 from pandas import DataFrame
@@ -20,27 +20,27 @@ from platform import python_version
 from importlib import import_module
 from tests.resource.helpers import params
 from tests.resource.utils import generator as gen
+from tests.resource.utils import scheduler
+from tests.resource.utils import lexer
+from tests.resource.utils.logger import logger
 from tests.resource.utils.custom import constructor_yaml
+from tests.resource.utils.custom.immutable import freeze
+
+
+# Cache de arquivos lidos: caminho -> ((mtime, tamanho), conteúdo)
+files = dict()
+
 
 def is_date(date: str):
     """
         Verifica se uma data é válida no formato: YYY-MM-DD
     """
-    pattern = '%Y-%m-%d %H:%M:%S'
-    try:
-        date = datetime.strptime(date, pattern)
-        return date.strftime(pattern)
-    except:
-        try:
-            now = gen.datetime_from_current(string=False)
-            date = datetime.strptime(date[:10], '%Y-%m-%d')
-            date = date.replace(hour=now.hour,
-                                minute=now.minute,
-                                second=now.second,
-                                microsecond=now.microsecond)   
-            return date.strftime(pattern)   
-        except: 
-            return False
+
+    found = scheduler.date(date)
+
+    if found is None:
+        return False
+    return scheduler.serialize(found)
 
 
 def is_alias(alias: str):
@@ -53,13 +53,7 @@ def is_alias(alias: str):
     # ainda verifica se a data pode ser um comando
     # (ex: Y-4, M-3, D-2)
 
-    if re.match('^((Y|M|W|D|H|SEC|MIN)[+|-][0-9]+)+$', str(alias).upper()):
-        return alias
-    elif re.match('^[\d]+$', str(alias)):
-        return f'D+{alias}'
-    elif re.match('^-[\d]+$', str(alias)):
-        return f'D{alias}'        
-    return False
+    return scheduler.alias(str(alias))
 
 
 def is_interval_alias(alias: str):
@@ -67,8 +61,7 @@ def is_interval_alias(alias: str):
         Verifica se o base_date informado é um possível
         alias. Exemplos: Y-3, M-4, D-5
     """
-    inspect = re.sub(r'[^\w+-]', '', alias)
-    return True if re.match('^((Y|M|W|D|H|SEC|MIN)[+|-]\d+)+$', str(inspect).upper()) else False
+    return scheduler.interval(alias)
 
 
 def is_file(file: str) -> bool:
@@ -189,21 +182,38 @@ def read_file(dir: str) -> str:
         Função responsável por abrir arquivo YAML ou SQL e devolver
         seu conteúdo em string. 
 
+        Arquivos YAML e SQL são mantidos em cache durante o processo e
+        só são lidos novamente quando o caminho, a data de modificação
+        ou o tamanho do arquivo mudarem. YAML é devolvido como árvore
+        imutável compartilhada (utilize deepcopy para alterá-la).
+
         :param: dir -> Caminho do diretório atual para o arquivo, 
         incluindo o nome do arquivo
     """
     loaded = None
     try:
+        if dir.endswith('.txt'):
+            with open(PurePath(dir), 'r', encoding='utf8') as f:
+                return f.read()
+
+        stat = os.stat(dir)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        target = os.path.abspath(dir)
+
+        cached = files.get(target)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
         with open(PurePath(dir), 'r', encoding='utf8') as f:
             if dir.endswith('.yaml'):
-                loaded = safe_load(f)
+                start = time.perf_counter()
+                loaded = freeze(load(f.read(), Loader=constructor_yaml.Loader))
+                logger.info(f'Parsed {PurePath(dir).name} in {time.perf_counter() - start:.3f}s')
             
             elif dir.endswith('.sql'):
                 loaded = f.read()
-            
-            elif dir.endswith('.txt'):
-                loaded = f.read()
-        f.close()
+
+        files[target] = (signature, loaded)
     
     except FileNotFoundError:
         raise Exception(f'Cannot open YAML, SQL ou TXT file for path: {dir}')
@@ -242,13 +252,16 @@ def get_table_names(table_ids: list) -> list:
     
     for table_id in table_ids:
         table_name = table_id.rsplit('.', 1)[-1]
+
+        # Tabelas coringa sem filtro de _TABLE_SUFFIX não determinam uma tabela
+        if table_name.endswith('*'):
+            logger.warning(f'Wildcard table {table_id} has no _TABLE_SUFFIX filter. No dependency created for it.')
+            continue
+
         table_names.append(table_name)
     
-    # Remove da lista, tabelas que são chamadas por prefixo all
-    to_clear = [table for table in table_names if '*' not in table]
-    
     # Retorna lista com nomes únicos das tabelas
-    return list(set(to_clear))
+    return sorted(set(table_names))
 
 
 def get_table_locations(content: str) -> list:
@@ -258,30 +271,29 @@ def get_table_locations(content: str) -> list:
 
         :param: -> content: query a ser analizada.
     """
-    
-    found = list()
-    pattern = '\`(.*?)\.(.*?)\.(.*?)\`'
 
-    p = re.compile(pattern)
-    table_ids = ["%s.%s.%s" % x for x in p.findall(content)]
+    found = [reference.location for reference in lexer.references(content) if len(reference.parts) == 3]
 
-    for table_id in table_ids:
-        found.append(table_id.rsplit('.', 1)[0])
-    
-    return list(set(found))
+    return sorted(set(found))
 
 
 def get_table_ids(content: str) -> list:
     """
-        Obtém lista de table_ids a partir de uma query.
+        Obtém lista de table_ids a partir de uma query (ver lexer.references).
+        Tabelas coringa filtradas por _TABLE_SUFFIX são expandidas para as
+        tabelas dos sufixos informados.
     """
 
-    pattern = '\`(.*?)\.(.*?)\.(.*?)\`'
-    
-    p = re.compile(pattern)
-    table_ids = ["%s.%s.%s" % x for x in p.findall(content)]
-    
-    return list(set(table_ids))
+    table_ids = list()
+
+    for reference in lexer.references(content):
+        if reference.wildcard and reference.suffixes:
+            prefix = reference.table_id[:-1]
+            table_ids.extend(f'{prefix}{suffix}' for suffix in reference.suffixes)
+        else:
+            table_ids.append(reference.table_id)
+
+    return sorted(set(table_ids))
 
 
 def get_latest_datetime(dates: list):
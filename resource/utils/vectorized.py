@@ -0,0 +1,228 @@
+"""
+    Script utilizado para gerar massa de dados em lote. Espelha as funções
+    de generator, porém retornando colunas inteiras (numpy.ndarray) de
+    tamanho size em vez de um valor escalar por chamada. Utiliza o mesmo
+    contexto pseudo-aleatório (generator.stream) dos geradores escalares.
+"""
+
+import hashlib
+import string
+import numpy as np
+from tests.resource.utils import scheduler
+from tests.resource.utils import generator as gen
+
+
+HEX = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+LETTERS = np.frombuffer(string.ascii_uppercase.encode('ascii'), dtype=np.uint8)
+DIGIT = ord('0')
+
+
+def _strings(matrix: np.ndarray) -> np.ndarray:
+    """
+        Converte uma matriz (size, n) de códigos ASCII em um vetor
+        de strings com n caracteres por linha.
+    """
+
+    matrix = np.ascontiguousarray(matrix, dtype=np.uint8)
+    width = matrix.shape[1]
+
+    return matrix.view(f'S{width}').ravel().astype(f'U{width}')
+
+
+def gender(size: int) -> np.ndarray:
+    """
+        Retorna size valores para gênero: M ou F com 50%
+        de chances para cada um.
+    """
+
+    return gen.stream.numpy.choice(['M', 'F'], size=size, p=[.5, .5])
+
+
+def choice(variance: list, size: int) -> np.ndarray:
+    """
+        Função que recebe uma lista e escolhe size
+        elementos (com reposição) para retorno.
+    """
+
+    variance = list(variance)
+    chosen = gen.stream.numpy.integers(0, len(variance), size=size)
+
+    return np.array(variance, dtype=object)[chosen]
+
+
+def boolean(size: int, string: bool = False) -> np.ndarray:
+    """
+        Função que retorna size valores booleanos
+        pseudo-aleatórios.
+    """
+
+    chosen = gen.stream.numpy.integers(0, 2, size=size).astype(bool)
+    return chosen if not string else chosen.astype(str)
+
+
+def idcode(size: int, numeric: bool = True, length: int = 0, sep: str = '', min_value = 1000000000, max_value = 9999999999) -> np.ndarray:
+    """
+        Retorna size IDs com total de dígitos personalizados preservando zeros à esquerda.
+        Segue as mesmas regras de generator.idcode.
+    """
+
+    if length != 0:
+        min_value = 1
+        max_value = (10 ** length) - 1
+
+    chosen = gen.stream.numpy.integers(min_value, max_value + 1, size=size, dtype=np.int64)
+
+    if numeric:
+        return chosen
+
+    # Separa o último dígito para manter o separador antes dele
+    head = np.char.zfill((chosen // 10).astype(str), max(length - 1, 0))
+    tail = (chosen % 10).astype(str)
+
+    # Valores de um único dígito não possuem cabeça (ex: '7' -> '' + sep + '7')
+    head = np.where(chosen < 10, np.char.zfill('', max(length - 1, 0)), head)
+
+    return np.char.add(np.char.add(head, sep), tail)
+
+
+def cpf(size: int, formatting: bool = False) -> np.ndarray:
+    """
+        Retorna size CPFs válidos de acordo com a regra de formação
+        estabelecida pela Receita Federal, calculando os dígitos
+        verificadores para todas as linhas de uma só vez.
+    """
+
+    digits = np.empty((size, 11), dtype=np.int64)
+    digits[:, :9] = gen.stream.numpy.integers(0, 10, size=(size, 9))
+
+    for position in (9, 10):
+        weights = np.arange(position + 1, 1, -1)
+        rest = (digits[:, :position] * weights).sum(axis=1) % 11
+        digits[:, position] = np.where(rest > 1, 11 - rest, 0)
+
+    matrix = digits + DIGIT
+
+    if formatting:
+        dot = np.full((size, 1), ord('.'))
+        dash = np.full((size, 1), ord('-'))
+        matrix = np.hstack([matrix[:, :3], dot, matrix[:, 3:6], dot, matrix[:, 6:9], dash, matrix[:, 9:]])
+
+    return _strings(matrix)
+
+
+def identifier(size: int) -> np.ndarray:
+    """
+        Função que gera size identificadores únicos
+        no formato UUID versão 4.
+    """
+
+    octets = gen.stream.numpy.integers(0, 256, size=(size, 16)).astype(np.uint8)
+
+    # Bits de versão (4) e variante (RFC 4122)
+    octets[:, 6] = (octets[:, 6] & 0x0F) | 0x40
+    octets[:, 8] = (octets[:, 8] & 0x3F) | 0x80
+
+    nibbles = np.empty((size, 32), dtype=np.uint8)
+    nibbles[:, 0::2] = octets >> 4
+    nibbles[:, 1::2] = octets & 0x0F
+
+    chars = HEX[nibbles]
+    dash = np.full((size, 1), ord('-'), dtype=np.uint8)
+    matrix = np.hstack([chars[:, :8], dash, chars[:, 8:12], dash, chars[:, 12:16], dash, chars[:, 16:20], dash, chars[:, 20:]])
+
+    return _strings(matrix)
+
+
+def hashcode(values, mode: str) -> np.ndarray:
+    """
+        Retorna os valores recebidos codificados para SHA1 ou SHA256.
+
+        :param: values -> coleção de valores em string para conversão.
+        :param: mode -> formato de transformação (SHA1 ou SHA256)
+    """
+
+    if mode.upper() == 'SHA1':
+        method = hashlib.sha1
+    elif mode.upper() == 'SHA256':
+        method = hashlib.sha256
+    else:
+        raise Exception(f'Not a valid hash mode: {mode}')
+
+    return np.array([method(str(value).encode('utf-8')).hexdigest() for value in values])
+
+
+def sha1(size: int) -> np.ndarray:
+    """
+        Retorna size hashes SHA1 a partir de identificadores aleatórios.
+    """
+    return hashcode(identifier(size), mode='SHA1')
+
+
+def sha256(size: int) -> np.ndarray:
+    """
+        Retorna size hashes SHA256 a partir de identificadores aleatórios.
+    """
+    return hashcode(identifier(size), mode='SHA256')
+
+
+def accession_number(size: int) -> np.ndarray:
+    """
+        Função usada para criar size números de accession number
+        no mesmo padrão de generator.accession_number.
+    """
+
+    def digit(zeros: int = 0):
+        column = gen.stream.numpy.integers(0, 10, size=(size, 1)) + DIGIT
+        return np.hstack([np.full((size, zeros), DIGIT), column])
+
+    def letter():
+        return LETTERS[gen.stream.numpy.integers(0, len(LETTERS), size=(size, 1))]
+
+    matrix = np.hstack([
+        digit(2), letter(), letter(), digit(), letter(), letter(),
+        digit(2), digit(), digit(), letter()
+    ])
+
+    return _strings(matrix)
+
+
+def date_offset(start: str, alias: str, size: int) -> np.ndarray:
+    """
+        Retorna size datas em que a linha i corresponde ao start_date
+        deslocado i vezes pelo alias informado (ex: H+1, D-2, M+1).
+        Meses e anos respeitam o último dia do mês como relativedelta.
+    """
+
+    start = scheduler.timestamp(start)
+    delta = scheduler.offset(alias).delta
+
+    steps = np.arange(size, dtype=np.int64)
+
+    # Deslocamento em meses aplicado antes dos demais, como no relativedelta
+    total = (start.year - 1970) * 12 + (start.month - 1) + steps * (delta.years * 12 + delta.months)
+    month = total.astype('datetime64[M]')
+
+    # Limita o dia ao último dia do mês resultante
+    last_day = ((month + 1).astype('datetime64[D]') - month.astype('datetime64[D]')).astype(np.int64)
+    day = np.minimum(start.day, last_day)
+
+    time = start.hour * 3600 + start.minute * 60 + start.second
+    seconds = delta.days * 86400 + delta.hours * 3600 + delta.minutes * 60 + delta.seconds
+
+    dates = month.astype('datetime64[D]').astype('datetime64[s]') \
+        + ((day - 1) * 86400 + time + steps * seconds).astype('timedelta64[s]')
+
+    return np.char.replace(np.datetime_as_string(dates, unit='s'), 'T', ' ')
+
+
+# Geradores disponíveis para a diretiva generate do mockup
+generators = {
+    'gender': gender,
+    'boolean': boolean,
+    'idcode': idcode,
+    'cpf': cpf,
+    'identifier': identifier,
+    'sha1': sha1,
+    'sha256': sha256,
+    'accession_number': accession_number
+}